@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent voice uploads through VoiceProcessor's audio preparation
+(ffmpeg decode, voice activity detection, Opus encode), with and without the
+bounded audio pool.
+
+'unbounded, in-thread' is the old behavior: every upload starts its ffmpeg
+runs at once and VAD runs in the request thread, under the GIL. 'pool' caps
+the jobs at --workers and runs VAD in worker processes. Reports wall time,
+clips per second and per-clip latency, plus the pool's queue and timing
+metrics. Whisper isn't called. Needs ffmpeg (FFMPEG_BINARY).
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.audio_pool import AudioPool
+from src.voice_processor import VoiceProcessor
+
+def run_clips(processor: VoiceProcessor, audio_data: bytes, format: str, clips: int, concurrency: int):
+    def prepare(_):
+        started = time.perf_counter()
+        processor.prepare_for_transcription(audio_data, format)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        latencies = sorted(threads.map(prepare, range(clips)))
+    return time.perf_counter() - started, latencies
+
+def run_benchmark(path: str, clips: int, concurrency: int, workers: int):
+    with open(path, 'rb') as f:
+        audio_data = f.read()
+    format = path.rsplit('.', 1)[-1].lower()
+    print("📊 Audio pool benchmark")
+    print("=" * 50)
+    print(f"{path}: {clips} clips, {concurrency} at a time, {os.cpu_count()} cores")
+    for name, pool in [
+        ('unbounded, in-thread', AudioPool(workers=concurrency, processes=False)),
+        (f'pool ({workers} workers)', AudioPool(workers=workers)),
+    ]:
+        pool.warm_up()
+        processor = VoiceProcessor(audio_pool=pool)
+        run_clips(processor, audio_data, format, 1, 1)  # warm caches
+        elapsed, latencies = run_clips(processor, audio_data, format, clips, concurrency)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"\n{name}")
+        print(f"  {elapsed:.2f} s, {clips / elapsed:.1f} clips/s, "
+              f"latency p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms")
+        stats = pool.get_stats()
+        print(f"  peak queue {stats['peak_queued']}")
+        for kind, job in stats['jobs'].items():
+            print(f"  {kind:9} wait {job['avg_wait_ms']:7.1f} ms  run {job['avg_run_ms']:7.1f} ms  "
+                  f"max {job['max_run_ms']:7.1f} ms")
+        pool.shutdown()
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('path', nargs='?', default='test_audio.m4a', help="recording to upload")
+    arg_parser.add_argument('--clips', type=int, default=32)
+    arg_parser.add_argument('--concurrency', type=int, default=8)
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args = arg_parser.parse_args()
+    run_benchmark(args.path, args.clips, args.concurrency, args.workers)
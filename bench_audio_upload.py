@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: what VoiceProcessor uploads to Whisper for a recording, comparing
+the old path (decoded to WAV at the source rate), the original container, the
+16 kHz mono Opus normalization, and that with leading and trailing silence
+trimmed by voice activity detection (empty for a clip without speech).
+
+Reports upload bytes and conversion time for each. With --transcribe it also
+sends each version to whisper-1 and reports end-to-end latency (conversion,
+upload and transcription) and the transcripts; that calls the OpenAI API, so
+OPENAI_API_KEY must be set. Needs ffmpeg (FFMPEG_BINARY).
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import Config
+from src.voice_processor import VoiceProcessor
+from src.openai_client import get_openai_client
+
+def legacy_wav(audio_data: bytes, format: str) -> bytes:
+    """The old path: write the upload to a temp file, decode it all to WAV, write that to another temp file"""
+    with tempfile.NamedTemporaryFile(suffix=f".{format}") as source, tempfile.NamedTemporaryFile(suffix=".wav") as wav:
+        source.write(audio_data)
+        source.flush()
+        subprocess.run([Config.FFMPEG_BINARY, '-loglevel', 'error', '-y', '-i', source.name, wav.name], check=True)
+        return wav.read()
+
+def variants(processor: VoiceProcessor, audio_data: bytes, format: str):
+    """name -> function returning (upload bytes, upload format)"""
+    return {
+        'wav (old path)': lambda: (legacy_wav(audio_data, format), 'wav'),
+        'original': lambda: (audio_data, format),
+        'opus 16k mono': lambda: processor.normalize_for_transcription(audio_data, format),
+        'opus, trimmed': lambda: processor.prepare_for_transcription(audio_data, format)[:2],
+    }
+
+def transcribe(audio_data: bytes, format: str) -> str:
+    return str(get_openai_client().audio.transcriptions.create(
+        model="whisper-1", file=(f"voice_command.{format}", audio_data), response_format="text"
+    )).strip()
+
+def run_benchmark(paths, repeats: int, transcribe_audio: bool):
+    processor = VoiceProcessor()
+    print("📊 Transcription upload benchmark")
+    print("=" * 50)
+    for path in paths:
+        with open(path, 'rb') as f:
+            audio_data = f.read()
+        format = processor.detect_audio_format(audio_data, path)
+        print(f"\n{path} ({format}, {len(audio_data)} bytes)")
+        for name, convert in variants(processor, audio_data, format).items():
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                upload, upload_format = convert()
+                timings.append(time.perf_counter() - started)
+            if not upload:
+                print(f"  {name:16} no speech, not uploaded  convert {statistics.median(timings) * 1000:6.1f} ms")
+                continue
+            line = f"  {name:16} {len(upload):9} bytes  convert {statistics.median(timings) * 1000:6.1f} ms"
+            if transcribe_audio:
+                latencies, text = [], ''
+                for _ in range(repeats):
+                    started = time.perf_counter()
+                    upload, upload_format = convert()
+                    text = transcribe(upload, upload_format)
+                    latencies.append(time.perf_counter() - started)
+                line += f"  end-to-end {statistics.median(latencies) * 1000:7.0f} ms  {text!r}"
+            print(line)
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('paths', nargs='*', default=['test_audio.m4a'], help="recordings to upload")
+    arg_parser.add_argument('--repeats', type=int, default=3)
+    arg_parser.add_argument('--transcribe', action='store_true', help="also time whisper-1 (needs OPENAI_API_KEY)")
+    args = arg_parser.parse_args()
+    run_benchmark(args.paths, args.repeats, args.transcribe)
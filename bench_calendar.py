@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: calendar read/write latency and throughput of GoogleCalendarManager,
+run reproducibly offline against the fake Calendar API server with simulated
+network latency.
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dateutil import tz
+from src.config import Config
+from src.fake_calendar_server import FakeCalendarServer
+from src.google_calendar import GoogleCalendarManager
+from src.models import CalendarEvent
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50 {statistics.median(ordered):8.1f} ms   p95 {p95:8.1f} ms"
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def make_manager(server, cache_enabled=True, parallel_fetch=True):
+    Config.GOOGLE_CALENDAR_API_ROOT = server.root_url
+    Config.GOOGLE_CALENDAR_ANONYMOUS = True
+    manager = GoogleCalendarManager()
+    manager.cache_enabled = cache_enabled
+    manager.parallel_fetch = parallel_fetch
+    manager.calendar_registry.get_calendars()
+    return manager
+
+def run_benchmark(latency: float, calendars: int, events: int, iterations: int, threads: int):
+    first_day = datetime.now(tz.gettz('America/Chicago')).replace(hour=0, minute=0, second=0, microsecond=0)
+    week = (first_day, first_day + timedelta(days=7))
+
+    with FakeCalendarServer(latency=latency, jitter=latency / 5, seed=42) as server:
+        server.seed(calendars=calendars, events_per_calendar=events, first_day=first_day)
+
+        print("📊 Calendar benchmark (fake API server)")
+        print("=" * 60)
+        print(f"Simulated latency: {latency * 1000:.0f} ms, calendars: {calendars}, events/calendar: {events}")
+        print(f"Iterations: {iterations}, concurrent threads: {threads}\n")
+
+        # Week view across all calendars, straight from the API
+        for parallel in (False, True):
+            manager = make_manager(server, cache_enabled=False, parallel_fetch=parallel)
+            samples = timed(lambda: manager.get_events_all_calendars(*week, max_results=None), iterations)
+            print(f"All calendars, uncached, {'parallel' if parallel else 'serial  '}: {percentiles(samples)}")
+
+        # Same view from the local store: one full sync, then delta syncs every CALENDAR_SYNC_INTERVAL
+        manager = make_manager(server)
+        cold = timed(lambda: manager.get_events_all_calendars(*week, max_results=None), 1)
+        warm = timed(lambda: manager.get_events_all_calendars(*week, max_results=None), iterations)
+        print(f"All calendars, cached, first read (full sync): {cold[0]:8.1f} ms")
+        print(f"All calendars, cached, warm:     {percentiles(warm)}")
+        manager.event_cache.sync_interval = 0
+        delta = timed(lambda: manager.get_events_all_calendars(*week, max_results=None), iterations)
+        print(f"All calendars, cached, delta sync every read: {percentiles(delta)}")
+
+        # Throughput: concurrent uncached single-calendar reads (thread-local transports)
+        manager = make_manager(server, cache_enabled=False)
+        requests_before = server.stats['requests']
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: manager.get_events(*week, max_results=50), range(iterations * threads)))
+        elapsed = time.perf_counter() - started
+        print(f"\nUncached reads with {threads} threads: {iterations * threads / elapsed:8.1f} reads/s "
+              f"({server.stats['requests'] - requests_before} API requests)")
+
+        # Writes: one request per event versus batched inserts
+        events_to_create = [
+            CalendarEvent(summary=f"Bench {n}", start_time=first_day.replace(tzinfo=None) + timedelta(hours=n),
+                          end_time=first_day.replace(tzinfo=None) + timedelta(hours=n, minutes=30))
+            for n in range(20)
+        ]
+        started = time.perf_counter()
+        for event in events_to_create:
+            manager.create_event(event)
+        single_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        manager.create_events(events_to_create)
+        batch_ms = (time.perf_counter() - started) * 1000
+        print(f"Create {len(events_to_create)} events: one by one {single_ms:8.1f} ms, batched {batch_ms:8.1f} ms")
+        print(f"\nServer stats: {server.stats}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--latency', type=float, default=0.05, help="simulated API latency in seconds")
+    arg_parser.add_argument('--calendars', type=int, default=4)
+    arg_parser.add_argument('--events', type=int, default=500, help="events per calendar")
+    arg_parser.add_argument('--iterations', type=int, default=20)
+    arg_parser.add_argument('--threads', type=int, default=8)
+    args = arg_parser.parse_args()
+    run_benchmark(args.latency, args.calendars, args.events, args.iterations, args.threads)
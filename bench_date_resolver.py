@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: relative-date resolution with the old CalendarAgent._parse_date_query
+(which recomputed week boundaries and called tz.gettz on every query) versus the
+shared DateResolver and its per-day lookup table.
+
+Also lists the queries the two resolve differently. "today" and "tomorrow"
+differ only when the host clock is not on Chicago's date: the old code used
+the server's local date.
+"""
+
+import sys
+import os
+import re
+import argparse
+import time
+from datetime import datetime, timedelta
+from dateutil import tz
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.date_resolver import DateResolver
+
+QUERIES = [
+    "What's on my calendar today?",
+    "Show me my events this week",
+    "What do I have tomorrow?",
+    "Anything next week?",
+    "What happened last week",
+    "What's happening this month",
+    "Am I free on Wednesday?",
+    "What's on next Friday",
+    "Plans for next weekend",
+    "What do we have in two weeks",
+    "Is anything on the 21st?",
+    "Dentist on July 21st",
+    "Show my calendar",
+    "When is soccer practice?",
+]
+
+def legacy_parse_date_query(query: str):
+    """CalendarAgent._parse_date_query as it was before DateResolver"""
+    query_lower = query.lower().strip()
+    now = datetime.now()
+    chicago_tz = tz.gettz('America/Chicago')
+    days_since_monday = now.weekday()
+    monday = now - timedelta(days=days_since_monday)
+    sunday = monday + timedelta(days=6)
+    monday = monday.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
+    sunday = sunday.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
+    if any(phrase in query_lower for phrase in ["this week", "the week", "week", "current week"]):
+        return (monday, sunday)
+    elif any(phrase in query_lower for phrase in ["next week"]):
+        return (monday + timedelta(days=7), sunday + timedelta(days=7))
+    elif any(phrase in query_lower for phrase in ["last week", "previous week"]):
+        return (monday - timedelta(days=7), sunday - timedelta(days=7))
+    elif any(phrase in query_lower for phrase in ["today"]):
+        return (now.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz),
+                now.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz))
+    elif any(phrase in query_lower for phrase in ["tomorrow"]):
+        tomorrow = now + timedelta(days=1)
+        return (tomorrow.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz),
+                tomorrow.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz))
+    elif any(phrase in query_lower for phrase in ["this month", "current month"]):
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
+        if now.month == 12:
+            next_month = now.replace(year=now.year + 1, month=1, day=1)
+        else:
+            next_month = now.replace(month=now.month + 1, day=1)
+        month_end = (next_month - timedelta(days=1)).replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
+        return (month_start, month_end)
+    weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    for i, weekday in enumerate(weekdays):
+        if re.search(rf"(on |next )?{weekday}", query_lower):
+            days_ahead = (i - now.weekday() + 7) % 7
+            if days_ahead == 0 and "next" in query_lower:
+                days_ahead = 7
+            target_date = now + timedelta(days=days_ahead)
+            return (target_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz),
+                    target_date.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz))
+    return None
+
+def bench(resolve, iterations: int) -> float:
+    """Average microseconds per query"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for query in QUERIES:
+            resolve(query)
+    return (time.perf_counter() - started) * 1e6 / (iterations * len(QUERIES))
+
+def describe(date_range) -> str:
+    if date_range is None:
+        return "None"
+    start, end = date_range
+    return f"{start:%m-%d}..{end:%m-%d}"
+
+def run_benchmark(iterations: int):
+    resolver = DateResolver()
+    legacy_us = bench(legacy_parse_date_query, iterations)
+    resolver_us = bench(resolver.resolve, iterations)
+
+    print("📊 Date resolver benchmark")
+    print("=" * 50)
+    print(f"Queries: {len(QUERIES)}, iterations: {iterations}")
+    print(f"_parse_date_query: {legacy_us:7.2f} µs/query")
+    print(f"DateResolver:      {resolver_us:7.2f} µs/query")
+    print(f"Speedup: {legacy_us / resolver_us:.2f}x")
+    print("Resolved differently:")
+    for query in QUERIES:
+        before, after = describe(legacy_parse_date_query(query)), describe(resolver.resolve(query))
+        if before != after:
+            print(f"  {query!r:40} {before:>12} -> {after}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--iterations', type=int, default=2000)
+    args = arg_parser.parse_args()
+    run_benchmark(args.iterations)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: payload size and JSON parse time of events().list pages with and
+without the partial-response field mask used by GoogleCalendarManager.
+
+Runs offline against synthetic event resources shaped like real Google
+Calendar responses (attendee details, conferencing data, links, etags).
+"""
+
+import sys
+import os
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.google_calendar import EVENTS_LIST_FIELDS
+from src.fake_calendar_server import parse_field_mask, apply_field_mask, synthetic_event
+
+def bench_parse(payload: bytes, iterations: int) -> float:
+    """Average json.loads time in milliseconds"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        json.loads(payload)
+    return (time.perf_counter() - started) * 1000 / iterations
+
+def run_benchmark(events_per_page: int = 250, iterations: int = 200):
+    page = {
+        "kind": "calendar#events",
+        "etag": "\"p33abc\"",
+        "summary": "Family",
+        "updated": "2025-06-02T08:30:00.000Z",
+        "timeZone": "America/Chicago",
+        "accessRole": "owner",
+        "items": [synthetic_event(i) for i in range(events_per_page)],
+        "nextSyncToken": "CPDAlvWDx70CEPDAlvWDx70CGAU=",
+    }
+    masked_page = apply_field_mask(page, parse_field_mask(EVENTS_LIST_FIELDS))
+
+    full_bytes = json.dumps(page).encode()
+    masked_bytes = json.dumps(masked_page).encode()
+    full_ms = bench_parse(full_bytes, iterations)
+    masked_ms = bench_parse(masked_bytes, iterations)
+
+    print("📊 events().list page benchmark")
+    print("=" * 50)
+    print(f"Field mask: {EVENTS_LIST_FIELDS}")
+    print(f"Events per page: {events_per_page}, parse iterations: {iterations}")
+    print(f"Full response:   {len(full_bytes):>9,} bytes, {full_ms:7.3f} ms to parse")
+    print(f"Masked response: {len(masked_bytes):>9,} bytes, {masked_ms:7.3f} ms to parse")
+    print(f"Payload reduction: {100 * (1 - len(masked_bytes) / len(full_bytes)):.1f}%")
+    print(f"Parse time reduction: {100 * (1 - masked_ms / full_ms):.1f}%")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: keyword intent detection in NLPProcessor._fallback_processing
+with the old per-call substring scans versus the compiled KeywordMatcher.
+
+Also lists the commands the two classify differently, which are the
+substring false positives ("do" in "doctor", "take" in "mistake").
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.nlp_processor import FALLBACK_KEYWORDS, CHORE_INTENTS
+
+COMMANDS = [
+    "What's on my calendar today?",
+    "Show me my events this week",
+    "Schedule a doctor appointment tomorrow at 3pm",
+    "Add dinner to my chores for today",
+    "Assign vacuuming to Alex",
+    "Mark dishes as done",
+    "What chores do I have today?",
+    "Remove making dinner from my chores",
+    "Book a table for the family on Saturday",
+    "Is there anything on Friday evening?",
+    "Set up a playdate with the Johnsons next week",
+    "Change the laundry task to Sunday",
+    "Who is taking the kids to soccer?",
+    "I made a mistake on the chores list, clear it",
+    "Tell me about next month",
+    "Remind me about the dentist",
+    "What does the weekend look like?",
+    "Plan a birthday party for Emma",
+    "Cancel piano lessons",
+    "Did anybody finish the housework?",
+]
+
+def legacy_intent(text: str) -> str:
+    """The keyword checks as _fallback_processing did them before the matcher"""
+    text_lower = text.lower()
+    chores_keywords = ['chore', 'chores', 'housework', 'task', 'tasks']
+    assign_keywords = ['assign', 'pick up', 'take', 'do', 'claim']
+    complete_keywords = ['complete', 'done', 'finish', 'mark as done', 'mark complete']
+    add_keywords = ['add', 'create', 'new', 'make', 'put', 'schedule']
+    update_keywords = ['update', 'edit', 'change', 'modify', 'rename']
+    remove_keywords = ['remove', 'delete', 'cancel', 'clear']
+    if any(word in text_lower for word in chores_keywords):
+        for name, keywords in (('add', add_keywords), ('assign', assign_keywords), ('complete', complete_keywords),
+                               ('update', update_keywords), ('remove', remove_keywords)):
+            if any(word in text_lower for word in keywords):
+                return f"chores:{name}"
+        return "chores:query"
+    read_keywords = ['what', 'show', 'list', 'check', 'see', 'tell me', "what's", 'what is', 'events', 'appointments', 'meetings', 'schedule']
+    create_keywords = ['schedule', 'add', 'create', 'book', 'set up', 'arrange', 'plan']
+    relative_queries = [
+        'this week', 'the week', 'week', 'current week', 'next week', 'last week', 'previous week',
+        'today', 'tomorrow', 'this month', 'current month', 'next month', 'last month', 'previous month'
+    ]
+    if any(word in text_lower for word in read_keywords):
+        return "read:relative" if any(rel in text_lower for rel in relative_queries) else "read"
+    if any(word in text_lower for word in create_keywords):
+        return "create"
+    return "read:default"
+
+def matcher_intent(text: str) -> str:
+    """The same decision from one KeywordMatcher pass"""
+    hits = FALLBACK_KEYWORDS.matches(text)
+    if 'chores' in hits:
+        return next((f"chores:{intent}" for intent, _ in CHORE_INTENTS if intent in hits), "chores:query")
+    if 'read' in hits:
+        return "read:relative" if 'relative' in hits else "read"
+    if 'create' in hits:
+        return "create"
+    return "read:default"
+
+def bench(classify, iterations: int) -> float:
+    """Average microseconds per command"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for command in COMMANDS:
+            classify(command)
+    return (time.perf_counter() - started) * 1e6 / (iterations * len(COMMANDS))
+
+def run_benchmark(iterations: int):
+    legacy_us = bench(legacy_intent, iterations)
+    matcher_us = bench(matcher_intent, iterations)
+
+    print("📊 Keyword matcher benchmark")
+    print("=" * 50)
+    print(f"Commands: {len(COMMANDS)}, iterations: {iterations}")
+    print(f"Substring scans: {legacy_us:7.2f} µs/command")
+    print(f"KeywordMatcher:  {matcher_us:7.2f} µs/command")
+    print(f"Speedup: {legacy_us / matcher_us:.2f}x")
+    print("Classified differently:")
+    for command in COMMANDS:
+        before, after = legacy_intent(command), matcher_intent(command)
+        if before != after:
+            print(f"  {command!r:55} {before:>14} -> {after}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--iterations', type=int, default=2000)
+    args = arg_parser.parse_args()
+    run_benchmark(args.iterations)
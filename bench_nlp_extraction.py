@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM command extraction with function calling (structured output)
+versus JSON described in the prompt.
+
+Sends the same commands through NLPProcessor in both modes and compares
+completion tokens, malformed replies, fallbacks and latency. Calls the
+OpenAI API, so OPENAI_API_KEY must be set. The local parser and the intent
+cache are turned off so every command reaches the LLM.
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import Config
+from src.models import InputType
+
+COMMANDS = [
+    "Schedule a dentist appointment tomorrow at 3pm",
+    "Add soccer practice every Tuesday at 5pm for the next three weeks",
+    "What's on my calendar this Friday?",
+    "Move my meeting with Sarah to Thursday at 10am",
+    "Add dinner to my chores for today",
+    "Assign vacuuming to Alex",
+    "Mark dishes as complete",
+    "Do we have anything planned on July 21st?",
+    "Book a family dinner at Luigi's next Saturday at 7 and remind me an hour before",
+    "Cancel the piano lesson on Wednesday",
+]
+
+def run_mode(structured: bool, repeats: int):
+    Config.NLP_STRUCTURED_OUTPUT = structured
+    from src.nlp_processor import NLPProcessor
+    processor = NLPProcessor()
+    timings = []
+    for _ in range(repeats):
+        for command in COMMANDS:
+            started = time.perf_counter()
+            processor.process_text(command, InputType.TEXT)
+            timings.append((time.perf_counter() - started) * 1000)
+    stats = processor.get_stats()
+    stats['avg_ms'] = sum(timings) / len(timings)
+    return stats
+
+def run_benchmark(repeats: int = 1):
+    Config.LOCAL_INTENT_ENABLED = False
+    Config.INTENT_CACHE_ENABLED = False
+    results = {
+        'prompt JSON': run_mode(False, repeats),
+        'function call': run_mode(True, repeats),
+    }
+
+    print("\n📊 NLP extraction benchmark")
+    print("=" * 50)
+    print(f"Commands: {len(COMMANDS)} x {repeats}, max_tokens: {Config.NLP_MAX_TOKENS}")
+    for mode, stats in results.items():
+        print(f"{mode:14} completion {stats['avg_completion_tokens']:6.1f} tok/req, "
+              f"prompt {stats['avg_prompt_tokens']:7.1f} tok/req, "
+              f"malformed {stats['malformed_replies']}, truncated {stats['truncated_replies']}, "
+              f"fallback rate {stats['fallback_rate']:.1%}, {stats['avg_ms']:7.1f} ms/req")
+    before, after = results['prompt JSON'], results['function call']
+    print(f"Completion token reduction: {100 * (1 - after['avg_completion_tokens'] / before['avg_completion_tokens']):.1f}%")
+
+if __name__ == "__main__":
+    if not Config.OPENAI_API_KEY:
+        sys.exit("OPENAI_API_KEY is not set")
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--repeats', type=int, default=1, help="passes over the command list per mode")
+    args = arg_parser.parse_args()
+    run_benchmark(args.repeats)
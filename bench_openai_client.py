@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request OpenAI API latency with a new client per call (what
+the processors used to do) versus the shared pooled client from
+src/openai_client.py.
+
+Uses models.retrieve, which costs no tokens. Needs OPENAI_API_KEY; point
+OPENAI_BASE_URL at another OpenAI-compatible server to measure that instead.
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from openai import OpenAI
+from src.config import Config
+from src.openai_client import get_openai_client
+
+def timed_requests(make_client, model: str, requests: int, pause: float):
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        make_client().models.retrieve(model)
+        timings.append((time.perf_counter() - started) * 1000)
+        time.sleep(pause)
+    return timings
+
+def report(label: str, timings):
+    # The first shared request pays the handshake once; the median shows the steady state
+    print(f"{label:16} first {timings[0]:7.1f} ms, median {statistics.median(timings):7.1f} ms, "
+          f"mean {statistics.mean(timings):7.1f} ms, max {max(timings):7.1f} ms")
+
+def run_benchmark(model: str, requests: int, pause: float):
+    fresh = timed_requests(lambda: OpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL or None),
+                           model, requests, pause)
+    shared = timed_requests(get_openai_client, model, requests, pause)
+
+    print("📊 OpenAI client benchmark")
+    print("=" * 50)
+    print(f"Endpoint: {Config.OPENAI_BASE_URL or 'https://api.openai.com/v1'}, {requests} requests, {pause}s apart")
+    report("New client/call", fresh)
+    report("Shared client", shared)
+    print(f"Median latency reduction: {100 * (1 - statistics.median(shared) / statistics.median(fresh)):.1f}%")
+
+if __name__ == "__main__":
+    if not Config.OPENAI_API_KEY:
+        sys.exit("OPENAI_API_KEY is not set")
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--model', default="gpt-4o")
+    arg_parser.add_argument('--requests', type=int, default=20)
+    arg_parser.add_argument('--pause', type=float, default=1.0, help="seconds between requests, as between user commands")
+    args = arg_parser.parse_args()
+    run_benchmark(args.model, args.requests, args.pause)
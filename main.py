@@ -13,7 +13,6 @@ warnings.filterwarnings("ignore", message=".*urllib3 v2 only supports OpenSSL 1.
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.api import app
 from src.config import Config
 
 def main():
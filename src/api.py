@@ -1,16 +1,20 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, WebSocket, WebSocketDisconnect, Request, Depends
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool, iterate_in_threadpool
+from fastapi.encoders import jsonable_encoder
 import json
 import asyncio
+import base64
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import uuid
 
 from .calendar_agent import CalendarAgent
+from .voice_stream import VoiceStream
 from .models import VoiceInput, TextInput, SMSInput, AgentResponse, Chore, ChoreDB, SessionLocal, UserDB
 from .config import Config
 from sqlalchemy.orm import Session
@@ -23,6 +27,8 @@ from flask import abort
 from pydantic import BaseModel
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .nlp_processor import NLPProcessor, InputType
+from .openai_client import close_openai_client
+from .audio_pool import get_audio_pool, close_audio_pool
 
 app = FastAPI(title="AI Family Calendar Agent", version="1.0.0")
 
@@ -62,6 +68,30 @@ async def startup_event():
     except ValueError as e:
         print(f"❌ Configuration error: {e}")
         print("Please check your environment variables")
+    
+    # Register push channels so calendar changes made elsewhere reach the cache
+    watcher = agent.calendar_manager.watcher
+    if watcher.enabled:
+        try:
+            await run_in_threadpool(watcher.start)
+        except Exception as e:
+            print(f"❌ Could not start calendar push notifications: {e}")
+    
+    # Start the audio worker processes in the background, so the first voice upload doesn't wait for them
+    if Config.AUDIO_POOL_PROCESSES:
+        asyncio.get_running_loop().run_in_executor(None, get_audio_pool().warm_up)
+    
+    # Synthesize canned replies in the background; requests are served meanwhile
+    if agent.tts_processor.cache and Config.TTS_CACHE_PREWARM_VOICES:
+        asyncio.get_running_loop().run_in_executor(None, agent.prewarm_speech)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close push channels, pooled calendar and OpenAI connections and audio worker processes"""
+    await run_in_threadpool(agent.calendar_manager.watcher.stop)
+    await agent.async_calendar_manager.aclose()
+    await close_openai_client()
+    await run_in_threadpool(close_audio_pool)
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -73,7 +103,8 @@ async def process_text_command(message: str = Form(...), user_id: Optional[str]
     """Process text command"""
     try:
         text_input = TextInput(message=message, user_id=user_id)
-        response = agent.process_text_command(text_input)
+        # The agent pipeline blocks on OpenAI and Google calls, so keep it off the event loop
+        response = await run_in_threadpool(agent.process_text_command, text_input)
         return response
         
     except Exception as e:
@@ -107,7 +138,7 @@ async def get_events(
                 raise HTTPException(status_code=400, detail="Invalid end_date format")
         
         # Get events from calendar manager
-        calendar_response = agent.calendar_manager.get_events_all_calendars(
+        calendar_response = await agent.async_calendar_manager.get_events_all_calendars(
             start_date=start_dt,
             end_date=end_dt,
             max_results=max_results
@@ -131,7 +162,8 @@ async def get_events(
                 }
                 for event in (calendar_response.events or [])
             ],
-            "message": calendar_response.message
+            "message": calendar_response.message,
+            "calendar_timings": calendar_response.calendar_timings
         }
         
     except HTTPException:
@@ -158,7 +190,7 @@ async def process_sms_command(
             timestamp=parsed_timestamp
         )
         
-        response = agent.process_sms_command(sms_input)
+        response = await run_in_threadpool(agent.process_sms_command, sms_input)
         return response
         
     except Exception as e:
@@ -217,7 +249,7 @@ async def process_voice_file(request: Request):
         
         # Process the voice command
         print("🔄 Processing voice command...")
-        response = agent.process_voice_command(voice_input)
+        response = await run_in_threadpool(agent.process_voice_command, voice_input)
         print(f"✅ Voice command processed: {response.success}")
         print(f"📝 Response message: {response.message}")
         
@@ -278,7 +310,7 @@ async def process_conversational_voice(request: Request):
         voice_input = VoiceInput(audio_data=audio_data, format=format)
         
         # Process conversational voice
-        response = agent.process_conversational_voice(voice_input, conversation_id, voice, model)
+        response = await run_in_threadpool(agent.process_conversational_voice, voice_input, conversation_id, voice, model)
         
         return response
         
@@ -301,7 +333,7 @@ async def process_conversational_text(
         print(f"🎯 API: message='{message}'")
         print(f"🎯 API: voice={voice}, model={model}")
         
-        response = agent.process_conversational_text(message, conversation_id, voice, model)
+        response = await run_in_threadpool(agent.process_conversational_text, message, conversation_id, voice, model)
         print(f"🎯 API: Response success={response.success}")
         return response
     except Exception as e:
@@ -310,6 +342,51 @@ async def process_conversational_text(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: dict) -> str:
+    """One Server-Sent Events frame"""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@app.post("/api/conversation/text/stream")
+async def stream_conversational_text(
+    conversation_id: str = Form(...),
+    message: str = Form(...),
+    voice: Optional[str] = Form('alloy'),
+    model: Optional[str] = Form('tts-1')
+):
+    """Conversational text as Server-Sent Events: reply text is sent as the LLM generates it
+    and speech one sentence at a time, followed by a 'done' event with the full message"""
+    events = agent.stream_conversational_text(message, conversation_id, voice, model)
+    # StreamingResponse pulls the (blocking) generator in the threadpool
+    return StreamingResponse(
+        (_sse(event) for event in events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/conversation/voice/stream")
+async def stream_conversational_voice(request: Request):
+    """Conversational voice as Server-Sent Events: the transcript, then the reply text and its
+    speech sentence by sentence, so playback starts after the first sentence is synthesized"""
+    conversation_id = request.headers.get('X-Conversation-ID')
+    voice = request.headers.get('X-Voice', 'alloy')
+    model = request.headers.get('X-Model', 'tts-1')
+    if not conversation_id:
+        raise HTTPException(status_code=400, detail="X-Conversation-ID header required")
+    
+    filename = request.headers.get('X-Filename', 'voice_command.m4a')
+    audio_data = await request.body()
+    if len(audio_data) == 0:
+        raise HTTPException(status_code=400, detail="Empty audio file received")
+    
+    format = agent.voice_processor.detect_audio_format(audio_data, filename)
+    voice_input = VoiceInput(audio_data=audio_data, format=format)
+    events = agent.stream_conversational_voice(voice_input, conversation_id, voice, model)
+    return StreamingResponse(
+        (_sse(event) for event in events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/conversation/{conversation_id}/history")
 async def get_conversation_history(conversation_id: str):
     """Get conversation history"""
@@ -392,35 +469,107 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+async def _answer_voice_stream(websocket: WebSocket, voice_stream: VoiceStream, options: dict):
+    """Transcribe a streamed utterance and reply as to a "voice" message or, given a
+    conversation_id, with the events of /api/conversation/voice/stream"""
+    text, activity = await run_in_threadpool(voice_stream.finish)
+    if options.get("conversation_id"):
+        events = agent.stream_transcribed_conversation(
+            text, activity, options["conversation_id"], options.get("voice", "alloy"), options.get("model", "tts-1")
+        )
+        async for event in iterate_in_threadpool(events):
+            await manager.send_personal_message(json.dumps(event), websocket)
+    else:
+        response = await run_in_threadpool(agent.process_transcribed_command, text, activity)
+        await manager.send_personal_message(json.dumps(jsonable_encoder(response)), websocket)
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
+    voice_stream: Optional[VoiceStream] = None
+    stream_options: dict = {}
     try:
         while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            if message.get("bytes") is not None:
+                # Binary frames are audio of the utterance opened by "audio_start", endpointed as they
+                # arrive; it is answered as soon as the speaker stops, and later frames are dropped
+                if voice_stream is None:
+                    continue
+                for event in await run_in_threadpool(voice_stream.feed, message["bytes"]):
+                    await manager.send_personal_message(json.dumps(event), websocket)
+                if voice_stream.ended:
+                    await _answer_voice_stream(websocket, voice_stream, stream_options)
+                    voice_stream = None
+                continue
+            
+            message_data = json.loads(message["text"])
             
             if message_data.get("type") == "text":
                 text_input = TextInput(message=message_data["message"])
-                response = agent.process_text_command(text_input)
+                response = await run_in_threadpool(agent.process_text_command, text_input)
                 await manager.send_personal_message(
-                    json.dumps(response.dict()), 
+                    json.dumps(jsonable_encoder(response)),  # as the HTTP endpoints encode it (datetimes)
                     websocket
                 )
             
             elif message_data.get("type") == "voice":
                 # Handle voice data from WebSocket
-                audio_data = message_data["audio_data"]
+                audio_data = base64.b64decode(message_data["audio_data"])
                 format = message_data.get("format", "wav")  # Get format from message or default to wav
-                voice_input = VoiceInput(audio_data=audio_data.encode(), format=format)
-                response = agent.process_voice_command(voice_input)
+                voice_input = VoiceInput(audio_data=audio_data, format=format)
+                response = await run_in_threadpool(agent.process_voice_command, voice_input)
                 await manager.send_personal_message(
-                    json.dumps(response.dict()), 
+                    json.dumps(jsonable_encoder(response)),  # as the HTTP endpoints encode it (datetimes)
                     websocket
                 )
+            
+            elif message_data.get("type") == "conversation_text":
+                # Same events as /api/conversation/text/stream, one JSON message each
+                events = agent.stream_conversational_text(
+                    message_data["message"],
+                    message_data["conversation_id"],
+                    message_data.get("voice", "alloy"),
+                    message_data.get("model", "tts-1")
+                )
+                async for event in iterate_in_threadpool(events):
+                    await manager.send_personal_message(json.dumps(event), websocket)
+            
+            elif message_data.get("type") == "audio_start":
+                # Start of a streamed utterance: {"format": "pcm" (16-bit mono) or a container
+                # such as "webm", "sample_rate" (pcm only), "conversation_id", "voice", "model"}
+                if voice_stream is not None:
+                    voice_stream.close()
+                    voice_stream = None
+                try:
+                    voice_stream = VoiceStream(
+                        agent.voice_processor, message_data.get("format", "pcm"), message_data.get("sample_rate")
+                    )
+                except (RuntimeError, ValueError) as e:
+                    await manager.send_personal_message(
+                        json.dumps({"type": "error", "success": False, "message": str(e)}), websocket
+                    )
+                    continue
+                stream_options = message_data
+                await manager.send_personal_message(json.dumps({
+                    "type": "listening", "format": voice_stream.format, "sample_rate": voice_stream.sample_rate
+                }), websocket)
+            
+            elif message_data.get("type") == "audio_end" and voice_stream is not None:
+                # The client stopped recording before an endpoint was detected
+                for event in await run_in_threadpool(voice_stream.end):
+                    await manager.send_personal_message(json.dumps(event), websocket)
+                await _answer_voice_stream(websocket, voice_stream, stream_options)
+                voice_stream = None
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
+    finally:
+        if voice_stream is not None:
+            voice_stream.close()
 
 # Health check endpoint
 @app.get("/health")
@@ -428,6 +577,33 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Cache and performance counters"""
+    return {
+        "calendar_cache": agent.calendar_manager.event_cache.get_stats(),
+        "calendar_registry": agent.calendar_manager.calendar_registry.get_stats(),
+        "calendar_watch": agent.calendar_manager.watcher.get_stats(),
+        "nlp": agent.nlp_processor.get_stats(),
+        "tts": agent.tts_processor.get_stats(),
+        "voice": agent.voice_processor.get_stats(),
+        "audio_pool": get_audio_pool().get_stats()
+    }
+
+# Google Calendar push notification endpoint (events.watch channels)
+@app.post("/webhook/calendar")
+async def calendar_webhook(request: Request):
+    """Re-sync the calendar a push notification is about"""
+    accepted = agent.calendar_manager.watcher.handle_notification(
+        channel_id=request.headers.get("X-Goog-Channel-ID", ""),
+        token=request.headers.get("X-Goog-Channel-Token", ""),
+        resource_id=request.headers.get("X-Goog-Resource-ID", ""),
+        resource_state=request.headers.get("X-Goog-Resource-State", "")
+    )
+    if not accepted:
+        raise HTTPException(status_code=403, detail="Unknown channel token")
+    return Response(status_code=200)
+
 # Twilio webhook endpoint
 @app.post("/webhook/twilio")
 async def twilio_webhook(
@@ -443,7 +619,7 @@ async def twilio_webhook(
             timestamp=datetime.now()
         )
         
-        response = agent.process_sms_command(sms_input)
+        response = await run_in_threadpool(agent.process_sms_command, sms_input)
         
         # Return TwiML response for SMS
         return {
@@ -497,6 +673,7 @@ class ChoresVoiceResponse(BaseModel):
     action: Optional[str] = None
     chore_description: Optional[str] = None
     assignee: Optional[str] = None
+    speech_activity: Optional[Dict[str, Any]] = None
 
 # JWT dependency
 security = HTTPBearer()
@@ -640,13 +817,15 @@ async def chores_voice(
             # Detect audio format from filename
             format = agent.voice_processor.detect_audio_format(audio_data, filename)
             
-            # Create VoiceInput object with detected format
-            voice_input = VoiceInput(audio_data=audio_data, format=format)
-            
-            # Transcribe audio to text
-            text = agent.voice_processor.process_audio_file(audio_data, format)
+            # Transcribe audio to text (silent clips are rejected without calling Whisper)
+            text, activity = await run_in_threadpool(agent.voice_processor.transcribe, audio_data, format)
             if not text:
-                return ChoresVoiceResponse(success=False, message="Could not transcribe audio.")
+                no_speech = activity is not None and not activity.has_speech
+                return ChoresVoiceResponse(
+                    success=False,
+                    message="No speech detected." if no_speech else "Could not transcribe audio.",
+                    speech_activity=activity.to_dict() if activity else None
+                )
                 
         except Exception as e:
             return ChoresVoiceResponse(success=False, message=f"Error processing audio: {str(e)}")
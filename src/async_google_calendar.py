@@ -0,0 +1,352 @@
+import asyncio
+import heapq
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
+from urllib.parse import quote
+import httpx
+from google.auth.transport.requests import Request
+from .config import Config
+from .models import CalendarEvent, CalendarResponse
+from .event_store import CalendarEventStore
+from .google_calendar import GoogleCalendarManager, EVENTS_LIST_FIELDS, LIST_PAGE_SIZE
+
+CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
+
+class AsyncGoogleCalendarManager:
+    """Async counterpart of GoogleCalendarManager for the FastAPI handlers.
+
+    Talks to the Calendar REST API over a pooled keep-alive httpx client
+    instead of the blocking googleapiclient transport. Credentials, the
+    calendar registry and the local event stores are shared with the wrapped
+    sync manager, so both answer from the same cached data.
+    """
+
+    def __init__(self, calendar_manager: GoogleCalendarManager):
+        self.calendar_manager = calendar_manager
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            api_root = self.calendar_manager.api_root
+            self._client = httpx.AsyncClient(
+                base_url=f"{api_root}calendar/v3" if api_root else CALENDAR_API_BASE,
+                timeout=httpx.Timeout(Config.CALENDAR_HTTP_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=Config.CALENDAR_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.CALENDAR_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=Config.CALENDAR_HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close pooled connections (call on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        """Authorization header, refreshing the shared credentials off the event loop if needed"""
+        creds = self.calendar_manager.credentials
+        if not creds.valid:
+            if self._refresh_lock is None:
+                self._refresh_lock = asyncio.Lock()
+            async with self._refresh_lock:
+                if not creds.valid:
+                    await asyncio.to_thread(creds.refresh, Request())
+        headers = {}
+        creds.apply(headers)
+        return headers
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """Send an authorized API request and return the decoded JSON body"""
+        headers = await self._auth_headers()
+        response = await self._get_client().request(method, path, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    async def _paginate(self, path: str, params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield each response page of a list call, following nextPageToken"""
+        params = dict(params)
+        while True:
+            page = await self._request('GET', path, params=params)
+            yield page
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return
+            params['pageToken'] = page_token
+
+    @staticmethod
+    def _events_path(calendar_id: str) -> str:
+        return f"/calendars/{quote(calendar_id, safe='')}/events"
+
+    async def _ensure_calendar_list(self):
+        """Load the calendar registry once without blocking the loop; later lookups are in-memory"""
+        registry = self.calendar_manager.calendar_registry
+        if not registry.is_loaded:
+            await asyncio.to_thread(registry.get_calendars)
+
+    async def _resolve_calendar_id(self, calendar_id: Optional[str]) -> str:
+        await self._ensure_calendar_list()
+        return self.calendar_manager._resolve_calendar_id(calendar_id)
+
+    async def _sync_calendar(self, calendar_id: str) -> CalendarEventStore:
+        """Async version of GoogleCalendarManager._sync_calendar (full sync, then sync-token deltas)"""
+        cache = self.calendar_manager.event_cache
+        store = cache.store(calendar_id)
+        if not cache.needs_sync(store):
+            cache.record('hits')
+            return store
+        lock = self._sync_locks.setdefault(calendar_id, asyncio.Lock())
+        async with lock:
+            if not cache.needs_sync(store):
+                cache.record('hits')
+                return store
+            try:
+                await self._pull_changes(store)
+            except httpx.HTTPStatusError as error:
+                if error.response.status_code != 410:
+                    raise
+                print(f"[DEBUG] Sync token expired for calendar {calendar_id}, running full resync")
+                cache.record('expired_tokens')
+                await self._pull_changes(store, full_sync=True)
+        return store
+
+    async def _pull_changes(self, store: CalendarEventStore, full_sync: bool = False):
+        """Fetch a full or delta sync (a full one if the store has no token, or with `full_sync`),
+        then apply it unless a concurrent sync already moved the store on"""
+        observed_token = store.sync_token
+        start_token = None if full_sync else observed_token
+        generation = store.generation  # invalidations after this may not be in the pages fetched
+        params = {'singleEvents': 'true', 'maxResults': LIST_PAGE_SIZE, 'fields': EVENTS_LIST_FIELDS}
+        if start_token:
+            params['syncToken'] = start_token
+
+        items = []
+        async for page in self._paginate(self._events_path(store.calendar_id), params):
+            items.extend(page.get('items', []))
+            next_sync_token = page.get('nextSyncToken')
+
+        # A threaded sync may hold the store; wait for it off the event loop. If
+        # it moved the store on meanwhile, its result stands and ours is stale.
+        if not store.lock.acquire(blocking=False):
+            acquire = asyncio.ensure_future(asyncio.to_thread(store.lock.acquire))
+            try:
+                await asyncio.shield(acquire)
+            except asyncio.CancelledError:
+                acquire.add_done_callback(lambda _: store.lock.release())
+                raise
+        try:
+            if store.sync_token != observed_token:
+                return
+            if start_token is None:
+                store.reset()
+            for item in items:
+                if item.get('status') == 'cancelled':
+                    store.remove(item['id'])
+                else:
+                    store.put(self.calendar_manager._to_calendar_event(item, store.calendar_id))
+            store.mark_synced(next_sync_token, generation)
+        finally:
+            store.lock.release()
+
+        cache = self.calendar_manager.event_cache
+        cache.record('delta_syncs' if start_token else 'full_syncs')
+        cache.record('events_changed', len(items))
+        print(f"[DEBUG] {'Delta' if start_token else 'Full'} async sync of {store.calendar_id}: {len(items)} events")
+
+    async def _calendar_events(self, calendar_id: str, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None, query: Optional[str] = None,
+                               max_results: Optional[int] = None) -> List[CalendarEvent]:
+        """One calendar's events in start-time order, from the local store or paged from Google"""
+        manager = self.calendar_manager
+        if manager.cache_enabled:
+            store = await self._sync_calendar(calendar_id)
+            return list(islice(manager._iter_store_events(store, start_date, end_date, query), max_results))
+
+        params = {
+            'maxResults': manager._page_size(max_results),
+            'singleEvents': 'true',
+            'orderBy': 'startTime',
+            'fields': EVENTS_LIST_FIELDS,
+        }
+        if start_date:
+            params['timeMin'] = manager._format_gcal_time(start_date)
+        if end_date:
+            params['timeMax'] = manager._format_gcal_time(end_date)
+        if query:
+            params['q'] = query
+        events = []
+        async for page in self._paginate(self._events_path(calendar_id), params):
+            events.extend(manager._to_calendar_event(item, calendar_id) for item in page.get('items', []))
+            if max_results is not None and len(events) >= max_results:
+                break
+        return events[:max_results] if max_results is not None else events
+
+    async def list_calendars(self) -> CalendarResponse:
+        """List all available calendars"""
+        try:
+            await self._ensure_calendar_list()
+            calendars = self.calendar_manager.calendar_registry.get_calendars()
+            return CalendarResponse(
+                success=True,
+                message=f"Found {len(calendars)} calendars",
+                calendars=calendars
+            )
+        except Exception as error:
+            return CalendarResponse(
+                success=False,
+                message="Failed to list calendars",
+                error=str(error)
+            )
+
+    async def get_events(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                         max_results: Optional[int] = 10) -> CalendarResponse:
+        """Get calendar events within a date range"""
+        try:
+            if not start_date:
+                start_date = datetime.utcnow()
+            if not end_date:
+                end_date = start_date + timedelta(days=7)
+            calendar_id = await self._resolve_calendar_id(None)
+            calendar_events = await self._calendar_events(calendar_id, start_date, end_date, max_results=max_results)
+            return CalendarResponse(
+                success=True,
+                message=f"Found {len(calendar_events)} events",
+                events=calendar_events
+            )
+        except httpx.HTTPError as error:
+            return CalendarResponse(
+                success=False,
+                message="Failed to retrieve events",
+                error=str(error)
+            )
+
+    async def search_events(self, query: str, max_results: Optional[int] = 10) -> CalendarResponse:
+        """Search for events by query string"""
+        try:
+            calendar_id = await self._resolve_calendar_id(None)
+            calendar_events = await self._calendar_events(calendar_id, query=query, max_results=max_results)
+            return CalendarResponse(
+                success=True,
+                message=f"Found {len(calendar_events)} events matching '{query}'",
+                events=calendar_events
+            )
+        except httpx.HTTPError as error:
+            return CalendarResponse(
+                success=False,
+                message="Failed to search events",
+                error=str(error)
+            )
+
+    async def _fetch_calendar_events(self, cal_id: str, start_date: datetime, end_date: datetime,
+                                     max_results: Optional[int]) -> Tuple[str, List[CalendarEvent], float]:
+        """Fetch one calendar's events for the fan-out; failures yield an empty list"""
+        started = time.perf_counter()
+        try:
+            events = await self._calendar_events(cal_id, start_date, end_date, max_results=max_results)
+        except Exception as e:
+            print(f"[DEBUG] Error querying calendar {cal_id}: {e}")
+            events = []  # Skip calendars that error out
+        return cal_id, events, (time.perf_counter() - started) * 1000
+
+    async def get_events_all_calendars(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                                       max_results: Optional[int] = 10) -> CalendarResponse:
+        """Get events from all calendars within a date range, fetched concurrently and merged by start time"""
+        try:
+            if not start_date:
+                start_date = datetime.utcnow()
+            if not end_date:
+                end_date = start_date + timedelta(days=7)
+
+            calendar_list_resp = await self.list_calendars()
+            if not calendar_list_resp.success or not calendar_list_resp.calendars:
+                return CalendarResponse(success=False, message="Failed to list calendars", error=calendar_list_resp.error)
+            calendar_ids = [cal['id'] for cal in calendar_list_resp.calendars]
+
+            results = await asyncio.gather(*[
+                self._fetch_calendar_events(cal_id, start_date, end_date, max_results)
+                for cal_id in calendar_ids
+            ])
+            all_events = list(heapq.merge(*[events for _, events, _ in results], key=lambda e: e.start_time))
+            return CalendarResponse(
+                success=True,
+                message=f"Found {len(all_events)} events across all calendars",
+                events=all_events,
+                calendar_timings={cal_id: round(elapsed_ms, 1) for cal_id, _, elapsed_ms in results}
+            )
+        except Exception as error:
+            print(f"[DEBUG] Exception in async get_events_all_calendars: {error}")
+            return CalendarResponse(
+                success=False,
+                message="Failed to retrieve events from all calendars",
+                error=str(error)
+            )
+
+    async def create_event(self, event: CalendarEvent) -> CalendarResponse:
+        """Create a new calendar event"""
+        try:
+            calendar_id = await self._resolve_calendar_id(event.calendar_id)
+            event_result = await self._request(
+                'POST', self._events_path(calendar_id),
+                params={'sendUpdates': 'all', 'fields': 'id'},
+                json=self.calendar_manager._event_body(event)
+            )
+            self.calendar_manager.event_cache.invalidate(calendar_id)
+            return CalendarResponse(
+                success=True,
+                message=f"Event '{event.summary}' created successfully",
+                event_id=event_result['id']
+            )
+        except httpx.HTTPError as error:
+            return CalendarResponse(
+                success=False,
+                message="Failed to create event",
+                error=str(error)
+            )
+
+    async def update_event(self, event_id: str, event: CalendarEvent) -> CalendarResponse:
+        """Update an existing calendar event"""
+        try:
+            calendar_id = await self._resolve_calendar_id(None)
+            updated_event = await self._request(
+                'PUT', f"{self._events_path(calendar_id)}/{quote(event_id, safe='')}",
+                params={'sendUpdates': 'all', 'fields': 'id'},
+                json=self.calendar_manager._event_body(event, include_reminders=False)
+            )
+            self.calendar_manager.event_cache.invalidate(calendar_id)
+            return CalendarResponse(
+                success=True,
+                message=f"Event '{event.summary}' updated successfully",
+                event_id=updated_event['id']
+            )
+        except httpx.HTTPError as error:
+            return CalendarResponse(
+                success=False,
+                message="Failed to update event",
+                error=str(error)
+            )
+
+    async def delete_event(self, event_id: str) -> CalendarResponse:
+        """Delete a calendar event"""
+        try:
+            calendar_id = await self._resolve_calendar_id(None)
+            await self._request(
+                'DELETE', f"{self._events_path(calendar_id)}/{quote(event_id, safe='')}",
+                params={'sendUpdates': 'all'}
+            )
+            self.calendar_manager.event_cache.invalidate(calendar_id)
+            return CalendarResponse(
+                success=True,
+                message="Event deleted successfully"
+            )
+        except httpx.HTTPError as error:
+            return CalendarResponse(
+                success=False,
+                message="Failed to delete event",
+                error=str(error)
+            )
@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from .config import Config
+
+def _worker_ready(_) -> int:
+    return os.getpid()
+
+class AudioPool:
+    """Bounded pool for CPU-heavy audio jobs: ffmpeg decodes and encodes, and
+    voice activity detection.
+
+    At most `workers` jobs run at once, so concurrent uploads share the cores
+    instead of oversubscribing them; the rest wait their turn. ffmpeg is
+    already a process of its own, so those jobs run from the calling thread.
+    Pure-Python jobs (`cpu=True`) go to worker processes, where they run in
+    parallel instead of taking turns on the GIL. get_stats() reports the
+    queue depth and wait and run times per kind of job.
+    """
+
+    def __init__(self, workers: int, processes: bool = True):
+        self.workers = max(1, workers)
+        self.processes = processes
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queued = 0
+        self._active = 0
+        self._peak_queued = 0
+        self._jobs: Dict[str, Dict[str, float]] = {}
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork: forking a process full of threads (uvicorn, thread pools) can deadlock
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def run(self, kind: str, fn: Callable, *args, cpu: bool = False) -> Any:
+        """Run fn(*args) as a `kind` job once a slot is free; with `cpu`, in a
+        worker process (fn and its arguments must be picklable)"""
+        queued_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        self._slots.acquire()
+        started = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        failed = True
+        try:
+            if cpu and self.processes:
+                result = self._run_in_process(fn, *args)
+            else:
+                result = fn(*args)
+            failed = False
+            return result
+        finally:
+            finished = time.perf_counter()
+            self._slots.release()
+            self._record(kind, started - queued_at, finished - started, failed)
+
+    def _run_in_process(self, fn: Callable, *args) -> Any:
+        try:
+            return self._process_pool().submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory): start a new pool next time and do this job here
+            print("⚠️  Audio worker process died; restarting the pool")
+            with self._lock:
+                executor, self._executor = self._executor, None
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            return fn(*args)
+
+    def _record(self, kind: str, wait: float, run: float, failed: bool):
+        with self._lock:
+            self._active -= 1
+            job = self._jobs.setdefault(kind, {'count': 0, 'errors': 0, 'wait_ms': 0.0, 'run_ms': 0.0,
+                                               'max_run_ms': 0.0})
+            job['count'] += 1
+            job['errors'] += failed
+            job['wait_ms'] += wait * 1000
+            job['run_ms'] += run * 1000
+            job['max_run_ms'] = max(job['max_run_ms'], run * 1000)
+
+    def warm_up(self) -> int:
+        """Start the worker processes ahead of the first job; returns how many are running"""
+        if not self.processes:
+            return 0
+        return len(set(self._process_pool().map(_worker_ready, range(self.workers))))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {'workers': self.workers, 'processes': self.processes, 'active': self._active,
+                     'queued': self._queued, 'peak_queued': self._peak_queued, 'jobs': {}}
+            for kind, job in self._jobs.items():
+                stats['jobs'][kind] = {
+                    'count': job['count'],
+                    'errors': job['errors'],
+                    'avg_wait_ms': round(job['wait_ms'] / job['count'], 1),
+                    'avg_run_ms': round(job['run_ms'] / job['count'], 1),
+                    'max_run_ms': round(job['max_run_ms'], 1),
+                }
+        return stats
+
+_lock = threading.Lock()
+_pool: Optional[AudioPool] = None
+
+def get_audio_pool() -> AudioPool:
+    """Process-wide audio pool, sized by AUDIO_POOL_WORKERS"""
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = AudioPool(Config.AUDIO_POOL_WORKERS, Config.AUDIO_POOL_PROCESSES)
+    return _pool
+
+def close_audio_pool():
+    """Stop the worker processes (call on app shutdown)"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -1,22 +1,44 @@
-from typing import Optional, Tuple, Union
-from datetime import datetime
+import re
+import base64
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
 from .voice_processor import VoiceProcessor
+from .vad import SpeechActivity
 from .nlp_processor import NLPProcessor
 from .google_calendar import GoogleCalendarManager
-from .conversation_manager import ConversationManager
-from .tts_processor import TTSProcessor
+from .async_google_calendar import AsyncGoogleCalendarManager
+from .free_busy import FreeBusyEngine
+from .conversation_manager import ConversationManager, ERROR_REPLY
+from .tts_processor import TTSProcessor, SentenceSplitter
+from .config import Config
+from .keyword_matcher import KeywordMatcher
 from .models import (
     VoiceInput, TextInput, SMSInput, ProcessedCommand, 
     AgentResponse, CalendarResponse, InputType, CalendarEvent
 )
 
+# Words that make a conversational message worth fetching calendar context for
+CONVERSATION_KEYWORDS = KeywordMatcher({
+    'calendar': ['calendar', 'event', 'schedule', 'appointment', 'meeting', 'date', 'when', 'what', 'have', 'got', 'doing'],
+})
+
+# Month queries are answered with the calendar view rather than a spoken summary
+MONTH_OVERVIEW_REPLY = "Here’s your calendar for this month. Is there a specific week or day you’d like to review?"
+TRANSCRIPTION_FAILED_REPLY = "Could not transcribe audio. Please try again."
+NO_SPEECH_REPLY = "I didn't hear anything. Please try again."
+# Fixed replies that are spoken; synthesized ahead of time by prewarm_speech()
+CANNED_REPLIES = [MONTH_OVERVIEW_REPLY, ERROR_REPLY]
+
 class CalendarAgent:
     def __init__(self):
         self.voice_processor = VoiceProcessor()
         self.nlp_processor = NLPProcessor()
         self.calendar_manager = GoogleCalendarManager()
+        self.async_calendar_manager = AsyncGoogleCalendarManager(self.calendar_manager)
+        self.free_busy = FreeBusyEngine(self.calendar_manager)
         self.conversation_manager = ConversationManager()
         self.tts_processor = TTSProcessor()
+        self.date_resolver = self.nlp_processor.date_resolver
     
     def process_voice_command(self, voice_input: VoiceInput) -> AgentResponse:
         """Process voice command and execute calendar action"""
@@ -24,18 +46,8 @@ class CalendarAgent:
             print(f"🎤 Processing voice command: {len(voice_input.audio_data)} bytes, format: {voice_input.format}")
             
             # Convert voice to text
-            text = self.voice_processor.process_voice_input(voice_input)
-            if not text:
-                return AgentResponse(
-                    success=False,
-                    message="Could not transcribe audio. Please check your recording and try again.",
-                    confidence=0.0
-                )
-            
-            print(f"📝 Transcribed text: '{text}'")
-            
-            # Process the text command
-            return self._process_text_command(text, InputType.VOICE)
+            text, activity = self.voice_processor.transcribe(voice_input.audio_data, voice_input.format)
+            return self.process_transcribed_command(text, activity)
             
         except Exception as e:
             print(f"❌ Voice command error: {e}")
@@ -45,6 +57,26 @@ class CalendarAgent:
                 confidence=0.0
             )
     
+    def process_transcribed_command(self, text: Optional[str], activity: Optional[SpeechActivity]) -> AgentResponse:
+        """Execute a voice command that has been transcribed (text is None if nothing was said or transcription failed)"""
+        speech_activity = activity.to_dict() if activity else None
+        if not text:
+            return AgentResponse(
+                success=False,
+                message=self._no_transcript_reply(
+                    activity, "Could not transcribe audio. Please check your recording and try again."
+                ),
+                confidence=0.0,
+                speech_activity=speech_activity
+            )
+        
+        print(f"📝 Transcribed text: '{text}'")
+        
+        # Process the text command
+        response = self._process_text_command(text, InputType.VOICE)
+        response.speech_activity = speech_activity
+        return response
+    
     def process_text_command(self, text_input: TextInput) -> AgentResponse:
         """Process text command and execute calendar action"""
         return self._process_text_command(text_input.message, InputType.TEXT)
@@ -85,81 +117,50 @@ class CalendarAgent:
         try:
             if command.action.value == "create":
                 if command.event:
-                    # Create the primary event
-                    primary_response = self.calendar_manager.create_event(command.event)
+                    if not command.additional_events:
+                        # Check before inserting, or the new event would conflict with itself
+                        warning = self._conflict_warning([command.event])
+                        response = self.calendar_manager.create_event(command.event)
+                        if response.success and warning:
+                            response.message = f"{response.message}\n{warning}"
+                        return response
                     
-                    # If there are additional events, create them too
-                    if command.additional_events and primary_response.success:
-                        additional_responses = []
-                        for event_data in command.additional_events:
-                            try:
-                                # Parse the additional event data
-                                from datetime import datetime, timedelta
-                                from dateutil import parser
-                                
-                                start_time = datetime.now()
-                                end_time = datetime.now() + timedelta(hours=1)
-                                
-                                if event_data.get('start_time'):
-                                    try:
-                                        start_time = parser.parse(str(event_data.get('start_time')))
-                                    except:
-                                        start_time = datetime.now()
-                                
-                                if event_data.get('end_time'):
-                                    try:
-                                        end_time = parser.parse(str(event_data.get('end_time')))
-                                    except:
-                                        end_time = start_time + timedelta(hours=1)
-                                
-                                # Parse reminders if provided
-                                reminders = None
-                                if event_data.get('reminders'):
-                                    reminders = {
-                                        'useDefault': False,
-                                        'overrides': event_data.get('reminders', [])
-                                    }
-                                
-                                additional_event = CalendarEvent(
-                                    summary=event_data.get('summary', command.event.summary),
-                                    description=event_data.get('description', command.event.description),
-                                    start_time=start_time,
-                                    end_time=end_time,
-                                    location=event_data.get('location', command.event.location),
-                                    attendees=event_data.get('attendees', command.event.attendees or []),
-                                    reminders=reminders,
-                                    calendar_id=event_data.get('calendar_id', command.event.calendar_id)
-                                )
-                                
-                                additional_response = self.calendar_manager.create_event(additional_event)
-                                additional_responses.append(additional_response)
-                                
-                            except Exception as e:
-                                print(f"Error creating additional event: {e}")
-                                additional_responses.append(CalendarResponse(
-                                    success=False,
-                                    message=f"Failed to create additional event: {str(e)}",
-                                    error=str(e)
-                                ))
-                        
-                        # Return combined response
-                        total_events = 1 + len(command.additional_events)
-                        successful_events = 1 + sum(1 for r in additional_responses if r.success)
-                        
-                        if successful_events == total_events:
-                            return CalendarResponse(
-                                success=True,
-                                message=f"Successfully created {total_events} events",
-                                event_id=primary_response.event_id
-                            )
-                        else:
-                            return CalendarResponse(
+                    # Build every event up front so they can be inserted in one batch round-trip
+                    events = [command.event]
+                    build_failures = []
+                    for event_data in command.additional_events:
+                        try:
+                            events.append(self._build_additional_event(event_data, command.event))
+                        except Exception as e:
+                            print(f"Error creating additional event: {e}")
+                            build_failures.append(CalendarResponse(
                                 success=False,
-                                message=f"Created {successful_events} out of {total_events} events. Some events failed to create.",
-                                event_id=primary_response.event_id if primary_response.success else None
-                            )
+                                message=f"Failed to create additional event: {str(e)}",
+                                error=str(e)
+                            ))
+                    
+                    warning = self._conflict_warning(events)
+                    responses = self.calendar_manager.create_events(events)
+                    primary_response = responses[0]
+                    
+                    # Return combined response
+                    total_events = 1 + len(command.additional_events)
+                    successful_events = sum(1 for r in responses if r.success)
                     
-                    return primary_response
+                    if successful_events == total_events:
+                        message = f"Successfully created {total_events} events"
+                        return CalendarResponse(
+                            success=True,
+                            message=f"{message}\n{warning}" if warning else message,
+                            event_id=primary_response.event_id
+                        )
+                    else:
+                        return CalendarResponse(
+                            success=False,
+                            message=f"Created {successful_events} out of {total_events} events. Some events failed to create.",
+                            event_id=primary_response.event_id if primary_response.success else None,
+                            error=next((r.error for r in responses + build_failures if not r.success), None)
+                        )
                 else:
                     return CalendarResponse(
                         success=False,
@@ -192,6 +193,10 @@ class CalendarAgent:
                 )
             
             elif command.action.value == "read":
+                # Availability questions are answered from free/busy data instead of event listings
+                if self._is_availability_question(command):
+                    return self._find_free_time(command)
+                
                 # For read actions, prioritize date-based queries over text searches
                 # If we have specific dates in the event, use those
                 if command.event and command.event.start_time and command.event.end_time:
@@ -234,6 +239,94 @@ class CalendarAgent:
                 error=str(e)
             )
     
+    def _is_availability_question(self, command: ProcessedCommand) -> bool:
+        """Whether a read asks when people are free rather than what is scheduled"""
+        text = f"{command.raw_input} {command.query or ''}".lower()
+        return bool(re.search(r"\b(free|available|availability|open slots?|free time)\b", text))
+    
+    def _availability_window(self, command: ProcessedCommand) -> Tuple[datetime, datetime]:
+        """Time window for an availability question (defaults to the next 7 days)"""
+        if command.event and command.event.start_time and command.event.end_time:
+            return command.event.start_time, command.event.end_time
+        date_range = self._parse_date_query(command.query or command.raw_input)
+        if date_range:
+            return date_range
+        now = datetime.now()
+        return now, now + timedelta(days=7)
+    
+    @staticmethod
+    def _requested_duration(text: str) -> timedelta:
+        """Slot length asked for, e.g. 'free for 2 hours' or '30 minutes'"""
+        match = re.search(r"(\d+(?:\.\d+)?)\s*(hours?|hrs?|minutes?|mins?)\b", text.lower())
+        if not match:
+            return timedelta(minutes=Config.FREE_SLOT_DEFAULT_MINUTES)
+        amount = float(match.group(1))
+        if match.group(2).startswith('h'):
+            return timedelta(hours=amount)
+        return timedelta(minutes=amount)
+    
+    def _find_free_time(self, command: ProcessedCommand) -> CalendarResponse:
+        """Free slots common to all calendars for an availability question"""
+        start_date, end_date = self._availability_window(command)
+        duration = self._requested_duration(command.raw_input)
+        print(f"[DEBUG] Finding free slots of {duration} between {start_date} and {end_date}")
+        slots = self.free_busy.find_free_slots(None, (start_date, end_date), duration)
+        return CalendarResponse(
+            success=True,
+            message=f"Found {len(slots)} free slots",
+            free_slots=[{'start': start, 'end': end} for start, end in slots]
+        )
+    
+    def _conflict_warning(self, events: List[CalendarEvent]) -> Optional[str]:
+        """Warning listing existing events that overlap the ones about to be created"""
+        conflicts = self.free_busy.find_conflicts(events)
+        if not conflicts:
+            return None
+        conflict_list = ", ".join(
+            f"{conflict.summary} ({conflict.start_time.strftime('%I:%M %p')})"
+            for conflict in conflicts[:3]
+        )
+        return f"⚠️ Heads up, this overlaps with: {conflict_list}"
+    
+    def _build_additional_event(self, event_data: dict, primary_event: CalendarEvent) -> CalendarEvent:
+        """Build a CalendarEvent from extra event data, defaulting fields to the primary event"""
+        from datetime import datetime, timedelta
+        from dateutil import parser
+        
+        start_time = datetime.now()
+        end_time = datetime.now() + timedelta(hours=1)
+        
+        if event_data.get('start_time'):
+            try:
+                start_time = parser.parse(str(event_data.get('start_time')))
+            except:
+                start_time = datetime.now()
+        
+        if event_data.get('end_time'):
+            try:
+                end_time = parser.parse(str(event_data.get('end_time')))
+            except:
+                end_time = start_time + timedelta(hours=1)
+        
+        # Parse reminders if provided
+        reminders = None
+        if event_data.get('reminders'):
+            reminders = {
+                'useDefault': False,
+                'overrides': event_data.get('reminders', [])
+            }
+        
+        return CalendarEvent(
+            summary=event_data.get('summary', primary_event.summary),
+            description=event_data.get('description', primary_event.description),
+            start_time=start_time,
+            end_time=end_time,
+            location=event_data.get('location', primary_event.location),
+            attendees=event_data.get('attendees', primary_event.attendees or []),
+            reminders=reminders,
+            calendar_id=event_data.get('calendar_id', primary_event.calendar_id)
+        )
+    
     def _generate_response_message(self, command: ProcessedCommand, 
                                  calendar_response: CalendarResponse) -> str:
         """Generate a user-friendly response message"""
@@ -244,7 +337,15 @@ class CalendarAgent:
             return f"✅ {calendar_response.message}"
         
         elif command.action.value in ["read", "list"]:
-            if calendar_response.events:
+            if calendar_response.free_slots is not None:
+                if not calendar_response.free_slots:
+                    return "📅 No free time found for the specified time period."
+                slot_list = "\n".join([
+                    f"• {slot['start'].strftime('%A %B %d, %I:%M %p')} - {slot['end'].strftime('%I:%M %p')}"
+                    for slot in calendar_response.free_slots[:5]  # Show first 5
+                ])
+                return f"🟢 Free times:\n{slot_list}"
+            elif calendar_response.events:
                 event_count = len(calendar_response.events)
                 if event_count == 0:
                     return "📅 No events found for the specified time period."
@@ -282,75 +383,9 @@ class CalendarAgent:
         return suggestions
     
     def _parse_date_query(self, query: str) -> Union[Tuple[datetime, datetime], None]:
-        """Parse date queries like 'this week', 'next week', 'today', etc., and weekday names like 'Wednesday'."""
-        from datetime import datetime, timedelta
-        from dateutil import tz
-        import re
-        
-        query_lower = query.lower().strip()
-        now = datetime.now()
-        
-        # Get Chicago timezone
-        chicago_tz = tz.gettz('America/Chicago')
-        
-        # Calculate current week boundaries (Monday to Sunday)
-        days_since_monday = now.weekday()
-        monday = now - timedelta(days=days_since_monday)
-        sunday = monday + timedelta(days=6)
-        
-        # Set time to start/end of day with timezone
-        monday = monday.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
-        sunday = sunday.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
-        
-        # Use substring matching to detect relative date phrases anywhere in the query
-        if any(phrase in query_lower for phrase in ["this week", "the week", "week", "current week"]):
-            return (monday, sunday)
-        elif any(phrase in query_lower for phrase in ["next week"]):
-            next_monday = monday + timedelta(days=7)
-            next_sunday = sunday + timedelta(days=7)
-            return (next_monday, next_sunday)
-        elif any(phrase in query_lower for phrase in ["last week", "previous week"]):
-            last_monday = monday - timedelta(days=7)
-            last_sunday = sunday - timedelta(days=7)
-            return (last_monday, last_sunday)
-        elif any(phrase in query_lower for phrase in ["today"]):
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
-            today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
-            return (today_start, today_end)
-        elif any(phrase in query_lower for phrase in ["tomorrow"]):
-            tomorrow = now + timedelta(days=1)
-            tomorrow_start = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
-            tomorrow_end = tomorrow.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
-            return (tomorrow_start, tomorrow_end)
-        elif any(phrase in query_lower for phrase in ["this month", "current month"]):
-            month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
-            if now.month == 12:
-                next_month = now.replace(year=now.year + 1, month=1, day=1)
-            else:
-                next_month = now.replace(month=now.month + 1, day=1)
-            month_end = next_month - timedelta(days=1)
-            month_end = month_end.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
-            return (month_start, month_end)
-        
-        # Handle weekday queries (e.g., 'on Wednesday', 'next Wednesday')
-        weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        for i, weekday in enumerate(weekdays):
-            # Regex to match 'on wednesday', 'next wednesday', or just 'wednesday'
-            if re.search(rf"(on |next )?{weekday}", query_lower):
-                # Calculate days until the next occurrence of the weekday
-                days_ahead = (i - now.weekday() + 7) % 7
-                if days_ahead == 0 and "next" in query_lower:
-                    days_ahead = 7  # If today is the day and 'next' is specified, go to next week
-                elif days_ahead == 0:
-                    # If today is the day and 'next' is not specified, use today
-                    pass
-                target_date = now + timedelta(days=days_ahead)
-                target_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=chicago_tz)
-                target_end = target_date.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=chicago_tz)
-                return (target_start, target_end)
-        
-        return None
-
+        """Parse date queries like 'this week', 'next weekend', 'in two weeks', 'the 21st' and weekday names like 'Wednesday'."""
+        return self.date_resolver.resolve(query)
+    
     def record_and_process(self, duration: int = 5) -> AgentResponse:
         """Record voice from microphone and process the command"""
         try:
@@ -384,12 +419,14 @@ class CalendarAgent:
             print(f"💬 Processing conversational voice for conversation: {conversation_id}")
             
             # Convert voice to text
-            text = self.voice_processor.process_voice_input(voice_input)
+            text, activity = self.voice_processor.transcribe(voice_input.audio_data, voice_input.format)
+            speech_activity = activity.to_dict() if activity else None
             if not text:
                 return AgentResponse(
                     success=False,
-                    message="Could not transcribe audio. Please try again.",
-                    confidence=0.0
+                    message=self._no_transcript_reply(activity),
+                    confidence=0.0,
+                    speech_activity=speech_activity
                 )
             
             print(f"📝 Transcribed text: '{text}'")
@@ -398,42 +435,7 @@ class CalendarAgent:
             self.conversation_manager.add_message(conversation_id, 'user', text, 'voice')
             
             # Get calendar context if the message mentions calendar or time-related words
-            calendar_context = None
-            calendar_keywords = ['calendar', 'event', 'schedule', 'appointment', 'meeting', 'date', 'when', 'what', 'have', 'got', 'doing']
-            detected_keywords = [word for word in calendar_keywords if word in text.lower()]
-            if detected_keywords:
-                print(f"📅 Message mentions calendar/time keywords: {detected_keywords}")
-                # Parse date queries like "tomorrow", "today", etc.
-                date_range = self._parse_date_query(text)
-                print(f"📅 Parsed date range: {date_range}")
-                
-                if date_range:
-                    # Query for specific date range
-                    start_date, end_date = date_range
-                    calendar_response = self.calendar_manager.get_events_all_calendars(
-                        start_date=start_date,
-                        end_date=end_date,
-                        max_results=10
-                    )
-                    print(f"📅 Querying calendar for date range: {start_date} to {end_date}")
-                else:
-                    # Get recent calendar events
-                    calendar_response = self.calendar_manager.get_events_all_calendars(
-                        max_results=5
-                    )
-                
-                if calendar_response.success and calendar_response.events:
-                    calendar_context = {
-                        'query_date_range': date_range,
-                        'events': [
-                            {
-                                'summary': event.summary,
-                                'start_time': event.start_time.isoformat() if event.start_time else None,
-                                'end_time': event.end_time.isoformat() if event.end_time else None
-                            }
-                            for event in calendar_response.events
-                        ]
-                    }
+            calendar_context, date_range, calendar_response = self._conversation_calendar_context(text)
             
             # Generate conversational response
             response_text = self.conversation_manager.generate_response(
@@ -442,40 +444,15 @@ class CalendarAgent:
             
             print(f"🤖 AI Response: '{response_text}'")
             
-            # Convert response to speech
-            audio_data = self.tts_processor.text_to_speech(response_text, voice, model)
-
             # Prepare queried_date and queried_view for UI
-            queried_date = None
-            queried_view = None
-            is_month_query = False
-            if detected_keywords:
-                if 'date_range' in locals() and date_range:
-                    # If it's a range, return both as ISO
-                    queried_date = [start_date.isoformat(), end_date.isoformat()]
-                    # Determine if it's a week or month view
-                    if (end_date - start_date).days >= 27:
-                        queried_view = 'month'
-                        is_month_query = True
-                    elif (end_date - start_date).days >= 6:
-                        queried_view = 'week'
-                    else:
-                        queried_view = 'day'
-                elif 'date_range' in locals() and date_range is not None:
-                    queried_date = date_range.isoformat() if hasattr(date_range, 'isoformat') else str(date_range)
-                    queried_view = 'day'
+            queried_date, queried_view = self._queried_view(date_range)
 
-            # If it's a month query, override the response text and ensure all month events are included
-            if is_month_query:
-                response_text = "Here’s your calendar for this month. Is there a specific week or day you’d like to review?"
-                # Query all events for the month if not already done
-                if not (calendar_response and calendar_response.success and calendar_response.events):
-                    # Use the parsed month range
-                    calendar_response = self.calendar_manager.get_events_all_calendars(
-                        start_date=start_date,
-                        end_date=end_date,
-                        max_results=100
-                    )
+            # If it's a month query, override the response text
+            if queried_view == 'month':
+                response_text = MONTH_OVERVIEW_REPLY
+
+            # Convert response to speech (after any override, so the speech matches the message)
+            audio_data = self.tts_processor.text_to_speech(response_text, voice, model)
 
             if audio_data:
                 print(f"🎤 Generated speech: {len(audio_data)} bytes")
@@ -486,7 +463,8 @@ class CalendarAgent:
                     audio_response=audio_data,
                     queried_date=queried_date,
                     queried_view=queried_view,
-                    calendar_response=calendar_response
+                    calendar_response=calendar_response,
+                    speech_activity=speech_activity
                 )
             else:
                 print("⚠️  TTS failed, returning text only")
@@ -496,7 +474,8 @@ class CalendarAgent:
                     confidence=0.9,
                     queried_date=queried_date,
                     queried_view=queried_view,
-                    calendar_response=calendar_response
+                    calendar_response=calendar_response,
+                    speech_activity=speech_activity
                 )
             
         except Exception as e:
@@ -507,6 +486,62 @@ class CalendarAgent:
                 confidence=0.0
             )
     
+    @staticmethod
+    def _no_transcript_reply(activity: Optional[SpeechActivity], default: str = TRANSCRIPTION_FAILED_REPLY) -> str:
+        """Why a voice upload produced no text: nothing was said, or transcription failed"""
+        return NO_SPEECH_REPLY if activity is not None and not activity.has_speech else default
+    
+    def _conversation_calendar_context(self, text: str) -> Tuple[Optional[dict], Optional[Tuple[datetime, datetime]],
+                                                                 Optional[CalendarResponse]]:
+        """Calendar events for the message's date range (if it mentions the calendar), that range,
+        and the calendar response they came from"""
+        detected_keywords = CONVERSATION_KEYWORDS.matches(text).get('calendar', [])
+        if not detected_keywords:
+            return None, None, None
+        print(f"📅 Message mentions calendar/time keywords: {detected_keywords}")
+        # Parse date queries like "tomorrow", "today", etc.
+        date_range = self._parse_date_query(text)
+        
+        if date_range:
+            # Query for specific date range
+            start_date, end_date = date_range
+            calendar_response = self.calendar_manager.get_events_all_calendars(
+                start_date=start_date,
+                end_date=end_date,
+                max_results=None  # every event in the range, across all pages
+            )
+            print(f"📅 Querying calendar for date range: {start_date} to {end_date}")
+        else:
+            # Get recent calendar events
+            calendar_response = self.calendar_manager.get_events_all_calendars(
+                max_results=5
+            )
+        
+        calendar_context = None
+        if calendar_response.success and calendar_response.events:
+            calendar_context = {
+                'query_date_range': date_range,
+                'events': [
+                    {
+                        'summary': event.summary,
+                        'start_time': event.start_time.isoformat() if event.start_time else None,
+                        'end_time': event.end_time.isoformat() if event.end_time else None
+                    }
+                    for event in calendar_response.events
+                ]
+            }
+        return calendar_context, date_range, calendar_response
+    
+    @staticmethod
+    def _queried_view(date_range: Optional[Tuple[datetime, datetime]]) -> Tuple[Optional[List[str]], Optional[str]]:
+        """queried_date and queried_view for the UI: the range and whether it is a day, week or month"""
+        if not date_range:
+            return None, None
+        start_date, end_date = date_range
+        days = (end_date - start_date).days
+        view = 'month' if days >= 27 else 'week' if days >= 6 else 'day'
+        return [start_date.isoformat(), end_date.isoformat()], view
+    
     def process_conversational_text(self, text: str, conversation_id: str,
                                   voice: str = None, model: str = None) -> AgentResponse:
         """Process text input in a conversational context and return voice response"""
@@ -519,41 +554,7 @@ class CalendarAgent:
             print(f"✅ Added user message to conversation")
             
             # Get calendar context if the message mentions calendar or time-related words
-            calendar_context = None
-            calendar_keywords = ['calendar', 'event', 'schedule', 'appointment', 'meeting', 'date', 'when', 'what', 'have', 'got', 'doing']
-            detected_keywords = [word for word in calendar_keywords if word in text.lower()]
-            if detected_keywords:
-                print(f"📅 Message mentions calendar/time keywords: {detected_keywords}")
-                # Parse date queries like "tomorrow", "today", etc.
-                date_range = self._parse_date_query(text)
-                
-                if date_range:
-                    # Query for specific date range
-                    start_date, end_date = date_range
-                    calendar_response = self.calendar_manager.get_events_all_calendars(
-                        start_date=start_date,
-                        end_date=end_date,
-                        max_results=10
-                    )
-                    print(f"📅 Querying calendar for date range: {start_date} to {end_date}")
-                else:
-                    # Get recent calendar events
-                    calendar_response = self.calendar_manager.get_events_all_calendars(
-                        max_results=5
-                    )
-                
-                if calendar_response.success and calendar_response.events:
-                    calendar_context = {
-                        'query_date_range': date_range,
-                        'events': [
-                            {
-                                'summary': event.summary,
-                                'start_time': event.start_time.isoformat() if event.start_time else None,
-                                'end_time': event.end_time.isoformat() if event.end_time else None
-                            }
-                            for event in calendar_response.events
-                        ]
-                    }
+            calendar_context, date_range, _ = self._conversation_calendar_context(text)
             
             # Generate conversational response
             response_text = self.conversation_manager.generate_response(
@@ -562,31 +563,15 @@ class CalendarAgent:
             
             print(f"🤖 AI Response: '{response_text}'")
             
-            # Convert response to speech
-            audio_data = self.tts_processor.text_to_speech(response_text, voice, model)
-
             # Prepare queried_date and queried_view for UI
-            queried_date = None
-            queried_view = None
-            is_month_query = False
-            if detected_keywords:
-                if 'date_range' in locals() and date_range:
-                    queried_date = [start_date.isoformat(), end_date.isoformat()]
-                    # Determine if it's a week or month view
-                    if (end_date - start_date).days >= 27:
-                        queried_view = 'month'
-                        is_month_query = True
-                    elif (end_date - start_date).days >= 6:
-                        queried_view = 'week'
-                    else:
-                        queried_view = 'day'
-                elif 'date_range' in locals() and date_range is not None:
-                    queried_date = date_range.isoformat() if hasattr(date_range, 'isoformat') else str(date_range)
-                    queried_view = 'day'
+            queried_date, queried_view = self._queried_view(date_range)
 
             # If it's a month query, override the response text
-            if is_month_query:
-                response_text = "Here’s your calendar for this month. Is there a specific week or day you’d like to review?"
+            if queried_view == 'month':
+                response_text = MONTH_OVERVIEW_REPLY
+
+            # Convert response to speech (after any override, so the speech matches the message)
+            audio_data = self.tts_processor.text_to_speech(response_text, voice, model)
 
             if audio_data:
                 print(f"🎤 Generated speech: {len(audio_data)} bytes")
@@ -616,6 +601,112 @@ class CalendarAgent:
                 confidence=0.0
             )
     
+    def stream_conversational_text(self, text: str, conversation_id: str,
+                                   voice: str = None, model: str = None) -> Iterator[Dict[str, Any]]:
+        """Conversational text with the reply streamed as it is generated.
+
+        Yields events for the SSE/WebSocket routes: 'context' (the queried
+        range, before the LLM is called), 'delta' per chunk of reply text,
+        'audio' per spoken sentence (base64, in order), then 'done' with the
+        full message, or 'error'.
+        """
+        try:
+            print(f"💬 Streaming conversational text for conversation: {conversation_id}")
+            yield from self._stream_conversation(text, conversation_id, voice, model, 'text')
+        except Exception as e:
+            print(f"❌ Conversational stream error: {e}")
+            yield {'type': 'error', 'success': False, 'message': f"Error processing conversational text: {str(e)}"}
+    
+    def stream_conversational_voice(self, voice_input: VoiceInput, conversation_id: str,
+                                    voice: str = None, model: str = None) -> Iterator[Dict[str, Any]]:
+        """Conversational voice as a stream: a 'transcript' event, then the events of stream_conversational_text"""
+        print(f"💬 Streaming conversational voice for conversation: {conversation_id}")
+        text, activity = self.voice_processor.transcribe(voice_input.audio_data, voice_input.format)
+        yield from self.stream_transcribed_conversation(text, activity, conversation_id, voice, model)
+    
+    def stream_transcribed_conversation(self, text: Optional[str], activity: Optional[SpeechActivity],
+                                        conversation_id: str, voice: str = None,
+                                        model: str = None) -> Iterator[Dict[str, Any]]:
+        """The events of stream_conversational_voice for an utterance that has been transcribed"""
+        try:
+            speech_activity = activity.to_dict() if activity else None
+            if not text:
+                yield {'type': 'error', 'success': False, 'message': self._no_transcript_reply(activity),
+                       'speech_activity': speech_activity}
+                return
+            yield {'type': 'transcript', 'text': text, 'speech_activity': speech_activity}
+            yield from self._stream_conversation(text, conversation_id, voice, model, 'voice')
+        except Exception as e:
+            print(f"❌ Conversational voice stream error: {e}")
+            yield {'type': 'error', 'success': False, 'message': f"Error processing conversational voice: {str(e)}"}
+    
+    def _stream_conversation(self, text: str, conversation_id: str, voice: Optional[str], model: Optional[str],
+                             message_type: str) -> Iterator[Dict[str, Any]]:
+        """Reply deltas and sentence audio for one user message.
+
+        Each completed sentence of the streamed reply goes to a TTS pipeline
+        straight away, so the first sentence is being spoken while the LLM is
+        still writing the rest; finished audio is interleaved with the text
+        deltas in sentence order. Month overviews skip the LLM, since their
+        reply is fixed.
+        """
+        self.conversation_manager.add_message(conversation_id, 'user', text, message_type)
+        calendar_context, date_range, _ = self._conversation_calendar_context(text)
+        queried_date, queried_view = self._queried_view(date_range)
+        yield {'type': 'context', 'queried_date': queried_date, 'queried_view': queried_view}
+        
+        if queried_view == 'month':
+            self.conversation_manager.add_message(conversation_id, 'assistant', MONTH_OVERVIEW_REPLY, 'text')
+            deltas = iter([MONTH_OVERVIEW_REPLY])
+        else:
+            deltas = self.conversation_manager.stream_response(conversation_id, text, calendar_context)
+        
+        pipeline = self.tts_processor.speech_pipeline(voice, model)
+        splitter = SentenceSplitter()
+        parts = []
+        audio_index = 0
+        try:
+            for delta in deltas:
+                parts.append(delta)
+                yield {'type': 'delta', 'text': delta}
+                for sentence in splitter.feed(delta):
+                    pipeline.add(sentence)
+                for audio in pipeline.ready():
+                    yield self._audio_event(audio, audio_index)
+                    audio_index += 1
+            for sentence in splitter.flush():
+                pipeline.add(sentence)
+            for audio in pipeline.drain():
+                yield self._audio_event(audio, audio_index)
+                audio_index += 1
+        finally:
+            pipeline.cancel()
+        
+        yield {
+            'type': 'done',
+            'success': True,
+            'message': ''.join(parts).strip(),
+            'audio_chunks': audio_index,
+            'queried_date': queried_date,
+            'queried_view': queried_view
+        }
+    
+    @staticmethod
+    def _audio_event(audio: bytes, index: int) -> Dict[str, Any]:
+        return {'type': 'audio', 'index': index, 'format': 'mp3', 'audio': base64.b64encode(audio).decode('ascii')}
+    
+    def prewarm_speech(self) -> int:
+        """Synthesize the canned replies (and TTS_CACHE_PREWARM_FILE's phrases) for TTS_CACHE_PREWARM_VOICES"""
+        voices = [tuple(pair.split(':', 1)) for pair in Config.TTS_CACHE_PREWARM_VOICES.split(',') if ':' in pair]
+        phrases = list(CANNED_REPLIES)
+        if Config.TTS_CACHE_PREWARM_FILE:
+            try:
+                with open(Config.TTS_CACHE_PREWARM_FILE, encoding='utf-8') as f:
+                    phrases += [line.strip() for line in f if line.strip()]
+            except OSError as e:
+                print(f"⚠️  Could not read TTS prewarm phrases: {e}")
+        return self.tts_processor.prewarm(phrases, [(voice.strip(), model.strip()) for voice, model in voices])
+    
     def get_conversation_history(self, conversation_id: str) -> list:
         """Get conversation history"""
         return self.conversation_manager.get_conversation_history(conversation_id)
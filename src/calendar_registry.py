@@ -0,0 +1,136 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Any
+
+def _normalize_name(name: str) -> str:
+    """'Shared Family' -> 'shared_family'"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+class CalendarRegistry:
+    """Cached calendar list with a TTL, refreshed in the background once stale.
+
+    Also resolves friendly names ("family", "work", "primary") to calendar IDs
+    using the summaries from the cached list.
+    """
+
+    # Names the NLP layer uses for the account's own calendar
+    PRIMARY_ALIASES = ('primary', 'main', 'work')
+
+    def __init__(self, loader: Callable[[], List[Dict[str, Any]]], ttl: float = 3600):
+        self._loader = loader
+        self.ttl = ttl
+        self._calendars: Optional[List[Dict[str, Any]]] = None
+        self._aliases: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loads': 0, 'background_refreshes': 0, 'errors': 0}
+
+    def get_calendars(self) -> List[Dict[str, Any]]:
+        """Calendar list, loading it on first use.
+
+        A stale list is still returned immediately while a background refresh
+        replaces it, so callers only ever wait on the very first load.
+        """
+        with self._lock:
+            calendars = self._calendars
+            stale = time.time() - self._loaded_at >= self.ttl
+        if calendars is None:
+            return self.refresh()
+        self.stats['hits'] += 1
+        if stale:
+            self._refresh_in_background()
+        return calendars
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a calendar list is cached (lookups won't block on Google)"""
+        return self._calendars is not None
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Reload the calendar list synchronously (loader errors propagate)"""
+        calendars = self._loader()
+        aliases = self._build_aliases(calendars)
+        with self._lock:
+            self._calendars = calendars
+            self._aliases = aliases
+            self._loaded_at = time.time()
+            self.stats['loads'] += 1
+        print(f"📅 Calendar registry loaded {len(calendars)} calendars")
+        return calendars
+
+    def invalidate(self):
+        """Drop the cached list so the next lookup reloads it"""
+        with self._lock:
+            self._calendars = None
+            self._aliases = {}
+            self._loaded_at = 0.0
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+                self.stats['background_refreshes'] += 1
+            except Exception as e:
+                print(f"❌ Calendar registry refresh failed: {e}")
+                self.stats['errors'] += 1
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='calendar-registry-refresh', daemon=True).start()
+
+    @classmethod
+    def _build_aliases(cls, calendars: List[Dict[str, Any]]) -> Dict[str, str]:
+        aliases = {}
+        for cal in calendars:
+            if cal.get('summary'):
+                name = _normalize_name(cal['summary'])
+                aliases[name] = cal['id']
+                # The NLP layer calls shared calendars e.g. 'shared_family'
+                aliases.setdefault(f'shared_{name}', cal['id'])
+        for cal in calendars:
+            if cal.get('primary'):
+                for alias in cls.PRIMARY_ALIASES:
+                    aliases[alias] = cal['id']
+        return aliases
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        """Friendly name -> calendar ID mapping built from the cached list"""
+        with self._lock:
+            return dict(self._aliases)
+
+    def resolve(self, name: str) -> str:
+        """Map a friendly calendar name to its ID, passing unknown names through unchanged.
+
+        Only exact names and aliases match (ignoring case and punctuation):
+        a near miss is left for Google to reject as not found rather than
+        guessed, so an event is never written to the wrong calendar.
+        """
+        try:
+            calendars = self.get_calendars()
+        except Exception as e:
+            print(f"❌ Could not load calendar list to resolve '{name}': {e}")
+            self.stats['errors'] += 1
+            return name
+
+        if any(cal['id'] == name for cal in calendars):
+            return name
+
+        aliases = self.aliases
+        key = _normalize_name(name)
+        return aliases.get(key, name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['calendars'] = len(self._calendars) if self._calendars is not None else 0
+            stats['age_seconds'] = round(time.time() - self._loaded_at, 1) if self._calendars is not None else None
+        return stats
@@ -0,0 +1,244 @@
+import hashlib
+import hmac
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
+from googleapiclient.errors import HttpError
+
+@dataclass
+class WatchChannel:
+    calendar_id: str
+    channel_id: str
+    resource_id: str
+    expiration: float  # epoch seconds
+
+class CalendarWatcher:
+    """events().watch push channels that keep the local event stores fresh.
+
+    Each watched calendar gets a channel pointing at the app's webhook; a
+    notification triggers a delta sync of just that calendar, so watched
+    stores don't need interval polling. Channels are renewed shortly before
+    they expire.
+
+    Channel tokens carry the instance and run that opened the channel, signed
+    with an HMAC, so notifications can be verified statelessly. Other workers
+    share the webhook, so a channel this watcher doesn't hold is left to
+    expire unless its token shows an earlier run of this instance opened it;
+    nothing else would stop that one. The default `instance_id` is per
+    process, so set a stable one per worker to clean up after restarts.
+    """
+
+    def __init__(self, calendar_manager, webhook_url: str, secret: str,
+                 ttl: int = 604800, renew_margin: int = 3600, instance_id: str = ''):
+        self.calendar_manager = calendar_manager
+        self.webhook_url = webhook_url
+        self._secret = secret.encode()
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.run_id = uuid.uuid4().hex
+        self.ttl = ttl
+        self.renew_margin = renew_margin
+        self.channels: Dict[str, WatchChannel] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._renewal_thread: Optional[threading.Thread] = None
+        self.stats = {
+            'channels_opened': 0, 'renewals': 0, 'notifications': 0,
+            'resyncs': 0, 'rejected': 0, 'orphans_stopped': 0, 'unknown_channels': 0, 'errors': 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Push notifications need a publicly reachable HTTPS webhook"""
+        return bool(self.webhook_url)
+
+    def _token(self, channel_id: str, instance_id: Optional[str] = None, run_id: Optional[str] = None) -> str:
+        """'<instance>.<run>.<HMAC of channel, instance and run>'; this run's by default"""
+        instance_id = self.instance_id if instance_id is None else instance_id
+        run_id = self.run_id if run_id is None else run_id
+        message = f"{channel_id}.{instance_id}.{run_id}".encode()
+        return f"{instance_id}.{run_id}.{hmac.new(self._secret, message, hashlib.sha256).hexdigest()}"
+
+    def _verify(self, channel_id: str, token: str) -> Optional[Tuple[str, str]]:
+        """(instance ID, run ID) from a genuine channel token, else None"""
+        parts = (token or '').rsplit('.', 2)
+        if not channel_id or len(parts) != 3:
+            return None
+        instance_id, run_id, _ = parts
+        if not hmac.compare_digest(token.encode(), self._token(channel_id, instance_id, run_id).encode()):
+            return None
+        return instance_id, run_id
+
+    def _record(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def watch(self, calendar_id: str) -> WatchChannel:
+        """Open a push channel for one calendar (errors propagate)"""
+        manager = self.calendar_manager
+        channel_id = uuid.uuid4().hex
+        result = manager.service.events().watch(
+            calendarId=calendar_id,
+            body={
+                'id': channel_id,
+                'type': 'web_hook',
+                'address': self.webhook_url,
+                'token': self._token(channel_id),
+                'params': {'ttl': str(self.ttl)},
+            }
+        ).execute(http=manager._http())
+        channel = WatchChannel(
+            calendar_id=calendar_id,
+            channel_id=channel_id,
+            resource_id=result['resourceId'],
+            expiration=int(result.get('expiration', (time.time() + self.ttl) * 1000)) / 1000
+        )
+        with self._lock:
+            self.channels[channel_id] = channel
+            self.stats['channels_opened'] += 1
+        manager.event_cache.store(calendar_id).watched = True
+        print(f"🔔 Watching calendar {calendar_id} (channel {channel_id[:8]}…)")
+        return channel
+
+    def _stop_channel(self, channel_id: str, resource_id: str):
+        manager = self.calendar_manager
+        manager.service.channels().stop(body={'id': channel_id, 'resourceId': resource_id}).execute(http=manager._http())
+
+    def unwatch(self, channel: WatchChannel):
+        """Stop a channel; the calendar falls back to interval polling unless another channel covers it"""
+        with self._lock:
+            self.channels.pop(channel.channel_id, None)
+            still_watched = any(c.calendar_id == channel.calendar_id for c in self.channels.values())
+        if not still_watched:
+            self.calendar_manager.event_cache.store(channel.calendar_id).watched = False
+        try:
+            self._stop_channel(channel.channel_id, channel.resource_id)
+        except HttpError as e:
+            print(f"❌ Could not stop channel for {channel.calendar_id}: {e}")
+            self._record('errors')
+
+    def watch_all(self) -> List[WatchChannel]:
+        """Watch every calendar in the registry; calendars that refuse push (e.g. holidays) keep polling"""
+        channels = []
+        for cal in self.calendar_manager.calendar_registry.get_calendars():
+            try:
+                channels.append(self.watch(cal['id']))
+            except HttpError as e:
+                print(f"[DEBUG] Push notifications unavailable for {cal['id']}: {e}")
+                self._record('errors')
+        return channels
+
+    def start(self):
+        """Open channels for all calendars and start the renewal thread"""
+        if not self.enabled or self._renewal_thread is not None:
+            return
+        self._stopping.clear()
+        self.watch_all()
+        self._renewal_thread = threading.Thread(target=self._renewal_loop, name='calendar-watch-renewal', daemon=True)
+        self._renewal_thread.start()
+
+    def stop(self):
+        """Stop the renewal thread and close every open channel"""
+        self._stopping.set()
+        if self._renewal_thread is not None:
+            self._renewal_thread.join(timeout=5)
+            self._renewal_thread = None
+        with self._lock:
+            channels = list(self.channels.values())
+        for channel in channels:
+            self.unwatch(channel)
+
+    def _seconds_until_renewal(self) -> float:
+        with self._lock:
+            deadlines = [c.expiration - self.renew_margin for c in self.channels.values()]
+        if not deadlines:
+            return 3600
+        # Floor keeps a failing renewal from spinning
+        return min(max(min(deadlines) - time.time(), 30), 3600)
+
+    def _renewal_loop(self):
+        while not self._stopping.wait(self._seconds_until_renewal()):
+            self.renew_expiring()
+
+    def renew_expiring(self) -> int:
+        """Replace channels close to expiry; the new one opens before the old one stops so nothing is missed"""
+        now = time.time()
+        with self._lock:
+            expiring = [c for c in self.channels.values() if c.expiration - now <= self.renew_margin]
+        for channel in expiring:
+            try:
+                self.watch(channel.calendar_id)
+            except HttpError as e:
+                print(f"❌ Could not renew watch on {channel.calendar_id}: {e}")
+                self._record('errors')
+                if channel.expiration <= now:
+                    self.unwatch(channel)  # expired: poll again until a renewal succeeds
+                continue
+            self.unwatch(channel)
+            self._record('renewals')
+        return len(expiring)
+
+    def handle_notification(self, channel_id: str, token: str, resource_id: str, resource_state: str) -> bool:
+        """Process one push notification; returns False if it fails verification.
+
+        Returns quickly: the re-sync runs on the manager's fetch pool so Google
+        gets its 200 straight away.
+        """
+        opened_by = self._verify(channel_id, token)
+        if opened_by is None:
+            self._record('rejected')
+            return False
+
+        with self._lock:
+            channel = self.channels.get(channel_id)
+            self.stats['notifications'] += 1
+        if resource_state == 'sync':
+            # Handshake sent when a channel opens; it can arrive before watch() has returned
+            return True
+        manager = self.calendar_manager
+        if channel is None:
+            if opened_by[0] == self.instance_id and opened_by[1] != self.run_id:
+                # Left over from an earlier run of this instance: stop it rather than sync twice
+                self._record('orphans_stopped')
+                manager._executor.submit(self._stop_orphan, channel_id, resource_id)
+            else:
+                # Another worker's, or one of ours not registered yet or just renewed: let it be
+                self._record('unknown_channels')
+            return True
+
+        manager.event_cache.invalidate(channel.calendar_id)
+        manager._executor.submit(self._resync, channel.calendar_id)
+        return True
+
+    def _resync(self, calendar_id: str):
+        """Delta-sync a notified calendar. If a sync was already running when the notification
+        arrived, the store stays stale after it (see CalendarEventStore.mark_synced), so this
+        waits for that sync and then fetches again; it only skips if a later sync covered it."""
+        store = self.calendar_manager.event_cache.store(calendar_id)
+        last_synced = store.last_synced
+        try:
+            self.calendar_manager._sync_calendar(calendar_id)
+            if store.last_synced != last_synced:
+                self._record('resyncs')
+        except Exception as e:
+            print(f"❌ Push-triggered sync of {calendar_id} failed: {e}")
+            self._record('errors')
+
+    def _stop_orphan(self, channel_id: str, resource_id: str):
+        try:
+            self._stop_channel(channel_id, resource_id)
+        except HttpError as e:
+            print(f"[DEBUG] Could not stop stale channel {channel_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['enabled'] = self.enabled
+            stats['channels'] = {
+                c.calendar_id: {'channel_id': c.channel_id, 'expires_in': round(c.expiration - time.time())}
+                for c in self.channels.values()
+            }
+        return stats
@@ -6,6 +6,13 @@ load_dotenv()
 class Config:
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")  # empty = api.openai.com
+    # Shared pooled client (src/openai_client.py)
+    OPENAI_HTTP_MAX_CONNECTIONS = int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", "20"))
+    OPENAI_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_HTTP_KEEPALIVE_EXPIRY", "60"))  # seconds
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))  # seconds
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))  # seconds
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
     
     # Google Calendar Configuration
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
@@ -17,10 +24,91 @@ class Config:
     TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
     TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
     
+    # Local intent parser tried before the LLM (commands below the threshold go to the LLM)
+    LOCAL_INTENT_ENABLED = os.getenv("LOCAL_INTENT_ENABLED", "true").lower() == "true"
+    LOCAL_INTENT_THRESHOLD = float(os.getenv("LOCAL_INTENT_THRESHOLD", "0.8"))
+    
+    # Cache of LLM intent results for repeated commands (relative dates re-resolved on a hit)
+    INTENT_CACHE_ENABLED = os.getenv("INTENT_CACHE_ENABLED", "true").lower() == "true"
+    INTENT_CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "512"))
+    INTENT_CACHE_TTL = int(os.getenv("INTENT_CACHE_TTL", "604800"))  # seconds
+    
+    # LLM extraction: function calling against a schema built from the models; replies must fit 8+ event commands
+    NLP_STRUCTURED_OUTPUT = os.getenv("NLP_STRUCTURED_OUTPUT", "true").lower() == "true"
+    NLP_MAX_TOKENS = int(os.getenv("NLP_MAX_TOKENS", "1000"))
+    
+    # Audio conversion for uploads Whisper can't take as they are (piped through ffmpeg, no temp files)
+    FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+    FFMPEG_TIMEOUT = float(os.getenv("FFMPEG_TIMEOUT", "30"))  # seconds
+    # Uploads to Whisper are normalized to mono Opus at this rate and bitrate (clips under MIN_BYTES are sent as is)
+    TRANSCRIBE_NORMALIZE = os.getenv("TRANSCRIBE_NORMALIZE", "true").lower() == "true"
+    TRANSCRIBE_SAMPLE_RATE = int(os.getenv("TRANSCRIBE_SAMPLE_RATE", "16000"))
+    TRANSCRIBE_BITRATE = os.getenv("TRANSCRIBE_BITRATE", "24k")
+    TRANSCRIBE_OPUS_COMPLEXITY = int(os.getenv("TRANSCRIBE_OPUS_COMPLEXITY", "2"))  # 0-10: encode speed vs size
+    TRANSCRIBE_NORMALIZE_MIN_BYTES = int(os.getenv("TRANSCRIBE_NORMALIZE_MIN_BYTES", "32768"))
+    # Voice activity detection: silence is trimmed before Whisper and clips without speech are never uploaded
+    VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+    VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "10"))  # speech is this far above the clip's noise floor
+    VAD_MIN_LEVEL_DBFS = float(os.getenv("VAD_MIN_LEVEL_DBFS", "-50"))  # anything quieter is silence
+    VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", "300"))  # kept before and after the speech
+    VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "150"))  # shorter bursts are taps and clicks
+    # Audio jobs (ffmpeg, voice activity detection) run at once; pure-Python ones in worker processes
+    AUDIO_POOL_WORKERS = int(os.getenv("AUDIO_POOL_WORKERS", str(os.cpu_count() or 2)))
+    AUDIO_POOL_PROCESSES = os.getenv("AUDIO_POOL_PROCESSES", "true").lower() == "true"
+    # Streamed voice (WebSocket audio frames, microphone): an utterance ends after this much silence following speech
+    VOICE_STREAM_END_SILENCE_MS = int(os.getenv("VOICE_STREAM_END_SILENCE_MS", "700"))
+    VOICE_STREAM_NO_SPEECH_SECONDS = float(os.getenv("VOICE_STREAM_NO_SPEECH_SECONDS", "8"))
+    VOICE_STREAM_MAX_SECONDS = float(os.getenv("VOICE_STREAM_MAX_SECONDS", "30"))
+    
+    # Sentence-pipelined TTS for streamed replies: sentences synthesized at once, process-wide
+    TTS_PIPELINE_WORKERS = int(os.getenv("TTS_PIPELINE_WORKERS", "3"))
+    
+    # Synthesized speech cache: in-memory LRU plus files in TTS_CACHE_DIR (empty = memory only), both size-bounded
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_MEMORY_MB = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+    TTS_CACHE_DISK_MB = int(os.getenv("TTS_CACHE_DISK_MB", "512"))
+    # Canned replies synthesized at startup for these voice:model pairs, plus one phrase per line of the file
+    TTS_CACHE_PREWARM_VOICES = os.getenv("TTS_CACHE_PREWARM_VOICES", "alloy:tts-1")
+    TTS_CACHE_PREWARM_FILE = os.getenv("TTS_CACHE_PREWARM_FILE", "")
+    
     # Application Configuration
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     CALENDAR_ID = os.getenv("CALENDAR_ID", "primary")
     
+    # Local event cache (kept current with Google sync tokens)
+    CALENDAR_CACHE_ENABLED = os.getenv("CALENDAR_CACHE_ENABLED", "true").lower() == "true"
+    CALENDAR_SYNC_INTERVAL = int(os.getenv("CALENDAR_SYNC_INTERVAL", "30"))  # seconds between delta syncs
+    
+    # Push notifications (events.watch); CALENDAR_WEBHOOK_URL is the public HTTPS URL of /webhook/calendar
+    CALENDAR_WEBHOOK_URL = os.getenv("CALENDAR_WEBHOOK_URL", "")
+    CALENDAR_WATCH_TTL = int(os.getenv("CALENDAR_WATCH_TTL", "604800"))  # requested channel lifetime, seconds
+    CALENDAR_WATCH_RENEW_MARGIN = int(os.getenv("CALENDAR_WATCH_RENEW_MARGIN", "3600"))  # renew this long before expiry
+    CALENDAR_WATCHED_SYNC_INTERVAL = int(os.getenv("CALENDAR_WATCHED_SYNC_INTERVAL", "900"))  # fallback polling
+    # Stable ID unique to this worker, so a restart stops the channels its previous run left open
+    CALENDAR_WATCH_INSTANCE_ID = os.getenv("CALENDAR_WATCH_INSTANCE_ID", "")
+    
+    # Cached calendar list (also used to resolve names like 'family' to IDs)
+    CALENDAR_LIST_TTL = int(os.getenv("CALENDAR_LIST_TTL", "3600"))  # seconds before a background refresh
+    
+    # Fan-out across calendars in get_events_all_calendars
+    CALENDAR_PARALLEL_FETCH = os.getenv("CALENDAR_PARALLEL_FETCH", "true").lower() == "true"
+    CALENDAR_FETCH_WORKERS = int(os.getenv("CALENDAR_FETCH_WORKERS", "8"))
+    
+    # Pooled keep-alive connections used by the async calendar client
+    CALENDAR_HTTP_MAX_CONNECTIONS = int(os.getenv("CALENDAR_HTTP_MAX_CONNECTIONS", "20"))
+    CALENDAR_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("CALENDAR_HTTP_KEEPALIVE_EXPIRY", "30"))  # seconds
+    CALENDAR_HTTP_TIMEOUT = float(os.getenv("CALENDAR_HTTP_TIMEOUT", "15"))  # seconds
+    
+    # Free/busy: hours of the day offered as free slots, and the default slot length
+    FREE_SLOT_DAY_START_HOUR = int(os.getenv("FREE_SLOT_DAY_START_HOUR", "8"))
+    FREE_SLOT_DAY_END_HOUR = int(os.getenv("FREE_SLOT_DAY_END_HOUR", "21"))
+    FREE_SLOT_DEFAULT_MINUTES = int(os.getenv("FREE_SLOT_DEFAULT_MINUTES", "60"))
+    
+    # Alternate Calendar API root, e.g. the offline fake server at http://127.0.0.1:8085/ (empty = Google)
+    GOOGLE_CALENDAR_API_ROOT = os.getenv("GOOGLE_CALENDAR_API_ROOT", "")
+    GOOGLE_CALENDAR_ANONYMOUS = os.getenv("GOOGLE_CALENDAR_ANONYMOUS", "false").lower() == "true"  # skip OAuth
+    
     # SCOPES for Google Calendar API
     SCOPES = ['https://www.googleapis.com/auth/calendar']
     
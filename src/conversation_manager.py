@@ -1,10 +1,13 @@
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any
 from dataclasses import dataclass, asdict
 from .config import Config
 import openai
-from openai import OpenAI
+from .openai_client import get_openai_client
+from .date_resolver import DateResolver
+
+ERROR_REPLY = "I'm sorry, I'm having trouble processing your request right now. Please try again."
 
 @dataclass
 class Message:
@@ -25,6 +28,7 @@ class Conversation:
 class ConversationManager:
     def __init__(self):
         self.conversations: Dict[str, Conversation] = {}
+        self.date_resolver = DateResolver()
         self.system_prompt = """You are a positive, helpful, friendly, and accommodating AI assistant that helps manage a family calendar through natural conversation. 
 
 Your capabilities include:
@@ -128,86 +132,89 @@ Current date and time context will be provided in each message."""
         
         return conversation.context.get(key)
     
-    def generate_response(self, conversation_id: str, user_message: str, calendar_context: Optional[Dict] = None) -> str:
-        """Generate a conversational response using OpenAI"""
-        try:
-            print(f"🔍 Generating response for conversation: {conversation_id}")
-            print(f"📝 User message: '{user_message}'")
-            print(f"📅 Calendar context: {calendar_context}")
-            
-            # Get conversation history
-            messages = self.get_conversation_history(conversation_id)
-            print(f"📚 Found {len(messages)} existing messages")
+    def _response_messages(self, conversation_id: str, user_message: str, calendar_context: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """History, the new user message, calendar context and the date/time context for one completion"""
+        # Get conversation history
+        messages = self.get_conversation_history(conversation_id)
+        print(f"📚 Found {len(messages)} existing messages")
+        
+        # Add current user message
+        messages.append({
+            'role': 'user',
+            'content': user_message
+        })
+        
+        # Add calendar context if available
+        if calendar_context:
+            # Convert datetime objects to strings for JSON serialization
+            serializable_context = {}
+            for key, value in calendar_context.items():
+                if key == 'query_date_range' and value:
+                    start_date, end_date = value
+                    serializable_context[key] = {
+                        'start_date': start_date.isoformat() if start_date else None,
+                        'end_date': end_date.isoformat() if end_date else None
+                    }
+                elif key == 'events':
+                    serializable_context[key] = value  # Already serializable
+                else:
+                    serializable_context[key] = value
             
-            # Add current user message
+            context_message = f"\n\nCalendar Context: {json.dumps(serializable_context, indent=2)}"
             messages.append({
-                'role': 'user',
-                'content': user_message
+                'role': 'system',
+                'content': context_message
             })
-            
-            # Add calendar context if available
-            if calendar_context:
-                # Convert datetime objects to strings for JSON serialization
-                serializable_context = {}
-                for key, value in calendar_context.items():
-                    if key == 'query_date_range' and value:
-                        start_date, end_date = value
-                        serializable_context[key] = {
-                            'start_date': start_date.isoformat() if start_date else None,
-                            'end_date': end_date.isoformat() if end_date else None
-                        }
-                    elif key == 'events':
-                        serializable_context[key] = value  # Already serializable
-                    else:
-                        serializable_context[key] = value
-                
-                context_message = f"\n\nCalendar Context: {json.dumps(serializable_context, indent=2)}"
-                messages.append({
-                    'role': 'system',
-                    'content': context_message
-                })
-                print(f"📅 Added calendar context")
-            
-            # Add current date/time context with explicit tomorrow/week/month calculation
-            from datetime import timedelta
-            current_time = datetime.now()
-            tomorrow = current_time + timedelta(days=1)
+            print(f"📅 Added calendar context")
+        
+        # Add current date/time context with explicit tomorrow/week/month calculation
+        current_time = self.date_resolver.now()
+        tomorrow = self.date_resolver.day_table(current_time).phrases['tomorrow'][0]
 
-            # Check for month context in calendar_context
-            month_context = None
-            if calendar_context and 'query_date_range' in calendar_context and calendar_context['query_date_range']:
-                qdr = calendar_context['query_date_range']
-                # If it's a month (range >= 27 days), set month_context
-                if isinstance(qdr, (list, tuple)) and len(qdr) == 2:
-                    start, end = qdr
-                    if hasattr(start, 'isoformat') and hasattr(end, 'isoformat') and (end - start).days >= 27:
-                        month_context = (start, end)
+        # Check for month context in calendar_context
+        month_context = None
+        if calendar_context and 'query_date_range' in calendar_context and calendar_context['query_date_range']:
+            qdr = calendar_context['query_date_range']
+            # If it's a month (range >= 27 days), set month_context
+            if isinstance(qdr, (list, tuple)) and len(qdr) == 2:
+                start, end = qdr
+                if hasattr(start, 'isoformat') and hasattr(end, 'isoformat') and (end - start).days >= 27:
+                    month_context = (start, end)
 
-            if month_context:
-                # Use month context for system message
-                start, end = month_context
-                time_context = f"""
+        if month_context:
+            # Use month context for system message
+            start, end = month_context
+            time_context = f"""
 Current month: {start.strftime('%B %d, %Y')} to {end.strftime('%B %d, %Y')}
 IMPORTANT: All queries refer to this month range.
 """
-            else:
-                time_context = f"""
+        else:
+            time_context = f"""
 Current date and time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}
 Today: {current_time.strftime('%A, %B %d, %Y')}
 Tomorrow: {tomorrow.strftime('%A, %B %d, %Y')}
 
 IMPORTANT: When the user asks about \"tomorrow\", they are referring to {tomorrow.strftime('%A, %B %d, %Y')}.
 """
-            messages.append({
-                'role': 'system',
-                'content': time_context
-            })
-            print(f"⏰ Added time context: Today={current_time.strftime('%A, %B %d, %Y')}, Tomorrow={tomorrow.strftime('%A, %B %d, %Y')}")
+        messages.append({
+            'role': 'system',
+            'content': time_context
+        })
+        print(f"⏰ Added time context: Today={current_time.strftime('%A, %B %d, %Y')}, Tomorrow={tomorrow.strftime('%A, %B %d, %Y')}")
+        return messages
+    
+    def generate_response(self, conversation_id: str, user_message: str, calendar_context: Optional[Dict] = None) -> str:
+        """Generate a conversational response using OpenAI"""
+        try:
+            print(f"🔍 Generating response for conversation: {conversation_id}")
+            print(f"📝 User message: '{user_message}'")
+            print(f"📅 Calendar context: {calendar_context}")
             
+            messages = self._response_messages(conversation_id, user_message, calendar_context)
             print(f"🤖 Calling OpenAI API with {len(messages)} messages...")
             
             # Call OpenAI API
-            client = OpenAI(api_key=Config.OPENAI_API_KEY)
+            client = get_openai_client()
             response = client.chat.completions.create(
                 model="gpt-4o",
                 messages=messages,
@@ -228,7 +235,44 @@ IMPORTANT: When the user asks about \"tomorrow\", they are referring to {tomorro
             import traceback
             print(f"📚 Full traceback:")
             traceback.print_exc()
-            return "I'm sorry, I'm having trouble processing your request right now. Please try again."
+            return ERROR_REPLY
+    
+    def stream_response(self, conversation_id: str, user_message: str, calendar_context: Optional[Dict] = None) -> Iterator[str]:
+        """Yield the response text as OpenAI produces it.
+
+        The complete reply is added to the conversation once the stream ends;
+        if the consumer stops early (client disconnected) the HTTP response is
+        closed so the pooled connection is released, and nothing is recorded.
+        """
+        parts: List[str] = []
+        try:
+            messages = self._response_messages(conversation_id, user_message, calendar_context)
+            print(f"🤖 Streaming OpenAI response with {len(messages)} messages...")
+            stream = get_openai_client().chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=500,
+                stream=True
+            )
+            try:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            finally:
+                stream.response.close()
+        except Exception as e:
+            print(f"❌ Error streaming conversational response: {e}")
+            if parts:
+                raise
+            yield ERROR_REPLY
+            return
+        
+        assistant_response = ''.join(parts).strip()
+        print(f"✅ OpenAI streamed response: '{assistant_response}'")
+        self.add_message(conversation_id, 'assistant', assistant_response, 'text')
     
     def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation"""
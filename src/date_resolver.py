@@ -0,0 +1,211 @@
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from dateutil import tz
+from dateutil.relativedelta import relativedelta
+from .keyword_matcher import trie_pattern
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:
+    ZoneInfo = None
+
+def _load_tz(name: str):
+    # zoneinfo's C implementation makes datetime.now(tz) ~20x cheaper than dateutil's tzfile
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            pass  # no system tz database (e.g. Windows without tzdata)
+    return tz.gettz(name)
+
+# Resolved once; every call site used to call tz.gettz per request
+CHICAGO_TZ = _load_tz('America/Chicago')
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october',
+          'november', 'december']
+MONTH_ABBREVIATIONS = {name[:3]: i for i, name in enumerate(MONTHS)}
+MONTH_ABBREVIATIONS['sept'] = 8
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+    'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+}
+# Where "tonight" starts
+EVENING_HOUR = 17
+
+DateSpan = Tuple[date, date]
+
+@dataclass(frozen=True)
+class DayTable:
+    """Every fixed relative phrase resolved for one day, built once per day"""
+    today: date
+    phrases: Dict[str, DateSpan]
+    weekdays: Dict[str, date]  # the upcoming one; today counts
+    next_weekdays: Dict[str, date]  # strictly after today
+
+@dataclass
+class DateMatch:
+    """A resolved date phrase and where it was found in the text"""
+    start: datetime
+    end: datetime
+    span: Tuple[int, int]
+
+def _week(day: date, weeks: int = 0) -> DateSpan:
+    monday = day - timedelta(days=day.weekday()) + timedelta(weeks=weeks)
+    return monday, monday + timedelta(days=6)
+
+def _month(day: date, months: int = 0) -> DateSpan:
+    first = day.replace(day=1) + relativedelta(months=months)
+    return first, first + relativedelta(months=1) - timedelta(days=1)
+
+def _weekend(day: date, weeks: int = 0) -> DateSpan:
+    # On Sunday "this weekend" is the one in progress
+    saturday = day + timedelta(days=5 - day.weekday() if day.weekday() != 6 else -1) + timedelta(weeks=weeks)
+    return saturday, saturday + timedelta(days=1)
+
+@lru_cache(maxsize=32)
+def build_day_table(today: date) -> DayTable:
+    """Relative phrases resolved against `today`; cached, so each day is computed once"""
+    single = lambda day: (day, day)
+    phrases: Dict[str, DateSpan] = {
+        'today': single(today),
+        'tomorrow': single(today + timedelta(days=1)),
+        'day after tomorrow': single(today + timedelta(days=2)),
+        'yesterday': single(today - timedelta(days=1)),
+        'day before yesterday': single(today - timedelta(days=2)),
+        'next week': _week(today, 1),
+        'week after next': _week(today, 2),
+        'the week after next': _week(today, 2),  # not "the week"
+        'this weekend': _weekend(today),
+        'next weekend': _weekend(today, 1),
+        'last weekend': _weekend(today, -1),
+        'next month': _month(today, 1),
+    }
+    for phrase in ('this week', 'the week', 'current week', 'my week', 'week'):
+        phrases[phrase] = _week(today)
+    for phrase in ('last week', 'previous week'):
+        phrases[phrase] = _week(today, -1)
+    for phrase in ('the weekend', 'weekend'):
+        phrases[phrase] = _weekend(today)
+    for phrase in ('this month', 'the month', 'current month', 'month'):
+        phrases[phrase] = _month(today)
+    for phrase in ('last month', 'previous month'):
+        phrases[phrase] = _month(today, -1)
+
+    weekdays, next_weekdays = {}, {}
+    for i, name in enumerate(WEEKDAYS):
+        days_ahead = (i - today.weekday()) % 7
+        weekdays[name] = today + timedelta(days=days_ahead)
+        next_weekdays[name] = today + timedelta(days=days_ahead or 7)
+        phrases[name] = phrases[f'this {name}'] = phrases[f'on {name}'] = phrases[f'coming {name}'] = single(weekdays[name])
+        phrases[f'next {name}'] = single(next_weekdays[name])
+        phrases[f'last {name}'] = single(today - timedelta(days=(today.weekday() - i) % 7 or 7))
+    return DayTable(today=today, phrases=phrases, weekdays=weekdays, next_weekdays=next_weekdays)
+
+def _ordinal_day(today: date, day_of_month: int, month: Optional[int] = None) -> Optional[DateSpan]:
+    """Next date (today counts) with that day of the month, in `month` if given"""
+    candidates = range(13) if month is None else [(month - today.month) % 12, (month - today.month) % 12 + 12]
+    for months_ahead in candidates:
+        first = today.replace(day=1) + relativedelta(months=months_ahead)
+        try:
+            day = first.replace(day=day_of_month)
+        except ValueError:
+            continue  # no 31st in this month
+        if day >= today:
+            return day, day
+    return None
+
+def _in_units(today: date, count: int, unit: str) -> DateSpan:
+    if unit.startswith('day'):
+        day = today + timedelta(days=count)
+        return day, day
+    if unit.startswith('week'):
+        return _week(today + timedelta(weeks=count))
+    return _month(today, count)
+
+_NUMBER = r'(\d+|' + '|'.join(NUMBER_WORDS) + ')'
+_MONTH = r'(' + '|'.join(MONTHS + sorted(MONTH_ABBREVIATIONS, key=len, reverse=True)) + r')\.?'
+_ORDINAL = r'(\d{1,2})(?:st|nd|rd|th)?'
+
+def _count(word: str) -> int:
+    return int(word) if word.isdigit() else NUMBER_WORDS[word]
+
+def _month_index(word: str) -> int:
+    return MONTHS.index(word) + 1 if word in MONTHS else MONTH_ABBREVIATIONS[word] + 1
+
+# Every parametrized phrase has a digit or a spelled-out count; skip them all otherwise
+_MAY_BE_PARAMETRIZED = re.compile(r'\d|\b' + _NUMBER + r' (?:days?|weeks?|months?)\b')
+# Parametrized phrases, tried before the fixed ones ("in two weeks" must not resolve as "week")
+PATTERNS: List[Tuple[re.Pattern, Callable[[re.Match, date], Optional[DateSpan]]]] = [
+    (re.compile(r'\bin ' + _NUMBER + r' (days?|weeks?|months?)\b'),
+     lambda m, today: _in_units(today, _count(m.group(1)), m.group(2))),
+    (re.compile(r'\b' + _NUMBER + r' (days?|weeks?|months?) from (?:now|today)\b'),
+     lambda m, today: _in_units(today, _count(m.group(1)), m.group(2))),
+    (re.compile(r'\b' + _MONTH + r' ' + _ORDINAL + r'\b'),
+     lambda m, today: _ordinal_day(today, int(m.group(2)), _month_index(m.group(1)))),
+    (re.compile(r'\b(?:the )?' + _ORDINAL + r' of ' + _MONTH + r'(?=\W|$)'),
+     lambda m, today: _ordinal_day(today, int(m.group(1)), _month_index(m.group(2)))),
+    (re.compile(r'\bthe (\d{1,2})(?:st|nd|rd|th)\b'),
+     lambda m, today: _ordinal_day(today, int(m.group(1)))),
+]
+# Fixed phrases; at the same position the longest wins ("next weekend" over "next week")
+FIXED_PHRASES = re.compile(
+    r"\b(" + trie_pattern(list(build_day_table(date(2000, 1, 3)).phrases) + ['tonight']) + r")(?:'?s)?\b"
+)
+
+class DateResolver:
+    """Resolves relative date phrases ("tomorrow", "next weekend", "in two weeks",
+    "the 21st") to Chicago-time day ranges, shared by the NLP layer, the agent,
+    the conversation manager and the local intent parser so they all agree.
+
+    Fixed phrases are looked up in a per-day table (built once a day), so a
+    lookup is a single regex search plus a dict access.
+    """
+
+    def __init__(self, tzinfo=CHICAGO_TZ):
+        self.tzinfo = tzinfo
+
+    def now(self) -> datetime:
+        return datetime.now(self.tzinfo)
+
+    def _today(self, now: Optional[datetime]) -> datetime:
+        if now is None:
+            return self.now()
+        return now.astimezone(self.tzinfo) if now.tzinfo else now.replace(tzinfo=self.tzinfo)
+
+    def day_table(self, now: Optional[datetime] = None) -> DayTable:
+        return build_day_table(self._today(now).date())
+
+    def _bounds(self, span: DateSpan) -> Tuple[datetime, datetime]:
+        return (datetime.combine(span[0], time.min, tzinfo=self.tzinfo),
+                datetime.combine(span[1], time.max, tzinfo=self.tzinfo))
+
+    def find(self, text: str, now: Optional[datetime] = None) -> Optional[DateMatch]:
+        """First date phrase in the text, resolved to a (start of day, end of day) range"""
+        text = text.lower()
+        current = self._today(now)
+        today = current.date()
+        if _MAY_BE_PARAMETRIZED.search(text):
+            for pattern, resolve in PATTERNS:
+                match = pattern.search(text)
+                if match:
+                    span = resolve(match, today)
+                    if span:
+                        return DateMatch(*self._bounds(span), span=match.span())
+        match = FIXED_PHRASES.search(text)
+        if match is None:
+            return None
+        phrase = ' '.join(match.group(1).split())  # "next  week"
+        if phrase == 'tonight':
+            start, end = self._bounds((today, today))
+            return DateMatch(start.replace(hour=EVENING_HOUR), end, span=match.span())
+        start, end = self._bounds(build_day_table(today).phrases[phrase])
+        return DateMatch(start, end, span=match.span())
+
+    def resolve(self, text: str, now: Optional[datetime] = None) -> Optional[Tuple[datetime, datetime]]:
+        """(start, end) for the first date phrase in the text, or None"""
+        match = self.find(text, now)
+        return (match.start, match.end) if match else None
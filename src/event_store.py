@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Dict, List, Optional, Any
+from .models import CalendarEvent
+
+class CalendarEventStore:
+    """Local copy of one calendar's events, kept current with Google sync tokens."""
+
+    def __init__(self, calendar_id: str):
+        self.calendar_id = calendar_id
+        self.events: Dict[str, CalendarEvent] = {}
+        self.sync_token: Optional[str] = None
+        self.last_synced: float = 0.0
+        self.stale = True
+        # Bumped by every invalidate(); a sync only clears `stale` if none arrived while it ran
+        self.generation = 0
+        self._generation_lock = threading.Lock()
+        # Set while an events.watch channel pushes changes for this calendar
+        self.watched = False
+        # Serializes syncs of this calendar so concurrent readers don't double-fetch
+        self.lock = threading.Lock()
+        self._sorted: Optional[List[CalendarEvent]] = None
+
+    @property
+    def is_seeded(self) -> bool:
+        """True once a full sync has completed and a sync token is held"""
+        return self.sync_token is not None
+
+    def reset(self):
+        """Drop all local state so the next sync is a full one"""
+        self.events = {}
+        self.sync_token = None
+        self.last_synced = 0.0
+        self.stale = True
+        self._sorted = None
+
+    def put(self, event: CalendarEvent):
+        """Insert or replace an event"""
+        self.events[event.id] = event
+        self._sorted = None
+
+    def remove(self, event_id: str):
+        """Remove an event if present (cancelled events arrive as deltas)"""
+        if self.events.pop(event_id, None) is not None:
+            self._sorted = None
+
+    def invalidate(self):
+        """Mark the store out of date (a write or a push notification); doesn't wait on a running sync"""
+        with self._generation_lock:
+            self.generation += 1
+            self.stale = True
+
+    def mark_synced(self, sync_token: Optional[str], generation: int):
+        """Record a completed sync and the token to use for the next delta.
+
+        `generation` is the one read before the sync started fetching; if the
+        store was invalidated since, the change may not be in what was
+        fetched, so the store stays stale and the next read syncs again.
+        """
+        self.sync_token = sync_token
+        self.last_synced = time.time()
+        with self._generation_lock:
+            if self.generation == generation:
+                self.stale = False
+
+    def sorted_events(self) -> List[CalendarEvent]:
+        """All events ordered by start time"""
+        if self._sorted is None:
+            self._sorted = sorted(self.events.values(), key=lambda e: e.start_time)
+        return self._sorted
+
+class EventCache:
+    """Per-calendar event stores plus the policy deciding when to re-sync them."""
+
+    def __init__(self, sync_interval: float = 30, watched_sync_interval: float = 900):
+        self.sync_interval = sync_interval
+        # Watched calendars are re-synced on push; polling is only a safety net
+        self.watched_sync_interval = watched_sync_interval
+        self._stores: Dict[str, CalendarEventStore] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'full_syncs': 0,
+            'delta_syncs': 0,
+            'expired_tokens': 0,
+            'events_changed': 0,
+        }
+
+    def store(self, calendar_id: str) -> CalendarEventStore:
+        """Get (or create) the store for a calendar"""
+        with self._lock:
+            store = self._stores.get(calendar_id)
+            if store is None:
+                store = CalendarEventStore(calendar_id)
+                self._stores[calendar_id] = store
+            return store
+
+    def needs_sync(self, store: CalendarEventStore) -> bool:
+        """Whether a store must talk to Google before answering a read"""
+        if store.stale or not store.is_seeded:
+            return True
+        interval = self.watched_sync_interval if store.watched else self.sync_interval
+        return time.time() - store.last_synced >= interval
+
+    def invalidate(self, calendar_id: Optional[str] = None):
+        """Force a delta sync on next read for one calendar, or all of them"""
+        with self._lock:
+            stores = [self._stores[calendar_id]] if calendar_id in self._stores else []
+            if calendar_id is None:
+                stores = list(self._stores.values())
+        for store in stores:
+            store.invalidate()
+
+    def record(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus a per-calendar summary of what is held locally"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['calendars'] = {
+                cal_id: {
+                    'events': len(store.events),
+                    'seeded': store.is_seeded,
+                    'watched': store.watched,
+                    'last_synced': store.last_synced,
+                }
+                for cal_id, store in self._stores.items()
+            }
+        return stats
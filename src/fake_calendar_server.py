@@ -0,0 +1,725 @@
+"""
+Offline stand-in for the Google Calendar v3 REST API.
+
+Serves what GoogleCalendarManager and AsyncGoogleCalendarManager use: events
+list/get/insert/update/patch/delete/watch, channels.stop, calendarList,
+freeBusy and multipart batch requests, with push notifications, sync tokens,
+pagination, fields= partial responses and configurable latency and error
+injection. Point the managers at it with
+
+    GOOGLE_CALENDAR_API_ROOT=http://127.0.0.1:8085/
+    GOOGLE_CALENDAR_ANONYMOUS=true
+
+and run it standalone with `python -m src.fake_calendar_server --seed-events 500`.
+Recurring events are not expanded; every event is a single instance.
+"""
+
+import argparse
+import email
+import json
+import random
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from dateutil import parser, tz
+
+HTTP_REASONS = {
+    200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+    410: 'Gone', 429: 'Too Many Requests', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+EVENTS_PAGE_DEFAULT, EVENTS_PAGE_MAX = 250, 2500
+CALENDAR_LIST_PAGE_DEFAULT, CALENDAR_LIST_PAGE_MAX = 100, 250
+
+def parse_field_mask(fields: str) -> dict:
+    """Parse a fields= mask like 'items(id,start(date)),nextPageToken' into a nested dict"""
+    tree, stack, name = {}, [], ''
+    current = tree
+    for ch in fields:
+        if ch == '(':
+            current[name.strip()] = {}
+            stack.append(current)
+            current = current[name.strip()]
+            name = ''
+        elif ch in ',)':
+            if name.strip():
+                current[name.strip()] = None
+            name = ''
+            if ch == ')':
+                current = stack.pop()
+        else:
+            name += ch
+    if name.strip():
+        current[name.strip()] = None
+    return tree
+
+def apply_field_mask(resource, tree):
+    """Keep only the fields named in a parsed mask (what Google does for fields=)"""
+    if tree is None:
+        return resource
+    if isinstance(resource, list):
+        return [apply_field_mask(item, tree) for item in resource]
+    if isinstance(resource, dict):
+        return {key: apply_field_mask(value, tree[key]) for key, value in resource.items() if key in tree}
+    return resource
+
+def synthetic_event(i: int, first_day: datetime = datetime(2025, 7, 1), days: int = 28) -> dict:
+    """A full event resource shaped like Google's (attendees, conferencing, links, etags)"""
+    start = (first_day + timedelta(days=i % days)).replace(hour=8 + (i * 7) % 12, minute=0, second=0, microsecond=0)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=tz.gettz('America/Chicago'))
+    end = start + timedelta(minutes=90)
+    return {
+        "kind": "calendar#event",
+        "etag": f"\"33{i:08d}000000\"",
+        "id": f"evt{i:06d}abcdefghijklmnop",
+        "status": "confirmed",
+        "htmlLink": f"https://www.google.com/calendar/event?eid=ZXZ0{i:06d}YWJjZGVmZ2hpamtsbW5vcA",
+        "created": "2025-06-01T12:00:00.000Z",
+        "updated": "2025-06-02T08:30:00.000Z",
+        "summary": f"Soccer practice #{i}",
+        "description": "Bring water bottle and shin guards. Carpool with the Garcias.",
+        "location": "Riverside Park Field 3, 1200 River Rd, Chicago, IL",
+        "creator": {"email": "parent@example.com", "self": True},
+        "organizer": {"email": "family@group.calendar.google.com", "displayName": "Family", "self": True},
+        "start": {"dateTime": start.isoformat(), "timeZone": "America/Chicago"},
+        "end": {"dateTime": end.isoformat(), "timeZone": "America/Chicago"},
+        "iCalUID": f"evt{i:06d}abcdefghijklmnop@google.com",
+        "sequence": 0,
+        "attendees": [
+            {"email": f"member{n}@example.com", "displayName": f"Member {n}", "responseStatus": "accepted"}
+            for n in range(4)
+        ],
+        "hangoutLink": "https://meet.google.com/abc-defg-hij",
+        "conferenceData": {
+            "entryPoints": [
+                {"entryPointType": "video", "uri": "https://meet.google.com/abc-defg-hij", "label": "meet.google.com/abc-defg-hij"},
+                {"entryPointType": "phone", "uri": "tel:+1-555-010-0000", "label": "+1 555-010-0000", "pin": "123456789"},
+            ],
+            "conferenceSolution": {"key": {"type": "hangoutsMeet"}, "name": "Google Meet", "iconUri": "https://fonts.gstatic.com/s/i/productlogos/meet_2020q4/v6/web-512dp/logo_meet_2020q4_color_2x_web_512dp.png"},
+            "conferenceId": "abc-defg-hij",
+        },
+        "reminders": {"useDefault": False, "overrides": [{"method": "email", "minutes": 1440}, {"method": "popup", "minutes": 10}]},
+        "eventType": "default",
+    }
+
+def _rfc3339(dt: datetime) -> str:
+    return dt.astimezone(tz.UTC).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+def _parse_time(value: str) -> datetime:
+    """RFC 3339 timestamp (naive values are taken as UTC)"""
+    parsed = parser.isoparse(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz.UTC)
+
+def _normalize_time(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the given timeZone to naive dateTimes, as Google does"""
+    if 'dateTime' not in value:
+        return dict(value)
+    dt = parser.isoparse(value['dateTime'])
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz.gettz(value.get('timeZone') or 'UTC'))
+    return {**value, 'dateTime': dt.isoformat()}
+
+def _time_bound(value: Dict[str, Any]) -> datetime:
+    if 'dateTime' in value:
+        return _parse_time(value['dateTime'])
+    return _parse_time(value['date'])  # all-day events start at midnight UTC here
+
+class FakeCalendarError(Exception):
+    """An API error response (status plus Google's error reason)"""
+
+    def __init__(self, status: int, message: str, reason: str = 'invalid'):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'error': {
+            'code': self.status,
+            'message': str(self),
+            'errors': [{'domain': 'global', 'reason': self.reason, 'message': str(self)}],
+        }}
+
+class FakeCalendarBackend:
+    """In-memory calendars and events shared by all request threads.
+
+    Every write bumps a change sequence number; sync tokens carry the number
+    they were issued at, so a delta sync returns exactly the events changed
+    since. Deleted events are kept as cancelled tombstones for that purpose.
+    """
+
+    def __init__(self, primary_id: str = 'me@example.com', primary_summary: str = 'Me'):
+        self.lock = threading.Lock()
+        self.calendars: Dict[str, Dict[str, Any]] = {}
+        self.events: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.primary_id = primary_id
+        self.seq = 0
+        self.sync_epoch = 0
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        # Called with (calendar_id, channels) after each change, outside the lock
+        self.on_change: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None
+        self.add_calendar(primary_id, primary_summary, primary=True)
+
+    def add_calendar(self, calendar_id: str, summary: str, primary: bool = False,
+                     description: Optional[str] = None, time_zone: str = 'America/Chicago') -> Dict[str, Any]:
+        calendar = {
+            'kind': 'calendar#calendarListEntry',
+            'etag': f'"{uuid.uuid4().hex[:16]}"',
+            'id': calendar_id,
+            'summary': summary,
+            'timeZone': time_zone,
+            'accessRole': 'owner',
+            'backgroundColor': '#9fe1e7',
+            'foregroundColor': '#000000',
+        }
+        if description:
+            calendar['description'] = description
+        if primary:
+            calendar['primary'] = True
+        with self.lock:
+            self.calendars[calendar_id] = calendar
+            self.events.setdefault(calendar_id, {})
+        return calendar
+
+    def add_event(self, calendar_id: str, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a complete event resource as-is (used for seeding)"""
+        calendar_id = self._calendar_id(calendar_id)
+        with self.lock:
+            return self._store(calendar_id, dict(resource))
+
+    def expire_sync_tokens(self):
+        """Invalidate every sync token issued so far; their next use gets 410 Gone"""
+        with self.lock:
+            self.sync_epoch += 1
+
+    def _calendar_id(self, calendar_id: str) -> str:
+        if calendar_id == 'primary':
+            return self.primary_id
+        if calendar_id not in self.calendars:
+            raise FakeCalendarError(404, 'Not Found', 'notFound')
+        return calendar_id
+
+    def _store(self, calendar_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a new version of an event (caller holds the lock)"""
+        self.seq += 1
+        event['etag'] = f'"{self.seq:016d}"'
+        event['_seq'] = self.seq
+        event['_start'] = _time_bound(event['start'])
+        event['_end'] = _time_bound(event['end'])
+        self.events[calendar_id][event['id']] = event
+        return event
+
+    @staticmethod
+    def _public(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in event.items() if not key.startswith('_')}
+
+    def _sync_token(self, seq: int) -> str:
+        return f"fake-sync-{self.sync_epoch}-{seq}"
+
+    def _parse_sync_token(self, token: str) -> int:
+        match = re.fullmatch(r'fake-sync-(\d+)-(\d+)', token)
+        if not match or int(match.group(1)) != self.sync_epoch:
+            raise FakeCalendarError(410, 'Sync token is no longer valid, a full sync is required.', 'fullSyncRequired')
+        return int(match.group(2))
+
+    @staticmethod
+    def _page(items: List[Any], params: Dict[str, str], default_size: int, max_size: int,
+              snapshot: int) -> Tuple[List[Any], Optional[str], int]:
+        """Slice one page; page tokens carry the offset and the first page's change sequence"""
+        size = min(int(params.get('maxResults') or default_size), max_size)
+        offset = 0
+        if params.get('pageToken'):
+            match = re.fullmatch(r'(\d+)\.(\d+)', params['pageToken'])
+            if not match:
+                raise FakeCalendarError(400, 'Invalid page token', 'invalid')
+            offset, snapshot = int(match.group(1)), int(match.group(2))
+        page = items[offset:offset + size]
+        next_token = f"{offset + size}.{snapshot}" if offset + size < len(items) else None
+        return page, next_token, snapshot
+
+    def list_events(self, calendar_id: str, params: Dict[str, str]) -> Dict[str, Any]:
+        with self.lock:
+            calendar_id = self._calendar_id(calendar_id)
+            events = list(self.events[calendar_id].values())
+            snapshot = self.seq
+            since = self._parse_sync_token(params['syncToken']) if params.get('syncToken') else None
+
+        if since is not None:
+            # Delta: every version written since the token, tombstones included
+            items = sorted((e for e in events if e['_seq'] > since), key=lambda e: e['_seq'])
+        else:
+            show_deleted = params.get('showDeleted') == 'true'
+            items = [e for e in events if show_deleted or e['status'] != 'cancelled']
+            if params.get('timeMin'):
+                time_min = _parse_time(params['timeMin'])
+                items = [e for e in items if e['_end'] > time_min]
+            if params.get('timeMax'):
+                time_max = _parse_time(params['timeMax'])
+                items = [e for e in items if e['_start'] < time_max]
+            if params.get('q'):
+                terms = params['q'].lower().split()
+                items = [e for e in items if all(
+                    term in ' '.join(str(e.get(key) or '') for key in ('summary', 'description', 'location')).lower()
+                    for term in terms
+                )]
+            if params.get('orderBy') == 'startTime':
+                items.sort(key=lambda e: e['_start'])
+            else:
+                items.sort(key=lambda e: e['_seq'])
+
+        page, next_token, snapshot = self._page(items, params, EVENTS_PAGE_DEFAULT, EVENTS_PAGE_MAX, snapshot)
+        calendar = self.calendars[calendar_id]
+        result = {
+            'kind': 'calendar#events',
+            'etag': f'"{snapshot:016d}"',
+            'summary': calendar['summary'],
+            'updated': _rfc3339(datetime.now(tz.UTC)),
+            'timeZone': calendar['timeZone'],
+            'accessRole': 'owner',
+            'items': [self._public(e) for e in page],
+        }
+        if next_token:
+            result['nextPageToken'] = next_token
+        else:
+            # The first page's sequence: changes made while paging are replayed by the next delta
+            result['nextSyncToken'] = self._sync_token(snapshot)
+        return result
+
+    def get_event(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
+        with self.lock:
+            calendar_id = self._calendar_id(calendar_id)
+            event = self.events[calendar_id].get(event_id)
+        if event is None:
+            raise FakeCalendarError(404, 'Not Found', 'notFound')
+        return self._public(event)
+
+    @staticmethod
+    def _validate_times(body: Dict[str, Any]):
+        for key in ('start', 'end'):
+            if not isinstance(body.get(key), dict) or not ({'date', 'dateTime'} & body[key].keys()):
+                raise FakeCalendarError(400, f'Missing {key} time.', 'required')
+
+    def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._validate_times(body)
+        now = _rfc3339(datetime.now(tz.UTC))
+        event_id = uuid.uuid4().hex
+        with self.lock:
+            calendar_id = self._calendar_id(calendar_id)
+            event = {
+                'kind': 'calendar#event',
+                'id': event_id,
+                'status': 'confirmed',
+                'htmlLink': f"https://www.google.com/calendar/event?eid={event_id}",
+                'created': now,
+                'updated': now,
+                'creator': {'email': self.primary_id, 'self': True},
+                'organizer': {'email': calendar_id, 'self': True},
+                'iCalUID': f"{event_id}@google.com",
+                'sequence': 0,
+                'reminders': {'useDefault': True},
+                'eventType': 'default',
+                **body,
+                'start': _normalize_time(body['start']),
+                'end': _normalize_time(body['end']),
+            }
+            event['id'] = event_id
+            stored = self._public(self._store(calendar_id, event))
+        self._changed(calendar_id)
+        return stored
+
+    def update_event(self, calendar_id: str, event_id: str, body: Dict[str, Any], patch: bool = False) -> Dict[str, Any]:
+        with self.lock:
+            calendar_id = self._calendar_id(calendar_id)
+            current = self.events[calendar_id].get(event_id)
+            if current is None:
+                raise FakeCalendarError(404, 'Not Found', 'notFound')
+            keep = {key: current[key] for key in ('kind', 'id', 'htmlLink', 'created', 'creator', 'organizer', 'iCalUID', 'eventType')}
+            event = {**current, **body} if patch else {'status': 'confirmed', **body}
+            self._validate_times(event)
+            event.update(keep)
+            event['start'] = _normalize_time(event['start'])
+            event['end'] = _normalize_time(event['end'])
+            event['sequence'] = current.get('sequence', 0) + 1
+            event['updated'] = _rfc3339(datetime.now(tz.UTC))
+            stored = self._public(self._store(calendar_id, event))
+        self._changed(calendar_id)
+        return stored
+
+    def delete_event(self, calendar_id: str, event_id: str):
+        with self.lock:
+            calendar_id = self._calendar_id(calendar_id)
+            current = self.events[calendar_id].get(event_id)
+            if current is None:
+                raise FakeCalendarError(404, 'Not Found', 'notFound')
+            if current['status'] == 'cancelled':
+                raise FakeCalendarError(410, 'Resource has been deleted', 'deleted')
+            tombstone = {key: value for key, value in current.items() if not key.startswith('_')}
+            tombstone['status'] = 'cancelled'
+            tombstone['updated'] = _rfc3339(datetime.now(tz.UTC))
+            self._store(calendar_id, tombstone)
+        self._changed(calendar_id)
+
+    def _live_channels(self, calendar_id: str) -> List[Dict[str, Any]]:
+        now = time.time() * 1000
+        with self.lock:
+            return [c for c in self.channels.values() if c['calendarId'] == calendar_id and int(c['expiration']) > now]
+
+    def _changed(self, calendar_id: str):
+        if self.on_change:
+            channels = self._live_channels(calendar_id)
+            if channels:
+                self.on_change(calendar_id, channels)
+
+    def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Open a push channel; only web_hook channels with an address are accepted"""
+        if body.get('type') not in ('web_hook', 'webhook') or not body.get('address') or not body.get('id'):
+            raise FakeCalendarError(400, 'Channel id, type web_hook and address are required.', 'required')
+        ttl = int((body.get('params') or {}).get('ttl', 604800))
+        with self.lock:
+            calendar_id = self._calendar_id(calendar_id)
+            if body['id'] in self.channels:
+                raise FakeCalendarError(400, f"Channel id {body['id']} not unique", 'channelIdNotUnique')
+            channel = {
+                'kind': 'api#channel',
+                'id': body['id'],
+                'resourceId': uuid.uuid5(uuid.NAMESPACE_URL, calendar_id).hex,
+                'resourceUri': f"https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events?alt=json",
+                'expiration': str(int((time.time() + ttl) * 1000)),
+                'calendarId': calendar_id,
+                'address': body['address'],
+                'token': body.get('token'),
+                'messageNumber': 0,
+            }
+            self.channels[body['id']] = channel
+        if self.on_change:
+            self.on_change(calendar_id, [dict(channel, state='sync')])
+        return {key: channel[key] for key in ('kind', 'id', 'resourceId', 'resourceUri', 'expiration', 'token') if channel[key]}
+
+    def stop_channel(self, body: Dict[str, Any]):
+        with self.lock:
+            channel = self.channels.get(body.get('id'))
+            if channel is None or channel['resourceId'] != body.get('resourceId'):
+                raise FakeCalendarError(404, f"Channel '{body.get('id')}' not found for project", 'notFound')
+            del self.channels[body['id']]
+
+    def list_calendars(self, params: Dict[str, str]) -> Dict[str, Any]:
+        with self.lock:
+            calendars = list(self.calendars.values())
+            snapshot = self.seq
+        page, next_token, _ = self._page(calendars, params, CALENDAR_LIST_PAGE_DEFAULT, CALENDAR_LIST_PAGE_MAX, snapshot)
+        result = {'kind': 'calendar#calendarList', 'etag': f'"{snapshot:016d}"', 'items': page}
+        if next_token:
+            result['nextPageToken'] = next_token
+        else:
+            result['nextSyncToken'] = self._sync_token(snapshot)
+        return result
+
+    def free_busy(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if not body.get('timeMin') or not body.get('timeMax'):
+            raise FakeCalendarError(400, 'Missing timeMin or timeMax.', 'required')
+        time_min, time_max = _parse_time(body['timeMin']), _parse_time(body['timeMax'])
+        calendars = {}
+        for item in body.get('items', []):
+            requested = item.get('id', '')
+            try:
+                with self.lock:
+                    events = list(self.events[self._calendar_id(requested)].values())
+            except FakeCalendarError:
+                calendars[requested] = {'errors': [{'domain': 'global', 'reason': 'notFound'}], 'busy': []}
+                continue
+            intervals = sorted(
+                (max(e['_start'], time_min), min(e['_end'], time_max)) for e in events
+                if e['status'] != 'cancelled' and e.get('transparency') != 'transparent'
+                and e['_end'] > time_min and e['_start'] < time_max
+            )
+            merged: List[List[datetime]] = []
+            for start, end in intervals:
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            calendars[requested] = {'busy': [{'start': _rfc3339(s), 'end': _rfc3339(e)} for s, e in merged]}
+        return {'kind': 'calendar#freeBusy', 'timeMin': body['timeMin'], 'timeMax': body['timeMax'], 'calendars': calendars}
+
+class FakeCalendarServer:
+    """HTTP front end for FakeCalendarBackend, run on a background thread.
+
+        with FakeCalendarServer(latency=0.02) as server:
+            server.seed(calendars=3, events_per_calendar=200)
+            os.environ['GOOGLE_CALENDAR_API_ROOT'] = server.root_url
+
+    latency (+ up to jitter) seconds is added to every HTTP request;
+    error_rate is the chance that a request (or batch part) fails with 503,
+    and fail_next() queues specific failures. All randomness is seeded.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0, backend: Optional[FakeCalendarBackend] = None):
+        self.backend = backend or FakeCalendarBackend()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fail_queue: List[int] = []
+        self.stats = {
+            'requests': 0, 'batch_requests': 0, 'batch_parts': 0, 'injected_errors': 0,
+            'bytes_sent': 0, 'notifications_sent': 0, 'notification_failures': 0,
+        }
+        self.backend.on_change = self._push_notifications
+        self._httpd = ThreadingHTTPServer((host, port), _FakeCalendarHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def root_url(self) -> str:
+        """Value for GOOGLE_CALENDAR_API_ROOT"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> 'FakeCalendarServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-calendar-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeCalendarServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def seed(self, calendars: int = 3, events_per_calendar: int = 200, first_day: Optional[datetime] = None,
+             days: int = 28) -> List[str]:
+        """Add calendars (after the primary one) filled with synthetic events; returns all calendar IDs"""
+        if first_day is None:
+            first_day = datetime.now(tz.gettz('America/Chicago')).replace(hour=0, minute=0, second=0, microsecond=0)
+        names = ['Family', 'Soccer', 'School', 'Holidays', 'Chores', 'Birthdays']
+        calendar_ids = [self.backend.primary_id]
+        for n in range(1, calendars):
+            name = names[(n - 1) % len(names)] + ('' if n <= len(names) else f" {n}")
+            calendar_id = f"{name.lower().replace(' ', '')}{n}@group.calendar.google.com"
+            self.backend.add_calendar(calendar_id, name)
+            calendar_ids.append(calendar_id)
+        for calendar_id in calendar_ids:
+            for i in range(events_per_calendar):
+                event = synthetic_event(i, first_day, days)
+                event['id'] = f"{event['id']}{abs(hash(calendar_id)) % 10**6:06d}"
+                self.backend.add_event(calendar_id, event)
+        return calendar_ids
+
+    def _push_notifications(self, calendar_id: str, channels: List[Dict[str, Any]]):
+        """POST a change notification to each channel's webhook, off the request thread like Google"""
+        for channel in channels:
+            with self.backend.lock:
+                live = self.backend.channels.get(channel['id'])
+                if live is not None:
+                    live['messageNumber'] += 1
+                    channel = dict(channel, messageNumber=live['messageNumber'])
+            headers = {
+                'X-Goog-Channel-ID': channel['id'],
+                'X-Goog-Channel-Expiration': channel['expiration'],
+                'X-Goog-Resource-ID': channel['resourceId'],
+                'X-Goog-Resource-URI': channel['resourceUri'],
+                'X-Goog-Resource-State': channel.get('state', 'exists'),
+                'X-Goog-Message-Number': str(channel['messageNumber']),
+            }
+            if channel.get('token'):
+                headers['X-Goog-Channel-Token'] = channel['token']
+            threading.Thread(target=self._deliver, args=(channel['address'], headers), daemon=True).start()
+
+    def _deliver(self, address: str, headers: Dict[str, str]):
+        request = urllib.request.Request(address, data=b'', headers=headers, method='POST')
+        try:
+            urllib.request.urlopen(request, timeout=10).close()
+            stat = 'notifications_sent'
+        except Exception:
+            stat = 'notification_failures'
+        with self._lock:
+            self.stats[stat] += 1
+
+    def fail_next(self, status: int = 503, count: int = 1):
+        """Fail the next `count` requests with the given HTTP status"""
+        with self._lock:
+            self._fail_queue.extend([status] * count)
+
+    def _injected_error(self) -> Optional[FakeCalendarError]:
+        with self._lock:
+            if self._fail_queue:
+                status = self._fail_queue.pop(0)
+            elif self.error_rate and self._random.random() < self.error_rate:
+                status = 503
+            else:
+                return None
+            self.stats['injected_errors'] += 1
+        reason = 'rateLimitExceeded' if status in (403, 429) else 'backendError'
+        return FakeCalendarError(status, 'Injected failure', reason)
+
+    def _delay(self):
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+    def dispatch(self, method: str, path: str, params: Dict[str, str], body: bytes) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Route one API call to the backend; returns (status, JSON body or None)"""
+        try:
+            error = self._injected_error()
+            if error:
+                raise error
+            data = json.loads(body) if body else {}
+            segments = [unquote(segment) for segment in path.strip('/').split('/')]
+            if segments[:2] != ['calendar', 'v3']:
+                raise FakeCalendarError(404, 'Not Found', 'notFound')
+            route = segments[2:]
+            backend = self.backend
+
+            if route == ['users', 'me', 'calendarList'] and method == 'GET':
+                result = backend.list_calendars(params)
+            elif route == ['freeBusy'] and method == 'POST':
+                result = backend.free_busy(data)
+            elif route == ['channels', 'stop'] and method == 'POST':
+                backend.stop_channel(data)
+                return 204, None
+            elif len(route) == 4 and route[0] == 'calendars' and route[2:] == ['events', 'watch'] and method == 'POST':
+                result = backend.watch_events(route[1], data)
+            elif len(route) == 3 and route[0] == 'calendars' and route[2] == 'events':
+                if method == 'GET':
+                    result = backend.list_events(route[1], params)
+                elif method == 'POST':
+                    result = backend.insert_event(route[1], data)
+                else:
+                    raise FakeCalendarError(400, 'Unsupported method', 'badRequest')
+            elif len(route) == 4 and route[0] == 'calendars' and route[2] == 'events':
+                if method == 'GET':
+                    result = backend.get_event(route[1], route[3])
+                elif method in ('PUT', 'PATCH'):
+                    result = backend.update_event(route[1], route[3], data, patch=method == 'PATCH')
+                elif method == 'DELETE':
+                    backend.delete_event(route[1], route[3])
+                    return 204, None
+                else:
+                    raise FakeCalendarError(400, 'Unsupported method', 'badRequest')
+            else:
+                raise FakeCalendarError(404, 'Not Found', 'notFound')
+
+            if params.get('fields'):
+                result = apply_field_mask(result, parse_field_mask(params['fields']))
+            return 200, result
+        except FakeCalendarError as error:
+            return error.status, error.to_json()
+        except ValueError as error:
+            return 400, FakeCalendarError(400, f'Parse Error: {error}', 'parseError').to_json()
+
+    def dispatch_batch(self, content_type: str, body: bytes) -> Tuple[str, bytes]:
+        """Run each application/http part of a multipart/mixed batch; returns (content type, body)"""
+        message = email.message_from_bytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        boundary = f"batch_{uuid.uuid4().hex}"
+        out = []
+        for part in message.get_payload():
+            inner = part.get_payload()
+            if isinstance(inner, bytes):
+                inner = inner.decode()
+            request_line, rest = inner.split('\n', 1)
+            method, target = request_line.strip().split(' ')[:2]
+            part_body = re.split(r'\r?\n\r?\n', rest, maxsplit=1)[1] if re.search(r'\r?\n\r?\n', rest) else ''
+            url = urlsplit(target)
+            params = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+            status, result = self.dispatch(method, url.path, params, part_body.strip().encode())
+            with self._lock:
+                self.stats['batch_parts'] += 1
+
+            content_id = (part.get('Content-ID') or '<>')[1:-1]
+            payload = json.dumps(result) if result is not None else ''
+            out.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Error')}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n"
+                f"Content-Length: {len(payload.encode())}\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        out.append(f"--{boundary}--\r\n")
+        return f"multipart/mixed; boundary={boundary}", ''.join(out).encode()
+
+class _FakeCalendarHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    server_version = 'FakeCalendar/1.0'
+
+    def do_GET(self):
+        self._handle()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_GET
+
+    def _handle(self):
+        fake: FakeCalendarServer = self.server.fake
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        url = urlsplit(self.path)
+        fake._delay()
+
+        if self.command == 'POST' and url.path.rstrip('/') == '/batch/calendar/v3':
+            error = fake._injected_error()
+            if error:
+                status, content_type, payload = error.status, 'application/json', json.dumps(error.to_json()).encode()
+            else:
+                status = 200
+                content_type, payload = fake.dispatch_batch(self.headers.get('Content-Type', ''), body)
+            with fake._lock:
+                fake.stats['batch_requests'] += 1
+        else:
+            params = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+            status, result = fake.dispatch(self.command, url.path, params, body)
+            content_type = 'application/json; charset=UTF-8'
+            payload = json.dumps(result).encode() if result is not None else b''
+
+        with fake._lock:
+            fake.stats['requests'] += 1
+            fake.stats['bytes_sent'] += len(payload)
+        self.send_response(status, HTTP_REASONS.get(status))
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Offline Google Calendar v3 stand-in server")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8085)
+    arg_parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, up to this many seconds")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests failing with 503")
+    arg_parser.add_argument('--calendars', type=int, default=3)
+    arg_parser.add_argument('--seed-events', type=int, default=0, help="synthetic events per calendar")
+    args = arg_parser.parse_args()
+
+    server = FakeCalendarServer(args.host, args.port, args.latency, args.jitter, args.error_rate)
+    if args.seed_events:
+        server.seed(calendars=args.calendars, events_per_calendar=args.seed_events)
+    print(f"📅 Fake Google Calendar API on {server.root_url}")
+    print(f"   GOOGLE_CALENDAR_API_ROOT={server.root_url} GOOGLE_CALENDAR_ANONYMOUS=true")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple
+from .config import Config
+from .models import CalendarEvent
+from .google_calendar import GoogleCalendarManager
+from .date_resolver import CHICAGO_TZ
+
+Interval = Tuple[datetime, datetime]
+
+class IntervalTree:
+    """Static centered interval tree answering "what overlaps [start, end)?" queries.
+
+    Built in O(n log n); a query costs O(log n + k) for k overlapping intervals.
+    """
+
+    def __init__(self, intervals: List[Tuple[datetime, datetime, Any]]):
+        self.center = None
+        self.left = None
+        self.right = None
+        self.by_start: List[Tuple[datetime, datetime, Any]] = []
+        self.by_end: List[Tuple[datetime, datetime, Any]] = []
+        if not intervals:
+            return
+
+        endpoints = sorted(point for start, end, _ in intervals for point in (start, end))
+        self.center = endpoints[len(endpoints) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            start, end, _ = interval
+            if end < self.center:
+                left.append(interval)
+            elif start > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda i: i[0])
+        self.by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Any]:
+        """Payloads of all intervals overlapping [start, end)"""
+        found = []
+        self._collect(start, end, found)
+        return found
+
+    def _collect(self, start: datetime, end: datetime, found: List[Any]):
+        if self.center is None:
+            return
+        if end <= self.center:
+            # Query lies left of center: centered intervals overlap iff they start before the query ends
+            for s, e, payload in self.by_start:
+                if s >= end:
+                    break
+                found.append(payload)
+            if self.left:
+                self.left._collect(start, end, found)
+        elif start > self.center:
+            # Query lies right of center: centered intervals overlap iff they end after the query starts
+            for s, e, payload in self.by_end:
+                if e <= start:
+                    break
+                found.append(payload)
+            if self.right:
+                self.right._collect(start, end, found)
+        else:
+            found.extend(payload for s, e, payload in self.by_start if s < end and e > start)
+            if self.left:
+                self.left._collect(start, end, found)
+            if self.right:
+                self.right._collect(start, end, found)
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sort and coalesce overlapping or touching intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def free_gaps(busy: List[Interval], window_start: datetime, window_end: datetime,
+              duration: timedelta) -> List[Interval]:
+    """Gaps of at least `duration` inside the window that no busy interval covers"""
+    gaps = []
+    cursor = window_start
+    for start, end in merge_intervals(busy):
+        if end <= window_start or start >= window_end:
+            continue
+        if start - cursor >= duration:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if window_end - cursor >= duration:
+        gaps.append((cursor, window_end))
+    return gaps
+
+class FreeBusyEngine:
+    """Availability answers on top of GoogleCalendarManager.
+
+    Calendars already held in the local event store ("warm") are answered from
+    cached events; the rest ("cold") are asked for in one freebusy().query
+    call, so availability never requires listing every event.
+    """
+
+    def __init__(self, calendar_manager: GoogleCalendarManager):
+        self.calendar_manager = calendar_manager
+
+    @staticmethod
+    def _localize(dt: datetime) -> datetime:
+        """Naive datetimes from the NLP layer are Central Time, like events we create"""
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=CHICAGO_TZ)
+        return dt.astimezone(CHICAGO_TZ)
+
+    def _calendar_ids(self, calendars: Optional[List[str]]) -> List[str]:
+        manager = self.calendar_manager
+        if calendars is None:
+            return [cal['id'] for cal in manager.calendar_registry.get_calendars()]
+        return [manager._resolve_calendar_id(cal) for cal in calendars]
+
+    def _split_warm_cold(self, calendar_ids: List[str]) -> Tuple[List[str], List[str]]:
+        manager = self.calendar_manager
+        if not manager.cache_enabled:
+            return [], calendar_ids
+        warm = [cal_id for cal_id in calendar_ids if manager.event_cache.store(cal_id).is_seeded]
+        cold = [cal_id for cal_id in calendar_ids if cal_id not in warm]
+        return warm, cold
+
+    def _warm_busy_events(self, calendar_ids: List[str], start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Cached events that block time (transparent events, like Google's freebusy, don't)"""
+        events = []
+        for cal_id in calendar_ids:
+            events.extend(
+                event for event in self.calendar_manager._iter_calendar_events(cal_id, start, end)
+                if event.transparency != 'transparent'
+            )
+        return events
+
+    def _query_free_busy(self, calendar_ids: List[str], start: datetime, end: datetime) -> List[Tuple[str, Interval]]:
+        """Busy intervals for calendars not held locally, via one freebusy().query call"""
+        if not calendar_ids:
+            return []
+        manager = self.calendar_manager
+        result = manager.service.freebusy().query(body={
+            'timeMin': start.isoformat(),
+            'timeMax': end.isoformat(),
+            'items': [{'id': cal_id} for cal_id in calendar_ids],
+        }).execute(http=manager._http())
+        busy = []
+        for cal_id, info in result.get('calendars', {}).items():
+            if info.get('errors'):
+                print(f"[DEBUG] freebusy error for calendar {cal_id}: {info['errors']}")
+            for period in info.get('busy', []):
+                busy.append((cal_id, (
+                    manager._parse_event_time(period['start']),
+                    manager._parse_event_time(period['end'])
+                )))
+        return busy
+
+    def get_busy_intervals(self, calendars: Optional[List[str]], start: datetime, end: datetime) -> List[Interval]:
+        """Merged busy intervals across calendars (all calendars by default)"""
+        start, end = self._localize(start), self._localize(end)
+        warm, cold = self._split_warm_cold(self._calendar_ids(calendars))
+        busy = [(event.start_time, event.end_time) for event in self._warm_busy_events(warm, start, end)]
+        busy.extend(interval for _, interval in self._query_free_busy(cold, start, end))
+        return merge_intervals(busy)
+
+    def find_free_slots(self, calendars: Optional[List[str]], window: Interval,
+                        duration: timedelta = timedelta(minutes=60),
+                        day_start_hour: Optional[int] = None,
+                        day_end_hour: Optional[int] = None) -> List[Interval]:
+        """Free slots of at least `duration` in the window, common to all given calendars.
+
+        Slots are limited to each day's waking hours (FREE_SLOT_DAY_START_HOUR to
+        FREE_SLOT_DAY_END_HOUR by default). Cost is O(n log n) in busy intervals.
+        """
+        day_start_hour = Config.FREE_SLOT_DAY_START_HOUR if day_start_hour is None else day_start_hour
+        day_end_hour = Config.FREE_SLOT_DAY_END_HOUR if day_end_hour is None else day_end_hour
+        window_start, window_end = self._localize(window[0]), self._localize(window[1])
+        busy = self.get_busy_intervals(calendars, window_start, window_end)
+
+        slots = []
+        day = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < window_end:
+            day_window_start = max(window_start, day.replace(hour=day_start_hour))
+            day_window_end = min(window_end, day.replace(hour=day_end_hour))
+            if day_window_end > day_window_start:
+                slots.extend(free_gaps(busy, day_window_start, day_window_end, duration))
+            day = (day + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return slots
+
+    def find_conflicts(self, events: List[CalendarEvent], calendars: Optional[List[str]] = None) -> List[CalendarEvent]:
+        """Events (or opaque busy blocks for calendars not cached) overlapping any of the proposed events.
+
+        Busy time for the span of all the events is fetched once and each
+        event matched against it. This is advisory, so any failure is logged
+        and reported as no conflicts rather than blocking the write.
+        """
+        if not events:
+            return []
+        proposed = [(self._localize(event.start_time), self._localize(event.end_time)) for event in events]
+        span_start, span_end = min(start for start, _ in proposed), max(end for _, end in proposed)
+        try:
+            warm, cold = self._split_warm_cold(self._calendar_ids(calendars))
+            blocks = self._warm_busy_events(warm, span_start, span_end)
+            blocks.extend(
+                CalendarEvent(summary='Busy', start_time=busy_start, end_time=busy_end, calendar_id=cal_id)
+                for cal_id, (busy_start, busy_end) in self._query_free_busy(cold, span_start, span_end)
+            )
+        except Exception as error:
+            print(f"[DEBUG] Conflict check failed: {error}")
+            return []
+        tree = IntervalTree([(block.start_time, block.end_time, block) for block in blocks])
+        conflicts = {}
+        for start, end in proposed:
+            for block in tree.overlapping(start, end):
+                conflicts[id(block)] = block
+        return sorted(conflicts.values(), key=lambda e: e.start_time)
@@ -1,16 +1,57 @@
 import os
 import json
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Callable
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from google.auth.credentials import AnonymousCredentials
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 from dateutil import parser
 from dateutil import tz
 from .config import Config
 from .models import CalendarEvent, CalendarResponse
+from .event_store import EventCache, CalendarEventStore
+from .calendar_registry import CalendarRegistry
+from .calendar_watch import CalendarWatcher
+from .date_resolver import CHICAGO_TZ
+
+# Google rejects batch requests with more than 50 calls
+BATCH_SIZE_LIMIT = 50
+
+# Largest page events().list will return
+LIST_PAGE_SIZE = 2500
+
+# Event resource fields read by _to_calendar_event, keyed by the CalendarEvent field they fill
+EVENT_RESOURCE_FIELDS = {
+    'id': 'id',
+    'summary': 'summary',
+    'description': 'description',
+    'start_time': 'start(date,dateTime)',
+    'end_time': 'end(date,dateTime)',
+    'location': 'location',
+    'attendees': 'attendees(email)',
+    'transparency': 'transparency',
+}
+
+def _event_field_mask() -> str:
+    """Partial-response mask for one event, derived from the CalendarEvent model"""
+    fields = [EVENT_RESOURCE_FIELDS[name] for name in CalendarEvent.model_fields if name in EVENT_RESOURCE_FIELDS]
+    # status is needed to spot cancelled events in sync deltas
+    return ','.join(fields + ['status'])
+
+EVENT_FIELDS = _event_field_mask()
+EVENTS_LIST_FIELDS = f"items({EVENT_FIELDS}),nextPageToken,nextSyncToken"
+CALENDAR_LIST_FIELDS = "items(id,summary,description,primary),nextPageToken"
 
 class GoogleCalendarManager:
     def __init__(self):
@@ -18,19 +59,42 @@ class GoogleCalendarManager:
         self.credentials = None
         self.calendar_id = Config.CALENDAR_ID
         self.scopes = Config.SCOPES
+        self.cache_enabled = Config.CALENDAR_CACHE_ENABLED
+        self.event_cache = EventCache(
+            sync_interval=Config.CALENDAR_SYNC_INTERVAL,
+            watched_sync_interval=Config.CALENDAR_WATCHED_SYNC_INTERVAL
+        )
+        self.parallel_fetch = Config.CALENDAR_PARALLEL_FETCH
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.CALENDAR_FETCH_WORKERS,
+            thread_name_prefix='calendar-fetch'
+        )
+        self._local = threading.local()
+        root = Config.GOOGLE_CALENDAR_API_ROOT
+        self.api_root = root if not root or root.endswith('/') else root + '/'
         self._authenticate()
         
-        # Calendar name to ID mapping
-        self.calendar_mapping = {
-            'family': 'family04216910528477616445@group.calendar.google.com',
-            'shared_family': 'family04216910528477616445@group.calendar.google.com',
-            'work': 'angeli.corral@gmail.com',  # Default to primary for work
-            'primary': 'angeli.corral@gmail.com',
-            'main': 'angeli.corral@gmail.com'
-        }
+        # Cached calendar list; also maps friendly names like 'family' to calendar IDs
+        self.calendar_registry = CalendarRegistry(self._load_calendars, ttl=Config.CALENDAR_LIST_TTL)
+        
+        # Push channels that re-sync a calendar when it changes in Google (started by the API server)
+        self.watcher = CalendarWatcher(
+            self,
+            webhook_url=Config.CALENDAR_WEBHOOK_URL,
+            secret=Config.SECRET_KEY,
+            ttl=Config.CALENDAR_WATCH_TTL,
+            renew_margin=Config.CALENDAR_WATCH_RENEW_MARGIN,
+            instance_id=Config.CALENDAR_WATCH_INSTANCE_ID
+        )
     
     def _authenticate(self):
         """Authenticate with Google Calendar API"""
+        if Config.GOOGLE_CALENDAR_ANONYMOUS:
+            # Local stand-in servers (see src/fake_calendar_server.py) need no OAuth
+            self.credentials = AnonymousCredentials()
+            self.service = self._build_service()
+            return
+        
         creds = None
         token_path = 'token.json'
         
@@ -65,7 +129,30 @@ class GoogleCalendarManager:
                 token.write(creds.to_json())
         
         self.credentials = creds
-        self.service = build('calendar', 'v3', credentials=creds)
+        self.service = self._build_service()
+    
+    def _build_service(self):
+        """Calendar v3 client, pointed at GOOGLE_CALENDAR_API_ROOT when one is configured"""
+        client_options = {'api_endpoint': f"{self.api_root}calendar/v3/"} if self.api_root else None
+        return build('calendar', 'v3', credentials=self.credentials, client_options=client_options)
+    
+    def _new_batch(self, callback: Callable) -> BatchHttpRequest:
+        """Batch request; build() always aims batches at Google, so an alternate root needs its own URI"""
+        if self.api_root:
+            return BatchHttpRequest(callback=callback, batch_uri=f"{self.api_root}batch/calendar/v3")
+        return self.service.new_batch_http_request(callback=callback)
+    
+    def _http(self) -> AuthorizedHttp:
+        """Authorized transport for the calling thread.
+        
+        httplib2 connections are not thread-safe, so each thread that talks to
+        the API (including the fan-out workers) gets its own.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
     
     def _convert_to_chicago_time(self, dt: datetime) -> datetime:
         """Convert a datetime to America/Chicago timezone"""
@@ -74,51 +161,223 @@ class GoogleCalendarManager:
             dt = dt.replace(tzinfo=tz.UTC)
         
         # Convert to Chicago time
-        chicago_tz = tz.gettz('America/Chicago')
-        return dt.astimezone(chicago_tz)
+        return dt.astimezone(CHICAGO_TZ)
     
     def _parse_event_time(self, time_str: str) -> datetime:
         """Parse event time and convert to Chicago timezone"""
         parsed_time = parser.parse(time_str)
         return self._convert_to_chicago_time(parsed_time)
     
+    @staticmethod
+    def _format_gcal_time(dt: datetime) -> str:
+        """Format a datetime for Google API (naive datetimes are treated as UTC)"""
+        if dt.tzinfo is None:
+            return dt.isoformat() + 'Z'
+        else:
+            return dt.isoformat()
+    
+    def _to_calendar_event(self, event: Dict[str, Any], calendar_id: Optional[str] = None) -> CalendarEvent:
+        """Map a Google event resource to a CalendarEvent"""
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        return CalendarEvent(
+            id=event.get('id'),
+            summary=event.get('summary', ''),
+            description=event.get('description'),
+            start_time=self._parse_event_time(start),
+            end_time=self._parse_event_time(end),
+            location=event.get('location'),
+            attendees=[attendee['email'] for attendee in event.get('attendees', []) if 'email' in attendee],
+            calendar_id=calendar_id,
+            transparency=event.get('transparency')
+        )
+    
+    def _sync_calendar(self, calendar_id: str) -> CalendarEventStore:
+        """Bring the local store for a calendar up to date and return it.
+        
+        The first call lists the whole calendar; later calls only fetch what
+        changed since the stored sync token. A 410 Gone means the token has
+        expired, in which case the store is wiped and fully re-synced.
+        """
+        store = self.event_cache.store(calendar_id)
+        with store.lock:
+            if not self.event_cache.needs_sync(store):
+                self.event_cache.record('hits')
+                return store
+            try:
+                self._pull_changes(store)
+            except HttpError as error:
+                if error.resp.status != 410:
+                    raise
+                print(f"[DEBUG] Sync token expired for calendar {calendar_id}, running full resync")
+                self.event_cache.record('expired_tokens')
+                store.reset()
+                self._pull_changes(store)
+        return store
+    
+    def _pull_changes(self, store: CalendarEventStore):
+        """Run a full or delta sync for a store, following all result pages"""
+        generation = store.generation  # invalidations after this may not be in the pages fetched
+        full_sync = not store.is_seeded
+        params = {
+            'calendarId': store.calendar_id,
+            'singleEvents': True,
+            'maxResults': LIST_PAGE_SIZE,
+            'fields': EVENTS_LIST_FIELDS,
+        }
+        if full_sync:
+            store.reset()
+        else:
+            params['syncToken'] = store.sync_token
+        
+        changed = 0
+        for events_result in self._paginate(self.service.events().list, **params):
+            for item in events_result.get('items', []):
+                if item.get('status') == 'cancelled':
+                    store.remove(item['id'])
+                else:
+                    store.put(self._to_calendar_event(item, store.calendar_id))
+                changed += 1
+        
+        # The sync token only arrives on the last page
+        store.mark_synced(events_result.get('nextSyncToken'), generation)
+        self.event_cache.record('full_syncs' if full_sync else 'delta_syncs')
+        self.event_cache.record('events_changed', changed)
+        print(f"[DEBUG] {'Full' if full_sync else 'Delta'} sync of {store.calendar_id}: {changed} events")
+    
+    def _paginate(self, list_method: Callable, **params) -> Iterator[Dict[str, Any]]:
+        """Yield each response page of a list call, following nextPageToken"""
+        while True:
+            page = list_method(**params).execute(http=self._http())
+            yield page
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return
+            params['pageToken'] = page_token
+    
+    @staticmethod
+    def _page_size(max_results: Optional[int]) -> int:
+        """Page size for a read that needs at most max_results events"""
+        return min(max_results or LIST_PAGE_SIZE, LIST_PAGE_SIZE)
+    
+    def _iter_store_events(self, store: CalendarEventStore, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None, query: Optional[str] = None) -> Iterator[CalendarEvent]:
+        """Events from a synced store overlapping the window and matching the query, in start-time order"""
+        window_start = self._convert_to_chicago_time(start_date) if start_date else None
+        window_end = self._convert_to_chicago_time(end_date) if end_date else None
+        terms = query.lower().split() if query else None
+        for event in store.sorted_events():
+            if window_end and event.start_time >= window_end:
+                break
+            if window_start and event.end_time <= window_start:
+                continue
+            if terms and not self._matches_query(event, terms):
+                continue
+            yield event
+    
+    def _iter_calendar_events(self, calendar_id: str, start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None, query: Optional[str] = None,
+                              page_size: int = LIST_PAGE_SIZE) -> Iterator[CalendarEvent]:
+        """Stream one calendar's events in start-time order.
+        
+        With the cache enabled this walks the synced local store; otherwise it
+        fetches result pages from Google lazily, one page at a time.
+        """
+        if self.cache_enabled:
+            store = self._sync_calendar(calendar_id)
+            yield from self._iter_store_events(store, start_date, end_date, query)
+            return
+        
+        params = {
+            'calendarId': calendar_id,
+            'maxResults': page_size,
+            'singleEvents': True,
+            'orderBy': 'startTime',
+            'fields': EVENTS_LIST_FIELDS,
+        }
+        if start_date:
+            params['timeMin'] = self._format_gcal_time(start_date)
+        if end_date:
+            params['timeMax'] = self._format_gcal_time(end_date)
+        if query:
+            params['q'] = query
+        for events_result in self._paginate(self.service.events().list, **params):
+            for event in events_result.get('items', []):
+                yield self._to_calendar_event(event, calendar_id)
+    
+    def iter_events(self, calendar_ids: Optional[List[str]] = None, start_date: Optional[datetime] = None,
+                    end_date: Optional[datetime] = None, query: Optional[str] = None,
+                    page_size: int = LIST_PAGE_SIZE) -> Iterator[CalendarEvent]:
+        """Stream events from several calendars (all of them by default) merged in start-time order.
+        
+        Pages are only fetched as the caller consumes events, so taking the
+        first few events of a month view costs one page per calendar.
+        """
+        if calendar_ids is None:
+            calendar_ids = [cal['id'] for cal in self.calendar_registry.get_calendars()]
+        else:
+            calendar_ids = [self._resolve_calendar_id(cal_id) for cal_id in calendar_ids]
+        streams = [
+            self._iter_calendar_events(cal_id, start_date, end_date, query, page_size)
+            for cal_id in calendar_ids
+        ]
+        return heapq.merge(*streams, key=lambda e: e.start_time)
+    
+    def _event_body(self, event: CalendarEvent, include_reminders: bool = True) -> Dict[str, Any]:
+        """Build the Google event resource for an insert or update"""
+        event_body = {
+            'summary': event.summary,
+            'description': event.description,
+            'start': {
+                'dateTime': event.start_time.isoformat(),
+                'timeZone': 'America/Chicago',  # Central Time
+            },
+            'end': {
+                'dateTime': event.end_time.isoformat(),
+                'timeZone': 'America/Chicago',
+            },
+            'location': event.location,
+            'attendees': [{'email': email} for email in (event.attendees or [])],
+        }
+        if include_reminders:
+            event_body['reminders'] = event.reminders or {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},
+                    {'method': 'popup', 'minutes': 10},
+                ],
+            }
+        return event_body
+    
+    def _resolve_calendar_id(self, calendar_id: Optional[str]) -> str:
+        """Map a friendly calendar name (or None) to an actual calendar ID"""
+        # Use specified calendar_id or default to primary calendar
+        calendar_id = calendar_id or self.calendar_id
+        
+        # Map friendly calendar names to actual calendar IDs
+        return self.calendar_registry.resolve(calendar_id)
+    
+    @property
+    def default_calendar_id(self) -> str:
+        """Resolved ID of the configured default calendar (CALENDAR_ID)"""
+        return self._resolve_calendar_id(self.calendar_id)
+    
+    def invalidate_calendar_list(self):
+        """Forget the cached calendar list (e.g. after calendars are added or shared)"""
+        self.calendar_registry.invalidate()
+    
     def create_event(self, event: CalendarEvent) -> CalendarResponse:
         """Create a new calendar event"""
         try:
-            event_body = {
-                'summary': event.summary,
-                'description': event.description,
-                'start': {
-                    'dateTime': event.start_time.isoformat(),
-                    'timeZone': 'America/Chicago',  # Central Time
-                },
-                'end': {
-                    'dateTime': event.end_time.isoformat(),
-                    'timeZone': 'America/Chicago',
-                },
-                'location': event.location,
-                'attendees': [{'email': email} for email in (event.attendees or [])],
-                'reminders': event.reminders or {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},
-                        {'method': 'popup', 'minutes': 10},
-                    ],
-                }
-            }
-            
-            # Use specified calendar_id or default to primary calendar
-            calendar_id = event.calendar_id or self.calendar_id
-            
-            # Map friendly calendar names to actual calendar IDs
-            if calendar_id in self.calendar_mapping:
-                calendar_id = self.calendar_mapping[calendar_id]
+            calendar_id = self._resolve_calendar_id(event.calendar_id)
             
             event_result = self.service.events().insert(
                 calendarId=calendar_id,
-                body=event_body,
-                sendUpdates='all'
-            ).execute()
+                body=self._event_body(event),
+                sendUpdates='all',
+                fields='id'
+            ).execute(http=self._http())
+            self.event_cache.invalidate(calendar_id)
             
             return CalendarResponse(
                 success=True,
@@ -136,27 +395,14 @@ class GoogleCalendarManager:
     def update_event(self, event_id: str, event: CalendarEvent) -> CalendarResponse:
         """Update an existing calendar event"""
         try:
-            event_body = {
-                'summary': event.summary,
-                'description': event.description,
-                'start': {
-                    'dateTime': event.start_time.isoformat(),
-                    'timeZone': 'America/Chicago',
-                },
-                'end': {
-                    'dateTime': event.end_time.isoformat(),
-                    'timeZone': 'America/Chicago',
-                },
-                'location': event.location,
-                'attendees': [{'email': email} for email in (event.attendees or [])],
-            }
-            
             updated_event = self.service.events().update(
-                calendarId=self.calendar_id,
+                calendarId=self.default_calendar_id,
                 eventId=event_id,
-                body=event_body,
-                sendUpdates='all'
-            ).execute()
+                body=self._event_body(event, include_reminders=False),
+                sendUpdates='all',
+                fields='id'
+            ).execute(http=self._http())
+            self.event_cache.invalidate(self.default_calendar_id)
             
             return CalendarResponse(
                 success=True,
@@ -175,10 +421,11 @@ class GoogleCalendarManager:
         """Delete a calendar event"""
         try:
             self.service.events().delete(
-                calendarId=self.calendar_id,
+                calendarId=self.default_calendar_id,
                 eventId=event_id,
                 sendUpdates='all'
-            ).execute()
+            ).execute(http=self._http())
+            self.event_cache.invalidate(self.default_calendar_id)
             
             return CalendarResponse(
                 success=True,
@@ -192,46 +439,139 @@ class GoogleCalendarManager:
                 error=str(error)
             )
     
+    def _execute_batch(self, requests: List[Any]) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Execute API requests as Google batch calls, returning (response, error) per request in order"""
+        results: List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = [(None, None)] * len(requests)
+        
+        def callback(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+        
+        for offset in range(0, len(requests), BATCH_SIZE_LIMIT):
+            batch = self._new_batch(callback)
+            for index, request in enumerate(requests[offset:offset + BATCH_SIZE_LIMIT], start=offset):
+                batch.add(request, request_id=str(index))
+            batch.execute(http=self._http())
+        return results
+    
+    def create_events(self, events: List[CalendarEvent]) -> List[CalendarResponse]:
+        """Create several events in one batch round-trip, returning a response per event"""
+        if not events:
+            return []
+        calendar_ids = [self._resolve_calendar_id(event.calendar_id) for event in events]
+        requests = [
+            self.service.events().insert(
+                calendarId=calendar_id, body=self._event_body(event), sendUpdates='all', fields='id'
+            )
+            for event, calendar_id in zip(events, calendar_ids)
+        ]
+        try:
+            results = self._execute_batch(requests)
+        except HttpError as error:
+            return [
+                CalendarResponse(success=False, message="Failed to create event", error=str(error))
+                for _ in events
+            ]
+        finally:
+            for calendar_id in set(calendar_ids):
+                self.event_cache.invalidate(calendar_id)
+        
+        responses = []
+        for event, (event_result, exception) in zip(events, results):
+            if exception is None:
+                responses.append(CalendarResponse(
+                    success=True,
+                    message=f"Event '{event.summary}' created successfully",
+                    event_id=event_result['id']
+                ))
+            else:
+                responses.append(CalendarResponse(
+                    success=False,
+                    message="Failed to create event",
+                    error=str(exception)
+                ))
+        return responses
+    
+    def update_events(self, updates: List[Tuple[str, CalendarEvent]]) -> List[CalendarResponse]:
+        """Update several events in one batch round-trip, returning a response per event"""
+        if not updates:
+            return []
+        requests = [
+            self.service.events().update(
+                calendarId=self.default_calendar_id,
+                eventId=event_id,
+                body=self._event_body(event, include_reminders=False),
+                sendUpdates='all',
+                fields='id'
+            )
+            for event_id, event in updates
+        ]
+        try:
+            results = self._execute_batch(requests)
+        except HttpError as error:
+            return [
+                CalendarResponse(success=False, message="Failed to update event", error=str(error))
+                for _ in updates
+            ]
+        finally:
+            self.event_cache.invalidate(self.default_calendar_id)
+        
+        responses = []
+        for (_, event), (updated_event, exception) in zip(updates, results):
+            if exception is None:
+                responses.append(CalendarResponse(
+                    success=True,
+                    message=f"Event '{event.summary}' updated successfully",
+                    event_id=updated_event['id']
+                ))
+            else:
+                responses.append(CalendarResponse(
+                    success=False,
+                    message="Failed to update event",
+                    error=str(exception)
+                ))
+        return responses
+    
+    def delete_events(self, event_ids: List[str]) -> List[CalendarResponse]:
+        """Delete several events in one batch round-trip, returning a response per event"""
+        if not event_ids:
+            return []
+        requests = [
+            self.service.events().delete(calendarId=self.default_calendar_id, eventId=event_id, sendUpdates='all')
+            for event_id in event_ids
+        ]
+        try:
+            results = self._execute_batch(requests)
+        except HttpError as error:
+            return [
+                CalendarResponse(success=False, message="Failed to delete event", error=str(error))
+                for _ in event_ids
+            ]
+        finally:
+            self.event_cache.invalidate(self.default_calendar_id)
+        
+        return [
+            CalendarResponse(success=True, message="Event deleted successfully", event_id=event_id)
+            if exception is None else
+            CalendarResponse(success=False, message="Failed to delete event", error=str(exception))
+            for event_id, (_, exception) in zip(event_ids, results)
+        ]
+    
     def get_events(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, 
-                   max_results: int = 10) -> CalendarResponse:
-        """Get calendar events within a date range"""
+                   max_results: Optional[int] = 10) -> CalendarResponse:
+        """Get calendar events within a date range (max_results=None returns every page)"""
         try:
             if not start_date:
                 start_date = datetime.utcnow()
             if not end_date:
                 end_date = start_date + timedelta(days=7)
 
-            def format_gcal_time(dt):
-                if dt.tzinfo is None:
-                    return dt.isoformat() + 'Z'
-                else:
-                    return dt.isoformat()
-
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=format_gcal_time(start_date),
-                timeMax=format_gcal_time(end_date),
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            events = events_result.get('items', [])
-            calendar_events = []
-
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                calendar_events.append(CalendarEvent(
-                    id=event.get('id'),
-                    summary=event['summary'],
-                    description=event.get('description'),
-                    start_time=self._parse_event_time(start),
-                    end_time=self._parse_event_time(end),
-                    location=event.get('location'),
-                    attendees=[attendee['email'] for attendee in event.get('attendees', [])]
-                ))
+            calendar_events = list(islice(
+                self._iter_calendar_events(
+                    self.default_calendar_id, start_date, end_date,
+                    page_size=self._page_size(max_results)
+                ),
+                max_results
+            ))
 
             return CalendarResponse(
                 success=True,
@@ -246,18 +586,23 @@ class GoogleCalendarManager:
                 error=str(error)
             )
     
-    def list_calendars(self) -> CalendarResponse:
-        """List all available calendars"""
-        try:
-            calendar_list = self.service.calendarList().list().execute()
-            calendars = []
-            for cal in calendar_list['items']:
+    def _load_calendars(self) -> List[Dict[str, Any]]:
+        """Fetch the calendar list from Google (used by the calendar registry)"""
+        calendars = []
+        for calendar_list in self._paginate(self.service.calendarList().list, fields=CALENDAR_LIST_FIELDS):
+            for cal in calendar_list.get('items', []):
                 calendars.append({
                     'id': cal['id'],
                     'summary': cal['summary'],
                     'description': cal.get('description', ''),
                     'primary': cal.get('primary', False)
                 })
+        return calendars
+    
+    def list_calendars(self) -> CalendarResponse:
+        """List all available calendars"""
+        try:
+            calendars = self.calendar_registry.get_calendars()
             return CalendarResponse(
                 success=True,
                 message=f"Found {len(calendars)} calendars",
@@ -272,33 +617,24 @@ class GoogleCalendarManager:
                 error=str(error)
             )
 
-    def search_events(self, query: str, max_results: int = 10) -> CalendarResponse:
+    @staticmethod
+    def _matches_query(event: CalendarEvent, terms: List[str]) -> bool:
+        """Local stand-in for the API's free-text `q` match (all terms must appear)"""
+        haystack = ' '.join(filter(None, [
+            event.summary, event.description, event.location, ' '.join(event.attendees or [])
+        ])).lower()
+        return all(term in haystack for term in terms)
+
+    def search_events(self, query: str, max_results: Optional[int] = 10) -> CalendarResponse:
         """Search for events by query string"""
         try:
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                q=query,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            calendar_events = []
-            
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                calendar_events.append(CalendarEvent(
-                    id=event.get('id'),
-                    summary=event['summary'],
-                    description=event.get('description'),
-                    start_time=self._parse_event_time(start),
-                    end_time=self._parse_event_time(end),
-                    location=event.get('location'),
-                    attendees=[attendee['email'] for attendee in event.get('attendees', [])]
-                ))
+            calendar_events = list(islice(
+                self._iter_calendar_events(
+                    self.default_calendar_id, query=query,
+                    page_size=self._page_size(max_results)
+                ),
+                max_results
+            ))
             
             return CalendarResponse(
                 success=True,
@@ -313,8 +649,24 @@ class GoogleCalendarManager:
                 error=str(error)
             ) 
 
-    def get_events_all_calendars(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, max_results: int = 10) -> CalendarResponse:
-        """Get events from all calendars within a date range and combine them."""
+    def _fetch_calendar_events(self, cal_id: str, start_date: datetime, end_date: datetime,
+                               max_results: Optional[int]) -> Tuple[str, List[CalendarEvent], float]:
+        """Fetch one calendar's events for the fan-out; failures yield an empty list"""
+        started = time.perf_counter()
+        try:
+            print(f"[DEBUG] Querying calendar: {cal_id}")
+            events = list(islice(
+                self._iter_calendar_events(cal_id, start_date, end_date, page_size=self._page_size(max_results)),
+                max_results
+            ))
+            print(f"[DEBUG] Found {len(events)} events in calendar {cal_id}")
+        except Exception as e:
+            print(f"[DEBUG] Error querying calendar {cal_id}: {e}")
+            events = []  # Skip calendars that error out
+        return cal_id, events, (time.perf_counter() - started) * 1000
+
+    def get_events_all_calendars(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, max_results: Optional[int] = 10) -> CalendarResponse:
+        """Get events from all calendars within a date range and combine them (max_results applies per calendar, None for all)."""
         try:
             if not start_date:
                 start_date = datetime.utcnow()
@@ -323,13 +675,6 @@ class GoogleCalendarManager:
 
             print(f"[DEBUG] get_events_all_calendars: start_date={start_date} end_date={end_date}")
 
-            # Helper to format datetime for Google API
-            def format_gcal_time(dt):
-                if dt.tzinfo is None:
-                    return dt.isoformat() + 'Z'
-                else:
-                    return dt.isoformat()
-
             # Get all calendar IDs
             calendar_list_resp = self.list_calendars()
             if not calendar_list_resp.success or not getattr(calendar_list_resp, 'calendars', None):
@@ -338,43 +683,27 @@ class GoogleCalendarManager:
             calendar_ids = [cal['id'] for cal in getattr(calendar_list_resp, 'calendars', [])]
             print(f"[DEBUG] Querying {len(calendar_ids)} calendars: {calendar_ids}")
 
-            all_events = []
-            for cal_id in calendar_ids:
-                try:
-                    print(f"[DEBUG] Querying calendar: {cal_id}")
-                    events_result = self.service.events().list(
-                        calendarId=cal_id,
-                        timeMin=format_gcal_time(start_date),
-                        timeMax=format_gcal_time(end_date),
-                        maxResults=max_results,
-                        singleEvents=True,
-                        orderBy='startTime'
-                    ).execute()
-                    events = events_result.get('items', [])
-                    print(f"[DEBUG] Found {len(events)} events in calendar {cal_id}")
-                    for event in events:
-                        start = event['start'].get('dateTime', event['start'].get('date'))
-                        end = event['end'].get('dateTime', event['end'].get('date'))
-                        all_events.append(CalendarEvent(
-                            id=event.get('id'),
-                            summary=event['summary'],
-                            description=event.get('description'),
-                            start_time=self._parse_event_time(start),
-                            end_time=self._parse_event_time(end),
-                            location=event.get('location'),
-                            attendees=[attendee['email'] for attendee in event.get('attendees', [])]
-                        ))
-                except Exception as e:
-                    print(f"[DEBUG] Error querying calendar {cal_id}: {e}")
-                    continue  # Skip calendars that error out
+            if self.parallel_fetch and len(calendar_ids) > 1:
+                results = list(self._executor.map(
+                    lambda cal_id: self._fetch_calendar_events(cal_id, start_date, end_date, max_results),
+                    calendar_ids
+                ))
+            else:
+                results = [
+                    self._fetch_calendar_events(cal_id, start_date, end_date, max_results)
+                    for cal_id in calendar_ids
+                ]
 
-            # Sort all events by start_time
-            all_events.sort(key=lambda e: e.start_time)
+            # Each calendar's list is already ordered by start_time, so k-way merge them
+            all_events = list(heapq.merge(*[events for _, events, _ in results], key=lambda e: e.start_time))
+            calendar_timings = {cal_id: round(elapsed_ms, 1) for cal_id, _, elapsed_ms in results}
             print(f"[DEBUG] Total events found across all calendars: {len(all_events)}")
+            print(f"[DEBUG] Per-calendar timings (ms): {calendar_timings}")
             return CalendarResponse(
                 success=True,
                 message=f"Found {len(all_events)} events across all calendars",
-                events=all_events
+                events=all_events,
+                calendar_timings=calendar_timings
             )
         except Exception as error:
             print(f"[DEBUG] Exception in get_events_all_calendars: {error}")
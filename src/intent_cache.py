@@ -0,0 +1,162 @@
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from dateutil import parser
+from dateutil.relativedelta import relativedelta
+from .intent_parser import normalize_utterance
+from .date_resolver import WEEKDAYS, build_day_table
+
+# Relative day words, abstracted to offsets in the key ("tomorrow" -> {day+1})
+DAY_OFFSETS = {'today': 0, 'tomorrow': 1, 'yesterday': -1}
+# Words that never change what the LLM extracts
+KEY_FILLER = {'please', 'hey', 'hi', 'ok', 'okay', 'um', 'uh', 'so'}
+# Relative to the clock rather than the day: never cached
+CLOCK_RELATIVE = re.compile(r'\b(?:now|in (?:a|an|\d+) (?:minutes?|hours?)|(?:an?|\d+) hours? from now)\b')
+# Month names, ordinals and numeric dates: the result is only reused the same day
+ABSOLUTE_DATE = re.compile(
+    r'\b(?:january|february|march|april|may|june|july|august|september|october|november|december'
+    r'|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec|\d+(?:st|nd|rd|th)|\d{1,4} \d{1,2}(?: \d{1,4})?)\b'
+)
+WEEK_WORDS = re.compile(r'\bweek(?:end)?s?\b')
+MONTH_WORDS = re.compile(r'\bmonths?\b')
+
+def _weekday_offset(weekday: str, today: date) -> int:
+    """Days until a weekday the way the system prompt resolves it: the next one, never today"""
+    return (build_day_table(today).next_weekdays[weekday] - today).days
+
+def utterance_key(text: str, today: date) -> Optional[Tuple[str, str]]:
+    """Cache key and date granularity for an utterance, or None if it can't be cached.
+
+    'what chores do I have today' and 'What chores do I have today?' share a key,
+    as do 'what's on tomorrow' on Thursday and 'what's on Friday' on Thursday.
+    The granularity says what the cached dates are relative to: the day, the
+    week (Monday) or the month.
+    """
+    normalized = normalize_utterance(text)
+    if not normalized or CLOCK_RELATIVE.search(normalized):
+        return None
+    words = []
+    day_relative = False
+    for word in normalized.split():
+        if word in KEY_FILLER:
+            continue
+        if word in DAY_OFFSETS:
+            words.append(f'{{day{DAY_OFFSETS[word]:+d}}}')
+            day_relative = True
+        elif word in WEEKDAYS:
+            words.append(f'{{day{_weekday_offset(word, today):+d}}}')
+            day_relative = True
+        else:
+            words.append(word)
+    key = ' '.join(words)
+    if ABSOLUTE_DATE.search(normalized):
+        return f'{key} @{today.isoformat()}', 'absolute'
+    if not day_relative and WEEK_WORDS.search(normalized):
+        return key, 'week'
+    if not day_relative and MONTH_WORDS.search(normalized):
+        return key, 'month'
+    return key, 'day'
+
+def _anchor(today: date, granularity: str) -> date:
+    if granularity == 'week':
+        return today - timedelta(days=today.weekday())
+    if granularity == 'month':
+        return today.replace(day=1)
+    return today
+
+def _shift(value: datetime, stored: date, current: date, granularity: str) -> datetime:
+    if granularity == 'month':
+        months = (current.year - stored.year) * 12 + current.month - stored.month
+        month_end = (value + timedelta(days=1)).month != value.month
+        shifted = value + relativedelta(months=months)
+        # "this month" ends on the 31st in October but the 30th in November
+        return shifted + relativedelta(day=31) if month_end else shifted
+    return value + timedelta(days=(current - stored).days)
+
+class IntentCache:
+    """LRU cache of the LLM's structured results, keyed on the normalized utterance.
+
+    Families repeat the same commands daily, so a result is stored with the
+    date it was resolved against and, on a hit, its event dates are moved to
+    the current day (or week, or month) instead of asking the LLM again.
+    """
+
+    DATE_FIELDS = ('start_time', 'end_time')
+
+    def __init__(self, max_entries: int = 512, ttl: float = 604800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[Dict[str, Any], str, date, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'expirations': 0, 'uncacheable': 0}
+
+    def get(self, text: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Cached result re-resolved against today, or None on a miss"""
+        today = (now or datetime.now()).date()
+        keyed = utterance_key(text, today)
+        with self._lock:
+            if keyed is None:
+                self.stats['uncacheable'] += 1
+                return None
+            key, granularity = keyed
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[3] >= self.ttl:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        data, granularity, anchor, _ = entry
+        return self._rebase(data, anchor, _anchor(today, granularity), granularity)
+
+    def put(self, text: str, data: Dict[str, Any], now: Optional[datetime] = None):
+        """Store a result the LLM resolved against `now`'s date"""
+        today = (now or datetime.now()).date()
+        keyed = utterance_key(text, today)
+        if keyed is None:
+            return
+        key, granularity = keyed
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(data), granularity, _anchor(today, granularity), time.time())
+            self._entries.move_to_end(key)
+            self.stats['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _rebase(self, data: Dict[str, Any], stored: date, current: date, granularity: str) -> Dict[str, Any]:
+        data = copy.deepcopy(data)
+        if stored == current:
+            return data
+        events = list(data.get('events') or [])
+        if isinstance(data.get('event'), dict):
+            events.append(data['event'])
+        for event in events:
+            for field in self.DATE_FIELDS:
+                value = event.get(field)
+                if not value:
+                    continue
+                try:
+                    event[field] = _shift(parser.parse(value), stored, current, granularity).isoformat()
+                except (ValueError, OverflowError):
+                    pass
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
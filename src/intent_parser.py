@@ -0,0 +1,113 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+from .models import ProcessedCommand, CalendarEvent, CalendarAction, InputType, ChoresCommand, ChoresAction
+from .date_resolver import DateResolver
+
+# Words that ask to see something
+READ_CUES = {'what', 'show', 'list', 'check', 'see', 'tell', 'view', 'display', 'anything', 'any', 'whats', 'give', 'which'}
+# Words that never change the meaning of a read
+FILLER_WORDS = {
+    'is', 'are', 'on', 'my', 'me', 'the', 'for', 'do', 'i', 'we', 'have', 'got', 'there', 'our', 'a', 'an',
+    'calendar', 'calendars', 'agenda', 'events', 'event', 'appointments', 'appointment', 'meetings', 'plans',
+    'please', 'can', 'you', 'could', 'would', 'up', 'at', 'in', 'of', 'all', 'to', 'us', 'family', 'going',
+    'happening', 'planned', 'scheduled', 'coming', 'that', 'it', 'look', 'looks', 'like', 'does', 'hey', 'so',
+    'far', 'again', 'everything', 'everyone', 'whole', 'entire', 'rest', 'left', 'out', 'next', 'this', 'day',
+}
+CHORE_CUES = {'chore', 'chores', 'housework', 'task', 'tasks', 'todo', 'todos'}
+# Anything that creates or changes data goes to the LLM, which extracts the details
+WRITE_CUES = {
+    'add', 'create', 'new', 'make', 'put', 'assign', 'pick', 'take', 'claim', 'complete', 'completed', 'done',
+    'finish', 'finished', 'mark', 'update', 'edit', 'change', 'modify', 'rename', 'remove', 'delete', 'cancel',
+    'clear', 'book', 'arrange', 'set', 'move', 'reschedule', 'plan', 'remind', 'invite', 'schedule',
+}
+# 'schedule' is a noun after these words ("my schedule"), a verb otherwise
+SCHEDULE_NOUN_AFTER = {'my', 'the', 'our', 'your', 'family', 'whats', 'is'}
+
+CONTRACTIONS = [
+    (r"\bwhat's\b", 'whats'), (r"\bwhat is\b", 'whats'), (r"\bwhere's\b", 'where is'), (r"\bi've\b", 'i have'),
+    (r"\bwe've\b", 'we have'), (r"\bhow's\b", 'how is'), (r"\bthere's\b", 'there is'),
+]
+
+def normalize_utterance(text: str) -> str:
+    """Lowercase, expand contractions and strip punctuation: "What's on?" -> 'whats on'"""
+    text = text.lower().replace('’', "'")
+    for pattern, replacement in CONTRACTIONS:
+        text = re.sub(pattern, replacement, text)
+    return ' '.join(re.sub(r"[^a-z0-9' ]+", ' ', text).replace("'", '').split())
+
+@dataclass
+class LocalIntent:
+    """A locally parsed command and how sure the grammar is about it"""
+    command: Union[ProcessedCommand, ChoresCommand]
+    confidence: float
+
+class LocalIntentParser:
+    """Grammar for the high-frequency read-only utterances, parsed without the LLM.
+
+    Every word must be a read cue, a filler word or part of a time phrase;
+    each unexplained content word ("dentist", "soccer") lowers the confidence,
+    and any create/change verb sends the utterance to the LLM outright.
+    """
+
+    CONFIDENT = 0.95
+    UNKNOWN_WORD_PENALTY = 0.2
+    NO_TIME_PENALTY = 0.25
+
+    def __init__(self, date_resolver: Optional[DateResolver] = None):
+        self.date_resolver = date_resolver or DateResolver()
+
+    def _extract_time(self, text: str, now: datetime) -> Tuple[Optional[Tuple[datetime, datetime]], str]:
+        """Resolve the first date phrase and return the text with it removed"""
+        match = self.date_resolver.find(text, now)
+        if match is None:
+            return None, text
+        start, end = match.span
+        return (match.start, match.end), (text[:start] + ' ' + text[end:]).strip()
+
+    @staticmethod
+    def _has_write_cue(words: List[str]) -> bool:
+        for i, word in enumerate(words):
+            if word == 'schedule' and i > 0 and words[i - 1] in SCHEDULE_NOUN_AFTER:
+                continue
+            if word in WRITE_CUES:
+                return True
+        return False
+
+    def parse(self, text: str, input_type: InputType, now: Optional[datetime] = None) -> Optional[LocalIntent]:
+        """Parse a read/list or chores query locally; None when the grammar doesn't apply"""
+        now = now or self.date_resolver.now()
+        normalized = normalize_utterance(text)
+        words = normalized.split()
+        if not words or self._has_write_cue(words):
+            return None
+
+        window, rest = self._extract_time(normalized, now)
+        rest_words = [w for w in rest.split() if w != 'schedule']
+        if not any(w in READ_CUES for w in rest_words) and not (window and rest_words and rest_words[0] in ('anything', 'any')):
+            return None
+
+        unknown = [w for w in rest_words if w not in READ_CUES and w not in FILLER_WORDS and w not in CHORE_CUES]
+        confidence = self.CONFIDENT - self.UNKNOWN_WORD_PENALTY * len(unknown)
+
+        if any(w in CHORE_CUES for w in rest_words):
+            command = ChoresCommand(action=ChoresAction.QUERY, raw_input=text)
+            return LocalIntent(command, max(confidence, 0.0))
+
+        if window is None:
+            # "what's on my calendar?" is a read, but the LLM picks a better window
+            confidence -= self.NO_TIME_PENALTY
+            window = self.date_resolver.resolve('today', now)
+        start_time, end_time = window
+        action = CalendarAction.LIST if rest_words and rest_words[0] == 'list' else CalendarAction.READ
+        command = ProcessedCommand(
+            action=action,
+            event=CalendarEvent(summary='', description='', start_time=start_time, end_time=end_time,
+                                location='', attendees=[], reminders=None, calendar_id='family'),
+            query=text,
+            confidence=max(confidence, 0.0),
+            raw_input=text,
+            input_type=input_type
+        )
+        return LocalIntent(command, command.confidence)
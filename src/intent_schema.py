@@ -0,0 +1,88 @@
+import dataclasses
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Union, get_args, get_origin
+from .models import CalendarEvent, CalendarAction, ChoresAction, ChoresCommand, ProcessedCommand
+
+EXTRACTION_FUNCTION = 'extract_command'
+
+# CalendarEvent fields the LLM never fills in
+EVENT_FIELDS_SKIPPED = {'id', 'transparency'}
+# ChoresCommand fields set by the app, and the JSON names of the rest
+CHORE_FIELDS_SKIPPED = {'raw_input'}
+CHORE_FIELD_NAMES = {'chore_description': 'description'}
+
+REMINDERS_SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {'method': {'type': 'string', 'enum': ['popup', 'email']}, 'minutes': {'type': 'integer'}},
+        'required': ['method', 'minutes'],
+    },
+}
+
+def _json_type(annotation) -> Dict[str, Any]:
+    """JSON schema for a model field's type annotation"""
+    if get_origin(annotation) is Union:
+        return _json_type(next(arg for arg in get_args(annotation) if arg is not type(None)))
+    if get_origin(annotation) in (list, List):
+        return {'type': 'array', 'items': _json_type(get_args(annotation)[0])}
+    if annotation is datetime:
+        return {'type': 'string', 'description': 'YYYY-MM-DDTHH:MM:SS'}
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return {'type': 'string', 'enum': [member.value for member in annotation]}
+    if annotation is float:
+        return {'type': 'number'}
+    if annotation is int:
+        return {'type': 'integer'}
+    if annotation is bool:
+        return {'type': 'boolean'}
+    return {'type': 'string'}
+
+def _event_schema() -> Dict[str, Any]:
+    properties, required = {}, []
+    for name, field in CalendarEvent.model_fields.items():
+        if name in EVENT_FIELDS_SKIPPED:
+            continue
+        properties[name] = REMINDERS_SCHEMA if name == 'reminders' else _json_type(field.annotation)
+        if field.is_required():
+            required.append(name)
+    return {'type': 'object', 'properties': properties, 'required': required}
+
+def _chore_schema() -> Dict[str, Any]:
+    properties = {}
+    for field in dataclasses.fields(ChoresCommand):
+        if field.name not in CHORE_FIELDS_SKIPPED:
+            properties[CHORE_FIELD_NAMES.get(field.name, field.name)] = _json_type(field.type)
+    return {'type': 'object', 'properties': properties, 'required': ['action']}
+
+def build_extraction_tool() -> Dict[str, Any]:
+    """Function-calling tool whose arguments are the JSON NLPProcessor parses.
+
+    Generated from ProcessedCommand/CalendarEvent/ChoresCommand so the schema
+    follows the models, and kept free of descriptions: every schema token is
+    sent with each request.
+    """
+    actions = list(dict.fromkeys([a.value for a in CalendarAction] + [a.value for a in ChoresAction]))
+    parameters = {
+        'type': 'object',
+        'properties': {
+            'action': {'type': 'string', 'enum': actions},
+            'type': {'type': 'string', 'enum': ['calendar', 'chores']},
+            'events': {'type': 'array', 'items': _event_schema()},
+            'chores': {'type': 'array', 'items': _chore_schema()},
+            'query': _json_type(ProcessedCommand.model_fields['query'].annotation),
+            'confidence': _json_type(ProcessedCommand.model_fields['confidence'].annotation),
+        },
+        'required': ['action', 'type'],
+    }
+    return {
+        'type': 'function',
+        'function': {
+            'name': EXTRACTION_FUNCTION,
+            'description': 'Record the calendar or chores command',
+            'parameters': parameters,
+        },
+    }
+
+EXTRACTION_TOOL = build_extraction_tool()
@@ -0,0 +1,57 @@
+import re
+from typing import Dict, Iterable, List
+
+def trie_pattern(phrases: Iterable[str]) -> str:
+    """Regex alternation factored on shared prefixes ('add|assign' -> 'a(?:dd|ssign)').
+
+    The regex engine then checks one branch per leading character instead of
+    every phrase at every position, and the greedy optional tails still make
+    the longest phrase win. Spaces match any run of whitespace.
+    """
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [(r'\s+' if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        alternation = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{alternation})?' if '' in node else alternation
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Whole-word keyword detection for several intent tables in one regex pass.
+
+    All phrases from all tables are compiled into a single pattern at
+    construction, anchored on word boundaries so "do" no longer matches
+    inside "doctor"; the longest phrase wins ("mark as done" over "done"). A
+    trailing plural "s" is allowed, as the old substring checks implicitly
+    did ("meetings", "chores").
+    """
+
+    def __init__(self, tables: Dict[str, Iterable[str]]):
+        self.tables = {name: list(phrases) for name, phrases in tables.items()}
+        self._tables_by_phrase: Dict[str, List[str]] = {}
+        for name, phrases in self.tables.items():
+            for phrase in phrases:
+                self._tables_by_phrase.setdefault(phrase.lower(), []).append(name)
+        self._pattern = re.compile(r"\b(" + trie_pattern(self._tables_by_phrase) + r")s?\b")
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """Table name -> phrases found in the text (in order of appearance, without repeats)"""
+        hits: Dict[str, List[str]] = {}
+        for match in self._pattern.finditer(text.lower()):
+            phrase = match.group(1)
+            if phrase not in self._tables_by_phrase:
+                phrase = ' '.join(phrase.split())  # "pick  up"
+            for name in self._tables_by_phrase[phrase]:
+                found = hits.setdefault(name, [])
+                if phrase not in found:
+                    found.append(phrase)
+        return hits
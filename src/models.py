@@ -58,6 +58,7 @@ class CalendarEvent(BaseModel):
     attendees: Optional[List[str]] = None
     reminders: Optional[Dict[str, Any]] = None
     calendar_id: Optional[str] = None  # Calendar ID to create the event on
+    transparency: Optional[str] = None  # 'transparent' events don't block time in free/busy
 
 class ProcessedCommand(BaseModel):
     action: CalendarAction
@@ -88,6 +89,8 @@ class CalendarResponse(BaseModel):
     events: Optional[List[CalendarEvent]] = None
     error: Optional[str] = None
     calendars: Optional[List[Dict[str, Any]]] = None
+    calendar_timings: Optional[Dict[str, float]] = None  # Per-calendar fetch time in ms
+    free_slots: Optional[List[Dict[str, datetime]]] = None  # Free {start, end} slots for availability questions
 
 class AgentResponse(BaseModel):
     success: bool
@@ -98,6 +101,7 @@ class AgentResponse(BaseModel):
     audio_response: Optional[bytes] = None  # Audio data for voice responses
     queried_date: Optional[Any] = None  # ISO string or list of ISO strings for UI rendering
     queried_view: Optional[str] = None  # e.g. 'week', 'day', etc. for UI rendering 
+    speech_activity: Optional[Dict[str, Any]] = None  # speech found in a voice upload: durations in seconds, silence trimmed
 
 class ChoresAction(str, Enum):
     QUERY = "query"
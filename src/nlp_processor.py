@@ -1,13 +1,98 @@
 import json
+import threading
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
 from dateutil import parser
 from .config import Config
 from .models import ProcessedCommand, CalendarEvent, CalendarAction, InputType, ChoresCommand, ChoresAction
+from .intent_parser import LocalIntentParser
+from .intent_cache import IntentCache
+from .intent_schema import EXTRACTION_FUNCTION, EXTRACTION_TOOL
+from .keyword_matcher import KeywordMatcher
+from .date_resolver import WEEKDAYS, DateResolver
 import openai  # Updated import for v0.28.1
-from openai import OpenAI
+from .openai_client import get_openai_client
+
+# Keyword tables for _fallback_processing, compiled once into a single whole-word matcher
+CHORES_KEYWORDS = ['chore', 'chores', 'housework', 'task', 'tasks']
+CHORE_ACTION_KEYWORDS = {
+    'add': ['add', 'create', 'new', 'make', 'put', 'schedule'],
+    'assign': ['assign', 'pick up', 'take', 'do', 'claim'],
+    'complete': ['complete', 'done', 'finish', 'mark as done', 'mark complete'],
+    'update': ['update', 'edit', 'change', 'modify', 'rename'],
+    'remove': ['remove', 'delete', 'cancel', 'clear'],
+}
+# Checked in this order, so "add" wins when several match
+CHORE_INTENTS = [
+    ('add', ChoresAction.ADD), ('assign', ChoresAction.ASSIGN), ('complete', ChoresAction.COMPLETE),
+    ('update', ChoresAction.UPDATE), ('remove', ChoresAction.REMOVE),
+]
+CHORE_SKIP_WORDS = {
+    intent: frozenset(CHORES_KEYWORDS + keywords + ['to', 'for', 'my', 'the', 'a', 'an'])
+    for intent, keywords in CHORE_ACTION_KEYWORDS.items()
+}
+FALLBACK_KEYWORDS = KeywordMatcher({
+    'chores': CHORES_KEYWORDS,
+    **CHORE_ACTION_KEYWORDS,
+    'read': ['what', 'show', 'list', 'check', 'see', 'tell me', "what's", 'what is', 'events', 'appointments', 'meetings', 'schedule'],
+    'create': ['schedule', 'add', 'create', 'book', 'set up', 'arrange', 'plan'],
+    'relative': [
+        'this week', 'the week', 'week', 'current week', 'next week', 'last week', 'previous week', 'weekend',
+        'today', 'tomorrow', 'this month', 'current month', 'next month', 'last month', 'previous month'
+    ],
+})
+
+# Reply layout spelled out in the prompt when structured output is off
+JSON_REPLY_FORMAT = """
+Return a JSON object with this structure:
+{
+    "action": "create|read|update|delete|list|add|assign|complete|update|remove|query",
+    "type": "calendar|chores",
+    "events": [
+        {
+            "summary": "Event title",
+            "description": "Event description",
+            "start_time": "YYYY-MM-DDTHH:MM:SS",
+            "end_time": "YYYY-MM-DDTHH:MM:SS",
+            "location": "Event location",
+            "attendees": ["email1@example.com", "email2@example.com"],
+            "calendar_id": "calendar_id_or_name",
+            "reminders": [
+                {"method": "popup", "minutes": 60},
+                {"method": "email", "minutes": 1440}
+            ]
+        }
+    ],
+    "chores": [
+        {
+            "description": "Chore description",
+            "assignee": "user_email_or_name",
+            "action": "add|assign|complete|update|remove"
+        }
+    ],
+    "query": "search query for read/list actions",
+    "confidence": 0.95
+}
+"""
 
 class NLPProcessor:
     def __init__(self):
+        self.date_resolver = DateResolver()
+        # Common read-only utterances are parsed locally; the LLM only sees the rest
+        self.local_parser = LocalIntentParser(self.date_resolver) if Config.LOCAL_INTENT_ENABLED else None
+        self.local_threshold = Config.LOCAL_INTENT_THRESHOLD
+        # Repeated commands reuse the LLM's earlier result, with dates moved to today
+        self.intent_cache = IntentCache(Config.INTENT_CACHE_SIZE, Config.INTENT_CACHE_TTL) if Config.INTENT_CACHE_ENABLED else None
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'requests': 0, 'local_hits': 0, 'local_below_threshold': 0, 'cache_hits': 0, 'llm_calls': 0, 'fallbacks': 0,
+            'prompt_tokens': 0, 'cached_prompt_tokens': 0, 'completion_tokens': 0, 'malformed_replies': 0, 'truncated_replies': 0,
+        }
+        # Function calling returns the command as compact JSON matching EXTRACTION_TOOL
+        self.structured_output = Config.NLP_STRUCTURED_OUTPUT
+        self.max_tokens = Config.NLP_MAX_TOKENS
+        self._date_context_day = None
+        self._date_context_text = ''
         self.base_system_prompt = """
 You are a positive, helpful, friendly, and accommodating AI assistant that helps manage a family calendar and chores through natural language commands. You understand natural language commands and convert them into structured actions.
 
@@ -16,7 +101,7 @@ Your task is to:
 2. Extract event details (title, date/time, location, attendees, description) for calendar events
 3. Extract chore details (description, assignee) for chores
 4. Handle multiple events in a single command when requested
-5. Return a JSON response with the structured data
+5. Return the structured data
 
 CRITICAL: Distinguish between CALENDAR and CHORES commands:
 - CALENDAR keywords: calendar, schedule, appointment, meeting, event, appointment
@@ -69,36 +154,6 @@ CHORES action keywords:
 
 IMPORTANT: If the user asks about a specific date (e.g., "on July 17th", "for tomorrow", "next Friday"), ALWAYS extract and return a start_time and end_time for that date in the event object, even if the user does not use explicit date range language. Do not rely only on the query field for date-based questions.
 
-Return a JSON object with this structure:
-{
-    "action": "create|read|update|delete|list|add|assign|complete|update|remove|query",
-    "type": "calendar|chores",
-    "events": [
-        {
-            "summary": "Event title",
-            "description": "Event description",
-            "start_time": "YYYY-MM-DDTHH:MM:SS",
-            "end_time": "YYYY-MM-DDTHH:MM:SS",
-            "location": "Event location",
-            "attendees": ["email1@example.com", "email2@example.com"],
-            "calendar_id": "calendar_id_or_name",
-            "reminders": [
-                {"method": "popup", "minutes": 60},
-                {"method": "email", "minutes": 1440}
-            ]
-        }
-    ],
-    "chores": [
-        {
-            "description": "Chore description",
-            "assignee": "user_email_or_name",
-            "action": "add|assign|complete|update|remove"
-        }
-    ],
-    "query": "search query for read/list actions",
-    "confidence": 0.95
-}
-
 EXAMPLES:
 
 CALENDAR ACTIONS:
@@ -112,81 +167,136 @@ CHORES ACTIONS:
 - "What chores do I have today?" → QUERY action for chores
 - "Remove making dinner from my chores" → REMOVE action with chore description "making dinner"
 """
+        self.system_prompt = self.base_system_prompt if self.structured_output else self.base_system_prompt + JSON_REPLY_FORMAT
 
-    def _get_system_prompt_with_current_date(self) -> str:
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        current_time = datetime.now().strftime("%H:%M:%S")
-        current_weekday = datetime.now().strftime("%A")
-        today = datetime.now()
-        tomorrow = today + timedelta(days=1)
-        yesterday = today - timedelta(days=1)
-        def next_weekday(current_date, target_weekday):
-            days_ahead = target_weekday - current_date.weekday()
-            if days_ahead <= 0:
-                days_ahead += 7
-            return current_date + timedelta(days=days_ahead)
-        next_monday = next_weekday(today, 0)
-        next_tuesday = next_weekday(today, 1)
-        next_wednesday = next_weekday(today, 2)
-        next_thursday = next_weekday(today, 3)
-        next_friday = next_weekday(today, 4)
-        next_saturday = next_weekday(today, 5)
-        next_sunday = next_weekday(today, 6)
+    def _date_context(self, today: datetime) -> str:
+        """Relative-date reference for the day, built once a day and sent after the static prompt"""
+        day = today.date()
+        if self._date_context_day == day:
+            return self._date_context_text
+        table = self.date_resolver.day_table(today)
+        current_date = day.strftime("%Y-%m-%d")
+        current_weekday = day.strftime("%A")
+        # A bare weekday in a command means the next one, never today
+        weekday_dates = "\n".join(
+            f'- "{name.capitalize()}" = {table.next_weekdays[name].strftime("%Y-%m-%d")}' for name in WEEKDAYS
+        )
+        next_week_start = table.phrases['next week'][0]
         date_context = f"""
-CURRENT DATE AND TIME: {current_date} at {current_time} ({current_weekday})
+CURRENT DATE: {current_date} ({current_weekday})
 
 When resolving relative dates, use this as the reference point:
 - "today" = {current_date}
-- "tomorrow" = {tomorrow.strftime('%Y-%m-%d')}
-- "yesterday" = {yesterday.strftime('%Y-%m-%d')}
-- "next week" = {(today + timedelta(days=7)).strftime('%Y-%m-%d')}
+- "tomorrow" = {table.phrases['tomorrow'][0].strftime('%Y-%m-%d')}
+- "yesterday" = {table.phrases['yesterday'][0].strftime('%Y-%m-%d')}
+- "next week" = {next_week_start.strftime('%Y-%m-%d')} to {table.phrases['next week'][1].strftime('%Y-%m-%d')}
 
 For weekday references, use these EXACT dates:
-- "Monday" = {next_monday.strftime('%Y-%m-%d')}
-- "Tuesday" = {next_tuesday.strftime('%Y-%m-%d')}
-- "Wednesday" = {next_wednesday.strftime('%Y-%m-%d')}
-- "Thursday" = {next_thursday.strftime('%Y-%m-%d')}
-- "Friday" = {next_friday.strftime('%Y-%m-%d')}
-- "Saturday" = {next_saturday.strftime('%Y-%m-%d')}
-- "Sunday" = {next_sunday.strftime('%Y-%m-%d')}
+{weekday_dates}
 
 IMPORTANT: Use the EXACT dates listed above. Do not calculate them yourself.
 Always use the current date ({current_date}) as the reference for relative date calculations.
 
 For specific dates mentioned in queries (like "July 21st", "December 25th", etc.), parse them correctly and set the event start_time and end_time to cover the entire day (00:00:00 to 23:59:59) for that specific date.
 """
-        return self.base_system_prompt + date_context
+        self._date_context_day, self._date_context_text = day, date_context
+        return date_context
+
+    def _build_messages(self, text: str, now: datetime) -> List[Dict[str, str]]:
+        """Static instructions first so the provider can cache them, then the day's dates, then the command.
+
+        The clock time goes in the user message: anything earlier would change
+        the prefix every minute.
+        """
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "system", "content": self._date_context(now)},
+            {"role": "user", "content": f"Process this command: {text}\n(Current time: {now.strftime('%H:%M')})"}
+        ]
+
+    def _record_usage(self, usage) -> None:
+        """Add a completion's token counts to the stats; cached tokens are the reused prompt prefix"""
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        if isinstance(details, dict):
+            cached = details.get('cached_tokens') or 0
+        else:
+            cached = getattr(details, 'cached_tokens', 0) or 0
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        with self._stats_lock:
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['cached_prompt_tokens'] += cached
+            self.stats['completion_tokens'] += completion_tokens
+        share = f"{cached / prompt_tokens:.0%}" if prompt_tokens else "n/a"
+        print(f"   Tokens: prompt {prompt_tokens} (cached {cached}, {share}), completion {completion_tokens}")
+
+    def _record(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus the share of requests answered without the LLM"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['local_hit_rate'] = round(stats['local_hits'] / stats['requests'], 3) if stats['requests'] else None
+        calls = stats['llm_calls']
+        stats['avg_prompt_tokens'] = round(stats['prompt_tokens'] / calls, 1) if calls else None
+        stats['avg_cached_prompt_tokens'] = round(stats['cached_prompt_tokens'] / calls, 1) if calls else None
+        stats['cached_prompt_share'] = round(stats['cached_prompt_tokens'] / stats['prompt_tokens'], 3) if stats['prompt_tokens'] else None
+        stats['avg_completion_tokens'] = round(stats['completion_tokens'] / calls, 1) if calls else None
+        stats['fallback_rate'] = round(stats['fallbacks'] / calls, 3) if calls else None
+        if self.intent_cache:
+            stats['intent_cache'] = self.intent_cache.get_stats()
+        return stats
 
     def process_text(self, text: str, input_type: InputType) -> ProcessedCommand:
+        self._record('requests')
+        if self.local_parser:
+            local = self.local_parser.parse(text, input_type)
+            if local and local.confidence >= self.local_threshold:
+                print(f"⚡ Local intent ({local.confidence:.2f}): {local.command}")
+                self._record('local_hits')
+                return local.command
+            if local:
+                self._record('local_below_threshold')
+        now = self.date_resolver.now()
+        if self.intent_cache:
+            cached = self.intent_cache.get(text, now)
+            command = self._command_from_data(cached, text, input_type) if cached else None
+            if command is not None:
+                print(f"💾 Cached intent: {command}")
+                self._record('cache_hits')
+                return command
         try:
             print(f"🤖 Processing text: '{text}'")
-            system_prompt = self._get_system_prompt_with_current_date()
-            client = OpenAI(api_key=Config.OPENAI_API_KEY)
+            self._record('llm_calls')
+            messages = self._build_messages(text, now)
+            client = get_openai_client()
             
             # Log the request details
             print(f"📤 OpenAI Request:")
-            print(f"   Model: gpt-3.5-turbo")
+            print(f"   Model: gpt-4o")
             print(f"   Temperature: 0.1")
-            print(f"   Max tokens: 1000")
-            print(f"   System prompt length: {len(system_prompt)} chars")
+            print(f"   Max tokens: {self.max_tokens}")
+            print(f"   Structured output: {self.structured_output}")
+            print(f"   Prompt: {len(messages[0]['content'])} static + {len(messages[1]['content'])} daily + {len(messages[2]['content'])} request chars")
             
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Process this command: {text}"}
-                ],
-                temperature=0.1,
-                max_tokens=1000
-            )
+            request = dict(model="gpt-4o", messages=messages, temperature=0.1, max_tokens=self.max_tokens)
+            if self.structured_output:
+                request.update(tools=[EXTRACTION_TOOL], tool_choice={"type": "function", "function": {"name": EXTRACTION_FUNCTION}})
+            response = client.chat.completions.create(**request)
             
             # Log response details
             print(f"📥 OpenAI Response Details:")
-            # Usage and finish_reason may need to be accessed differently in v1.x
-            # print(f"   Usage: {response.usage}")
-            # print(f"   Finish reason: {response.choices[0].finish_reason}")
+            self._record_usage(getattr(response, 'usage', None))
+            choice = response.choices[0]
+            if choice.finish_reason == 'length':
+                self._record('truncated_replies')
             
-            content = response.choices[0].message.content
+            tool_calls = getattr(choice.message, 'tool_calls', None)
+            content = tool_calls[0].function.arguments if tool_calls else choice.message.content
             if content:
                 content = content.strip()
             else:
@@ -196,163 +306,40 @@ For specific dates mentioned in queries (like "July 21st", "December 25th", etc.
                 data = json.loads(content)
                 print(f"✅ Parsed JSON: {json.dumps(data, indent=2)}")
                 
-                # Check if this is a chores command
-                if data.get('type') == 'chores':
-                    chores_data = data.get('chores', [])
-                    if chores_data:
-                        chore_data = chores_data[0]
-                        # Clean up chore description by removing time/date words
-                        description = chore_data.get('description', '')
-                        time_words = ['today', 'tomorrow', 'yesterday', 'tonight', 'this week', 'next week', 'this month', 'next month']
-                        for time_word in time_words:
-                            description = description.replace(time_word, '').strip()
-                        # Clean up extra spaces
-                        description = ' '.join(description.split())
-                        
-                        return ChoresCommand(
-                            action=ChoresAction(chore_data.get('action', 'query')),
-                            chore_description=description,
-                            assignee=chore_data.get('assignee', ''),
-                            raw_input=text
-                        )
-                    else:
-                        return ChoresCommand(
-                            action=ChoresAction.QUERY,
-                            raw_input=text
-                        )
-                
-                # Handle calendar events (existing logic)
-                events_data = data.get('events', [])
-                if not events_data and data.get('event'):
-                    events_data = [data.get('event')]
-                if not events_data:
+                command = self._command_from_data(data, text, input_type)
+                if command is None:
                     return self._fallback_processing(text, input_type)
-                for event in events_data:
-                    if not event.get('calendar_id'):
-                        event['calendar_id'] = 'family'
-                event_data = events_data[0]
-                start_time = datetime.now()
-                end_time = datetime.now() + timedelta(hours=1)
-                if event_data.get('start_time'):
-                    try:
-                        start_time = parser.parse(event_data.get('start_time'))
-                    except:
-                        start_time = datetime.now()
-                if event_data.get('end_time'):
-                    try:
-                        end_time = parser.parse(event_data.get('end_time'))
-                    except:
-                        end_time = start_time + timedelta(hours=1)
-                reminders = None
-                if event_data.get('reminders'):
-                    reminders = {
-                        'useDefault': False,
-                        'overrides': event_data.get('reminders', [])
-                    }
-                event = CalendarEvent(
-                    summary=event_data.get('summary', ''),
-                    description=event_data.get('description', ''),
-                    start_time=start_time,
-                    end_time=end_time,
-                    location=event_data.get('location', ''),
-                    attendees=event_data.get('attendees', []),
-                    reminders=reminders,
-                    calendar_id=event_data.get('calendar_id')
-                )
-                result = ProcessedCommand(
-                    action=CalendarAction(data.get('action', 'read')),
-                    event=event,
-                    query=data.get('query', ''),
-                    confidence=data.get('confidence', 0.5),
-                    raw_input=text,
-                    input_type=input_type,
-                    additional_events=events_data[1:] if len(events_data) > 1 else None
-                )
-                print(f"🎯 Final Result: {result}")
-                return result
+                if self.intent_cache:
+                    self.intent_cache.put(text, data, now)
+                print(f"🎯 Final Result: {command}")
+                return command
             except json.JSONDecodeError as e:
                 print(f"❌ Failed to parse JSON: {e}")
+                self._record('malformed_replies')
                 return self._fallback_processing(text, input_type)
         except Exception as e:
             print(f"❌ Error processing text: {e}")
             return self._fallback_processing(text, input_type)
 
-    def _fallback_processing(self, text: str, input_type: InputType):
-        text_lower = text.lower()
-        now = datetime.now()
-        default_end = now + timedelta(hours=1)
-        # Chores intent detection
-        chores_keywords = ['chore', 'chores', 'housework', 'task', 'tasks']
-        assign_keywords = ['assign', 'pick up', 'take', 'do', 'claim']
-        complete_keywords = ['complete', 'done', 'finish', 'mark as done', 'mark complete']
-        add_keywords = ['add', 'create', 'new', 'make', 'put', 'schedule']
-        update_keywords = ['update', 'edit', 'change', 'modify', 'rename']
-        remove_keywords = ['remove', 'delete', 'cancel', 'clear']
-        if any(word in text_lower for word in chores_keywords):
-            if any(word in text_lower for word in add_keywords):
-                # Extract description using word-based filtering
-                words = text.split()
-                filtered_words = []
-                skip_words = set(chores_keywords + add_keywords + ['to', 'for', 'my', 'the', 'a', 'an'])
-                for word in words:
-                    if word.lower() not in skip_words:
-                        filtered_words.append(word)
-                desc = ' '.join(filtered_words).strip(' .:,')
-                return ChoresCommand(
-                    action=ChoresAction.ADD,
-                    chore_description=desc,
-                    raw_input=text
-                )
-            elif any(word in text_lower for word in assign_keywords):
-                words = text.split()
-                filtered_words = []
-                skip_words = set(chores_keywords + assign_keywords + ['to', 'for', 'my', 'the', 'a', 'an'])
-                for word in words:
-                    if word.lower() not in skip_words:
-                        filtered_words.append(word)
-                desc = ' '.join(filtered_words).strip(' .:,')
-                return ChoresCommand(
-                    action=ChoresAction.ASSIGN,
-                    chore_description=desc,
-                    raw_input=text
-                )
-            elif any(word in text_lower for word in complete_keywords):
-                words = text.split()
-                filtered_words = []
-                skip_words = set(chores_keywords + complete_keywords + ['to', 'for', 'my', 'the', 'a', 'an'])
-                for word in words:
-                    if word.lower() not in skip_words:
-                        filtered_words.append(word)
-                desc = ' '.join(filtered_words).strip(' .:,')
-                return ChoresCommand(
-                    action=ChoresAction.COMPLETE,
-                    chore_description=desc,
-                    raw_input=text
-                )
-            elif any(word in text_lower for word in update_keywords):
-                words = text.split()
-                filtered_words = []
-                skip_words = set(chores_keywords + update_keywords + ['to', 'for', 'my', 'the', 'a', 'an'])
-                for word in words:
-                    if word.lower() not in skip_words:
-                        filtered_words.append(word)
-                desc = ' '.join(filtered_words).strip(' .:,')
-                return ChoresCommand(
-                    action=ChoresAction.UPDATE,
-                    chore_description=desc,
-                    raw_input=text
-                )
-            elif any(word in text_lower for word in remove_keywords):
-                words = text.split()
-                filtered_words = []
-                skip_words = set(chores_keywords + remove_keywords + ['to', 'for', 'my', 'the', 'a', 'an'])
-                for word in words:
-                    if word.lower() not in skip_words:
-                        filtered_words.append(word)
-                desc = ' '.join(filtered_words).strip(' .:,')
+    def _command_from_data(self, data: Dict[str, Any], text: str, input_type: InputType) -> Optional[Union[ProcessedCommand, ChoresCommand]]:
+        """Build the command from the LLM's JSON; None if it names no chores or events"""
+        # Check if this is a chores command
+        if data.get('type') == 'chores':
+            chores_data = data.get('chores', [])
+            if chores_data:
+                chore_data = chores_data[0]
+                # Clean up chore description by removing time/date words
+                description = chore_data.get('description', '')
+                time_words = ['today', 'tomorrow', 'yesterday', 'tonight', 'this week', 'next week', 'this month', 'next month']
+                for time_word in time_words:
+                    description = description.replace(time_word, '').strip()
+                # Clean up extra spaces
+                description = ' '.join(description.split())
+                
                 return ChoresCommand(
-                    action=ChoresAction.REMOVE,
-                    chore_description=desc,
+                    action=ChoresAction(chore_data.get('action', 'query')),
+                    chore_description=description,
+                    assignee=chore_data.get('assignee', ''),
                     raw_input=text
                 )
             else:
@@ -360,15 +347,79 @@ For specific dates mentioned in queries (like "July 21st", "December 25th", etc.
                     action=ChoresAction.QUERY,
                     raw_input=text
                 )
+        
+        # Handle calendar events (existing logic)
+        events_data = data.get('events', [])
+        if not events_data and data.get('event'):
+            events_data = [data.get('event')]
+        if not events_data:
+            return None
+        for event in events_data:
+            if not event.get('calendar_id'):
+                event['calendar_id'] = 'family'
+        event_data = events_data[0]
+        start_time = datetime.now()
+        end_time = datetime.now() + timedelta(hours=1)
+        if event_data.get('start_time'):
+            try:
+                start_time = parser.parse(event_data.get('start_time'))
+            except:
+                start_time = datetime.now()
+        if event_data.get('end_time'):
+            try:
+                end_time = parser.parse(event_data.get('end_time'))
+            except:
+                end_time = start_time + timedelta(hours=1)
+        reminders = None
+        if event_data.get('reminders'):
+            reminders = {
+                'useDefault': False,
+                'overrides': event_data.get('reminders', [])
+            }
+        event = CalendarEvent(
+            summary=event_data.get('summary', ''),
+            description=event_data.get('description', ''),
+            start_time=start_time,
+            end_time=end_time,
+            location=event_data.get('location', ''),
+            attendees=event_data.get('attendees', []),
+            reminders=reminders,
+            calendar_id=event_data.get('calendar_id')
+        )
+        result = ProcessedCommand(
+            action=CalendarAction(data.get('action', 'read')),
+            event=event,
+            query=data.get('query', ''),
+            confidence=data.get('confidence', 0.5),
+            raw_input=text,
+            input_type=input_type,
+            additional_events=events_data[1:] if len(events_data) > 1 else None
+        )
+        return result
+
+    def _fallback_processing(self, text: str, input_type: InputType):
+        self._record('fallbacks')
+        hits = FALLBACK_KEYWORDS.matches(text)
+        now = datetime.now()
+        default_end = now + timedelta(hours=1)
+        # Chores intent detection
+        if 'chores' in hits:
+            for intent, action in CHORE_INTENTS:
+                if intent in hits:
+                    # Extract description using word-based filtering
+                    desc = ' '.join(word for word in text.split() if word.lower() not in CHORE_SKIP_WORDS[intent]).strip(' .:,')
+                    return ChoresCommand(
+                        action=action,
+                        chore_description=desc,
+                        raw_input=text
+                    )
+            return ChoresCommand(
+                action=ChoresAction.QUERY,
+                raw_input=text
+            )
         # Calendar fallback logic
-        read_keywords = ['what', 'show', 'list', 'check', 'see', 'tell me', "what's", 'what is', 'events', 'appointments', 'meetings', 'schedule']
-        create_keywords = ['schedule', 'add', 'create', 'book', 'set up', 'arrange', 'plan']
-        relative_queries = [
-            'this week', 'the week', 'week', 'current week', 'next week', 'last week', 'previous week',
-            'today', 'tomorrow', 'this month', 'current month', 'next month', 'last month', 'previous month'
-        ]
-        if any(word in text_lower for word in read_keywords):
-            if any(rel in text_lower for rel in relative_queries):
+        if 'read' in hits:
+            if 'relative' in hits:
                 # For relative queries, do not set event, only query
                 return ProcessedCommand(
                     action=CalendarAction.READ,
@@ -388,7 +439,7 @@ For specific dates mentioned in queries (like "July 21st", "December 25th", etc.
                     raw_input=text,
                     input_type=input_type
                 )
-        elif any(word in text_lower for word in create_keywords):
+        elif 'create' in hits:
             return ProcessedCommand(
                 action=CalendarAction.CREATE,
                 event=CalendarEvent(summary=text, description='', start_time=now, end_time=default_end, location='', attendees=[], reminders=None, calendar_id='family'),
@@ -405,4 +456,4 @@ For specific dates mentioned in queries (like "July 21st", "December 25th", etc.
                 confidence=0.1,
                 raw_input=text,
                 input_type=input_type
-            ) 
\ No newline at end of file
+            )
@@ -0,0 +1,49 @@
+import threading
+from typing import Optional
+import httpx
+from openai import OpenAI
+from .config import Config
+
+_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+
+def _timeout() -> httpx.Timeout:
+    # The SDK's default read timeout is 10 minutes; a stuck completion should fail (and retry) long before that
+    return httpx.Timeout(Config.OPENAI_TIMEOUT, connect=Config.OPENAI_CONNECT_TIMEOUT)
+
+def _limits() -> httpx.Limits:
+    # The SDK drops idle connections after 5s, so a family's spaced-out commands each paid a new TLS handshake
+    return httpx.Limits(
+        max_connections=Config.OPENAI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.OPENAI_HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=Config.OPENAI_HTTP_KEEPALIVE_EXPIRY
+    )
+
+def get_openai_client() -> OpenAI:
+    """Process-wide OpenAI client shared by the NLP, conversation, voice and TTS processors.
+
+    One pooled httpx client keeps TLS sessions and keep-alive connections
+    across requests and threads. Failed requests (connection errors, 408/409/
+    429/5xx) are retried OPENAI_MAX_RETRIES times with the SDK's exponential
+    backoff, honoring Retry-After.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = OpenAI(
+                    api_key=Config.OPENAI_API_KEY,
+                    base_url=Config.OPENAI_BASE_URL or None,
+                    timeout=_timeout(),
+                    max_retries=Config.OPENAI_MAX_RETRIES,
+                    http_client=httpx.Client(timeout=_timeout(), limits=_limits())
+                )
+    return _client
+
+async def close_openai_client():
+    """Close the pooled client (call on app shutdown)"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+def audio_key(text: str, voice: str, model: str, format: str) -> str:
+    """Content address of a synthesis: the same text, voice, model and format give the same audio"""
+    return hashlib.sha256('\0'.join((model, voice, format, text)).encode('utf-8')).hexdigest()
+
+class TTSCache:
+    """Two-tier cache of synthesized speech, keyed on audio_key().
+
+    The memory tier is an LRU bounded by total bytes; the disk tier keeps one
+    file per key under `directory` and, past `disk_max_bytes`, deletes the
+    least recently used files (a hit touches the file's mtime, so the order
+    survives restarts). Disk hits are promoted to memory.
+    """
+
+    def __init__(self, memory_max_bytes: int = 32 * 1024 * 1024, directory: Optional[str] = None,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        self.memory_max_bytes = memory_max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: 'OrderedDict[str, int]' = OrderedDict()  # key -> file size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                      'memory_evictions': 0, 'disk_evictions': 0, 'disk_errors': 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_disk_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.audio')
+
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.audio'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len('.audio')], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return audio
+            on_disk = key in self._disk
+        if on_disk:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    audio = f.read()
+                os.utime(self._path(key))
+            except OSError:
+                audio = None
+                with self._lock:
+                    self.stats['disk_errors'] += 1
+                    if self._disk.pop(key, None) is not None:
+                        self._disk_bytes = sum(self._disk.values())
+        with self._lock:
+            if audio is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        with self._lock:
+            self._remember(key, audio)
+            self.stats['stores'] += 1
+        if not self.directory:
+            return
+        try:
+            # Write-then-rename, so a concurrent reader never sees a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️  TTS cache write failed: {e}")
+            with self._lock:
+                self.stats['disk_errors'] += 1
+            return
+        with self._lock:
+            self._disk_bytes += len(audio) - self._disk.pop(key, 0)
+            self._disk[key] = len(audio)
+            self._evict_disk()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def _remember(self, key: str, audio: bytes):
+        """Add to the memory tier (caller holds the lock)"""
+        if len(audio) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats['memory_evictions'] += 1
+
+    def _evict_disk(self):
+        """Delete least recently used files until under disk_max_bytes (caller holds the lock)"""
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.stats['disk_evictions'] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key in self._disk:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update(memory_entries=len(self._memory), memory_bytes=self._memory_bytes,
+                         disk_entries=len(self._disk), disk_bytes=self._disk_bytes)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 3) if lookups else None
+        return stats
@@ -1,50 +1,204 @@
 import io
+import re
 import tempfile
 import os
-from typing import Optional, Tuple
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from .config import Config
+from .tts_cache import TTSCache, audio_key
 import openai
-from openai import OpenAI
+from .openai_client import get_openai_client
+
+# Sentence end: terminal punctuation (and any closing quote/bracket) followed by whitespace, or a line break
+SENTENCE_END = re.compile(r'(?<=[.!?…])["\')\]]*\s+|\n+')
+# Words whose trailing period doesn't end a sentence ("Dr. Lee", "at 2 p.m. tomorrow")
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'st', 'jr', 'sr', 'vs', 'etc', 'e.g', 'i.e', 'a.m', 'p.m', 'approx', 'appt'}
+
+class SentenceSplitter:
+    """Cuts a reply into sentences for TTS, including one arriving as streamed pieces.
+
+    feed() returns the sentences completed so far; the last, possibly
+    unfinished, one stays buffered until more text or flush().
+    """
+
+    def __init__(self):
+        self._buffer = ''
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            if match.end() == len(self._buffer) and not match.group().endswith('\n'):
+                break  # trailing space: the next piece may continue the sentence
+            candidate = self._buffer[start:match.start()].strip()
+            last_word = candidate.rsplit(None, 1)[-1].rstrip('.').lower() if candidate else ''
+            if candidate.endswith('.') and last_word in ABBREVIATIONS:
+                continue
+            if candidate:
+                sentences.append(self._buffer[start:match.end()].strip())
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        rest, self._buffer = self._buffer.strip(), ''
+        return [rest] if rest else []
+
+def split_sentences(text: str) -> List[str]:
+    splitter = SentenceSplitter()
+    return splitter.feed(text) + splitter.flush()
+
+class SpeechPipeline:
+    """Synthesizes sentences concurrently and hands their audio back in order.
+
+    Each added sentence is submitted to the shared executor straight away
+    (its worker count bounds how many TTS requests run at once); ready()
+    yields whatever has finished at the head without blocking, drain()
+    waits for the rest. Sentences whose synthesis fails are skipped.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Optional[bytes]], executor: Executor):
+        self._synthesize = synthesize
+        self._executor = executor
+        self._pending: Deque[Future] = deque()
+
+    def add(self, sentence: str):
+        self._pending.append(self._executor.submit(self._synthesize, sentence))
+
+    def ready(self) -> Iterator[bytes]:
+        while self._pending and self._pending[0].done():
+            audio = self._pending.popleft().result()
+            if audio:
+                yield audio
+
+    def drain(self) -> Iterator[bytes]:
+        while self._pending:
+            audio = self._pending.popleft().result()
+            if audio:
+                yield audio
+
+    def cancel(self):
+        """Drop sentences not yet started (the client went away)"""
+        while self._pending:
+            self._pending.popleft().cancel()
 
 class TTSProcessor:
     def __init__(self):
         self.default_voice = "nova"  # Options: alloy, echo, fable, onyx, nova, shimmer
         self.default_model = "tts-1-hd"  # Options: tts-1, tts-1-hd
+        self.default_format = "mp3"  # Options: mp3, opus, aac, flac
+        # Shared by every pipelined reply, so it bounds concurrent TTS requests process-wide
+        self._executor = ThreadPoolExecutor(max_workers=Config.TTS_PIPELINE_WORKERS, thread_name_prefix='tts')
+        # Replies repeat (canned prompts, templated answers, "Anything else?"), so audio is cached by content
+        self.cache = TTSCache(
+            memory_max_bytes=Config.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+            directory=Config.TTS_CACHE_DIR or None,
+            disk_max_bytes=Config.TTS_CACHE_DISK_MB * 1024 * 1024
+        ) if Config.TTS_CACHE_ENABLED else None
+        self.stats = {'syntheses': 0, 'characters': 0, 'failures': 0}
+        self._stats_lock = threading.Lock()  # updated from the executor threads
     
-    def text_to_speech(self, text: str, voice: str = None, model: str = None) -> Optional[bytes]:
+    def text_to_speech(self, text: str, voice: str = None, model: str = None, format: str = None) -> Optional[bytes]:
         """
         Convert text to speech using OpenAI TTS API
         Returns audio data as bytes
         """
         try:
-            if not text.strip():
+            text = text.strip()
+            if not text:
                 print("❌ TTS Error: Empty text provided")
                 return None
             
             voice = voice or self.default_voice
             model = model or self.default_model
+            format = format or self.default_format
             
-            print(f"🎤 Converting text to speech: {len(text)} characters")
-            print(f"🔊 Voice: {voice}, Model: {model}")
+            if self.cache:
+                audio_data = self.cache.get(audio_key(text, voice, model, format))
+                if audio_data is not None:
+                    print(f"🎤 TTS cache hit: {len(audio_data)} bytes")
+                    return audio_data
             
-            # Call OpenAI TTS API
-            client = OpenAI(api_key=Config.OPENAI_API_KEY)
-            response = client.audio.speech.create(
-                model=model,
-                voice=voice,
-                input=text
-            )
-            
-            # Get audio data
-            audio_data = response.content
-            print(f"✅ TTS conversion successful: {len(audio_data)} bytes")
-            
-            return audio_data
+            return self._synthesize(text, voice, model, format)
             
         except Exception as e:
             print(f"❌ TTS Error: {e}")
+            with self._stats_lock:
+                self.stats['failures'] += 1
             return None
     
+    def _synthesize(self, text: str, voice: str, model: str, format: str) -> Optional[bytes]:
+        """Call the OpenAI TTS API and cache the result"""
+        print(f"🎤 Converting text to speech: {len(text)} characters")
+        print(f"🔊 Voice: {voice}, Model: {model}")
+        
+        # Call OpenAI TTS API
+        client = get_openai_client()
+        response = client.audio.speech.create(
+            model=model,
+            voice=voice,
+            input=text,
+            response_format=format
+        )
+        
+        # Get audio data
+        audio_data = response.content
+        print(f"✅ TTS conversion successful: {len(audio_data)} bytes")
+        with self._stats_lock:
+            self.stats['syntheses'] += 1
+            self.stats['characters'] += len(text)
+        if self.cache and audio_data:
+            self.cache.put(audio_key(text, voice, model, format), audio_data)
+        
+        return audio_data
+    
+    def prewarm(self, phrases: Iterable[str], voices: Iterable[Tuple[str, str]]) -> int:
+        """
+        Synthesize canned phrases ahead of time for each (voice, model), so
+        their first use is a cache hit. Each phrase's sentences are warmed
+        too, since streamed replies are spoken sentence by sentence.
+        Returns the number of phrases synthesized (ones already cached are skipped).
+        Runs one synthesis at a time on its own thread, so it never queues
+        ahead of live replies on the shared executor.
+        """
+        if not self.cache:
+            return 0
+        texts = []
+        for phrase in phrases:
+            sentences = split_sentences(phrase)
+            for text in [phrase.strip()] + (sentences if len(sentences) > 1 else []):
+                if text and text not in texts:
+                    texts.append(text)
+        format = self.default_format
+        missing = [(text, voice, model) for voice, model in voices for text in texts
+                   if audio_key(text, voice, model, format) not in self.cache]
+        
+        def warm(job):
+            try:
+                return self._synthesize(*job, format)
+            except Exception as e:
+                print(f"❌ TTS prewarm error: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts-prewarm') as executor:
+            results = list(executor.map(warm, missing))
+        warmed = sum(1 for audio in results if audio)
+        print(f"🎤 TTS cache prewarmed: {warmed} of {len(missing)} phrases synthesized")
+        return warmed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['cache'] = self.cache.get_stats() if self.cache else None
+        return stats
+    
+    def speech_pipeline(self, voice: str = None, model: str = None) -> SpeechPipeline:
+        """Pipeline that speaks sentences as they are added, with this voice and model"""
+        return SpeechPipeline(lambda sentence: self.text_to_speech(sentence, voice, model), self._executor)
+    
     def text_to_speech_file(self, text: str, output_path: str, voice: str = None, model: str = None) -> bool:
         """
         Convert text to speech and save to file
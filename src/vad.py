@@ -0,0 +1,192 @@
+import io
+import math
+import operator
+import sys
+import wave
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Analysis window; speech energy is roughly stationary over 20-30 ms
+FRAME_MS = 30
+# Frames at least this loud count as voice whatever the noise floor: a clip that
+# is loud speech throughout has no quiet frames to measure a floor from
+LOUD_DBFS = -30.0
+# Level of digital silence (log of zero)
+SILENCE_DBFS = -100.0
+# How fast Endpointer's noise floor creeps back up after dropping to a quiet frame (~1.7 dB/s)
+FLOOR_RISE_DB = 0.05
+
+@dataclass
+class SpeechActivity:
+    """Where the speech is in a clip of 16-bit mono PCM, in samples, padding included.
+    speech_start == speech_end means no speech was found."""
+    sample_rate: int
+    samples: int
+    speech_start: int = 0
+    speech_end: int = 0
+
+    @property
+    def has_speech(self) -> bool:
+        return self.speech_end > self.speech_start
+
+    @property
+    def duration(self) -> float:
+        return self.samples / self.sample_rate
+
+    @property
+    def speech_duration(self) -> float:
+        return (self.speech_end - self.speech_start) / self.sample_rate
+
+    @property
+    def trimmed(self) -> float:
+        """Seconds of silence cut from the clip"""
+        return self.duration - self.speech_duration
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'has_speech': self.has_speech,
+            'duration': round(self.duration, 2),
+            'speech_start': round(self.speech_start / self.sample_rate, 2),
+            'speech_end': round(self.speech_end / self.sample_rate, 2),
+            'trimmed': round(self.trimmed, 2),
+        }
+
+def _samples(pcm: bytes) -> array:
+    samples = array('h')
+    samples.frombytes(pcm[:len(pcm) // 2 * 2])
+    if sys.byteorder == 'big':
+        samples.byteswap()  # s16le
+    return samples
+
+def _level(chunk: array) -> float:
+    energy = sum(map(operator.mul, chunk, chunk)) / len(chunk)
+    return 10 * math.log10(energy / 32768 ** 2) if energy else SILENCE_DBFS
+
+def _threshold(floor: float, threshold_db: float, min_level_dbfs: float) -> float:
+    return max(min_level_dbfs, min(floor + threshold_db, LOUD_DBFS))
+
+def frame_levels(pcm: bytes, sample_rate: int) -> List[float]:
+    """RMS level of each FRAME_MS frame of 16-bit mono PCM, in dBFS"""
+    samples = _samples(pcm)
+    frame = sample_rate * FRAME_MS // 1000
+    return [_level(samples[i:i + frame]) for i in range(0, len(samples), frame)]
+
+def detect_speech(pcm: bytes, sample_rate: int, threshold_db: float = 10, min_level_dbfs: float = -50,
+                  padding_ms: int = 300, min_speech_ms: int = 150) -> SpeechActivity:
+    """
+    Energy-based voice activity detection on 16-bit mono PCM.
+
+    The clip's noise floor is its 10th-percentile frame level; frames
+    `threshold_db` above it (or at least LOUD_DBFS) are voiced, and nothing
+    quieter than `min_level_dbfs` is. Speech runs from the first to the last
+    run of voiced frames lasting `min_speech_ms` (shorter bursts are taps and
+    clicks), widened by `padding_ms` on both sides for soft onsets and
+    trailing consonants.
+
+    Only a clip that is quieter than `min_level_dbfs` throughout has no
+    speech. One that is audible but has no clear speech (quiet speech close
+    to the room noise) is kept whole: trimming it could cut words.
+    """
+    activity = SpeechActivity(sample_rate, len(pcm) // 2)
+    levels = frame_levels(pcm, sample_rate)
+    if not levels:
+        return activity
+    floor = sorted(levels)[len(levels) // 10]
+    threshold = _threshold(floor, threshold_db, min_level_dbfs)
+    min_run = max(1, math.ceil(min_speech_ms / FRAME_MS))
+    first = last = None
+    run = 0
+    for i, level in enumerate(levels):
+        if level < threshold:
+            run = 0
+            continue
+        run += 1
+        if run >= min_run:
+            if first is None:
+                first = i - run + 1
+            last = i
+    if first is None:
+        if max(levels) >= min_level_dbfs:
+            activity.speech_end = activity.samples
+        return activity
+    frame = sample_rate * FRAME_MS // 1000
+    padding = sample_rate * padding_ms // 1000
+    activity.speech_start = max(0, first * frame - padding)
+    activity.speech_end = min(activity.samples, (last + 1) * frame + padding)
+    return activity
+
+class Endpointer:
+    """Voice activity detection for audio arriving in chunks (a microphone, a
+    WebSocket): says when speech starts and when it has ended, i.e. is followed
+    by `end_silence_ms` of silence.
+
+    With only the audio so far to go on, the noise floor is the quietest frame
+    seen, creeping back up by FLOOR_RISE_DB per frame so it follows a noisier
+    room; thresholds are otherwise those of detect_speech(). Use detect_speech()
+    on the whole utterance to trim it.
+    """
+
+    def __init__(self, sample_rate: int, threshold_db: float = 10, min_level_dbfs: float = -50,
+                 min_speech_ms: int = 150, end_silence_ms: int = 700):
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.min_level_dbfs = min_level_dbfs
+        self.min_run = max(1, math.ceil(min_speech_ms / FRAME_MS))
+        self.end_run = max(1, math.ceil(end_silence_ms / FRAME_MS))
+        self._frame_bytes = sample_rate * FRAME_MS // 1000 * 2
+        self._pending = b''
+        self._floor: Optional[float] = None
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.samples = 0
+        self.speech_started = False
+        self.speech_ended = False
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio fed so far"""
+        return self.samples / self.sample_rate
+
+    def feed(self, pcm: bytes) -> List[str]:
+        """Add 16-bit mono PCM; returns the events it completes: 'speech_start', 'speech_end'"""
+        events = []
+        self._pending += pcm
+        frames = len(self._pending) // self._frame_bytes
+        for i in range(frames):
+            if self.speech_ended:
+                break
+            level = _level(_samples(self._pending[i * self._frame_bytes:(i + 1) * self._frame_bytes]))
+            self.samples += self._frame_bytes // 2
+            if self._floor is None or level < self._floor:
+                self._floor = level
+            else:
+                self._floor += FLOOR_RISE_DB
+            if level >= _threshold(self._floor, self.threshold_db, self.min_level_dbfs):
+                self._voiced_run += 1
+                self._silent_run = 0
+                if not self.speech_started and self._voiced_run >= self.min_run:
+                    self.speech_started = True
+                    events.append('speech_start')
+            else:
+                self._silent_run += 1
+                self._voiced_run = 0
+                if self.speech_started and self._silent_run >= self.end_run:
+                    self.speech_ended = True
+                    events.append('speech_end')
+        self._pending = self._pending[frames * self._frame_bytes:]
+        return events
+
+def trim(pcm: bytes, activity: SpeechActivity) -> bytes:
+    """The speech part of the PCM `activity` was detected in"""
+    return pcm[activity.speech_start * 2:activity.speech_end * 2]
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV header, in memory"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
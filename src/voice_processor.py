@@ -1,65 +1,216 @@
 import speech_recognition as sr
-import io
-import wave
-import tempfile
 import os
-from typing import Optional
+import subprocess
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
 import openai  # Updated import for v0.28.1
-from pydub import AudioSegment
-from pydub.exceptions import CouldntDecodeError
 from .config import Config
 from .models import VoiceInput
-from openai import OpenAI
+from .openai_client import get_openai_client
+from .audio_pool import AudioPool, get_audio_pool
+from .vad import SpeechActivity, detect_speech, pcm_to_wav, trim
+from .voice_stream import VoiceStream
+
+# Containers the Whisper API accepts as uploaded; anything else is transcoded first
+WHISPER_FORMATS = {'flac', 'm4a', 'mp3', 'mp4', 'mpeg', 'mpga', 'oga', 'ogg', 'wav', 'webm'}
+
+def mp4_index_at_end(audio_data: bytes) -> bool:
+    """
+    True if an MP4/M4A file's index (moov box) comes after its media data, as
+    in most phone recordings. ffmpeg can't seek back for it when reading from
+    a pipe and decodes (almost) nothing, without reporting an error.
+    """
+    offset = 0
+    while offset + 8 <= len(audio_data):
+        size = int.from_bytes(audio_data[offset:offset + 4], 'big')
+        box = audio_data[offset + 4:offset + 8]
+        if box == b'moov':
+            return False
+        if box == b'mdat':
+            return True
+        if size == 1 and offset + 16 <= len(audio_data):  # 64-bit size
+            size = int.from_bytes(audio_data[offset + 8:offset + 16], 'big')
+        if size < 8:
+            break
+        offset += size
+    return False
 
 class VoiceProcessor:
-    def __init__(self):
+    def __init__(self, audio_pool: AudioPool = None):
         self.recognizer = sr.Recognizer()
         # Remove deprecated openai.api_key assignment
+        self.audio_pool = audio_pool or get_audio_pool()
+        self._stats_lock = threading.Lock()
+        self.stats = {'clips': 0, 'silent_clips': 0, 'audio_seconds': 0.0, 'trimmed_seconds': 0.0}
     
-    def convert_to_wav(self, audio_data: bytes, input_format: str = "wav") -> bytes:
+    def transcode(self, audio_data: bytes, input_format: str, output_format: str = "flac",
+                  options: Sequence[str] = (), input_options: Sequence[str] = ()) -> bytes:
         """
-        Convert audio data to WAV format
+        Transcode audio in memory by piping it through ffmpeg's stdin and stdout
+        (no temp files); ffmpeg probes the input container itself unless
+        `input_options` describe it (raw PCM). `options` are extra output
+        options (channels, sample rate, codec)
         """
+        print(f"🔄 Transcoding {len(audio_data)} bytes from {input_format} to {output_format}...")
+        source, stdin_data, pass_fds, memfd = 'pipe:0', audio_data, (), None
+        if self._needs_seekable_input(audio_data, input_format):
+            # ffmpeg must seek to the index at the end: hand it an in-memory file instead of a pipe
+            memfd = os.memfd_create('upload')
+            with open(memfd, 'wb', closefd=False) as f:
+                f.write(audio_data)
+            source, stdin_data, pass_fds = f'/proc/self/fd/{memfd}', b'', (memfd,)
+        command = [
+            Config.FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-nostdin',
+             *input_options, '-i', source, '-vn', *options, '-f', output_format, 'pipe:1'
+        ]
+        kind = 'decode' if output_format == 's16le' else 'encode' if input_format == 's16le' else 'transcode'
         try:
-            print(f"🔄 Converting {len(audio_data)} bytes from {input_format} to WAV...")
-            
-            # If already WAV, return as is
-            if input_format.lower() == "wav":
-                print("✅ Already WAV format, returning as-is")
-                return audio_data
-            
-            # Create a temporary file for the input audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{input_format}") as temp_input:
-                temp_input.write(audio_data)
-                temp_input_path = temp_input.name
-                print(f"📁 Created temp file: {temp_input_path}")
-            
-            # Load audio using pydub
-            print(f"🎵 Loading audio with pydub...")
-            audio = AudioSegment.from_file(temp_input_path, format=input_format)
-            print(f"✅ Audio loaded: {len(audio)}ms duration")
-            
-            # Export as WAV
-            print("🔄 Exporting to WAV...")
-            wav_data = io.BytesIO()
-            audio.export(wav_data, format="wav")
-            wav_bytes = wav_data.getvalue()
-            print(f"✅ WAV export complete: {len(wav_bytes)} bytes")
-            
-            # Clean up temporary file
-            os.unlink(temp_input_path)
-            print(f"🗑️  Cleaned up temp file: {temp_input_path}")
-            
-            return wav_bytes
-            
-        except CouldntDecodeError as e:
-            print(f"❌ Error decoding audio format {input_format}: {e}")
+            result = self.audio_pool.run(kind, lambda: subprocess.run(
+                command, input=stdin_data, capture_output=True, timeout=Config.FFMPEG_TIMEOUT, pass_fds=pass_fds
+            ))
+        except FileNotFoundError:
+            raise RuntimeError(f"ffmpeg not found ({Config.FFMPEG_BINARY}); it is needed to convert {input_format} audio")
+        except subprocess.TimeoutExpired:
+            raise ValueError(f"Timed out converting {input_format} audio")
+        finally:
+            if memfd is not None:
+                os.close(memfd)
+        if result.returncode != 0 or not result.stdout:
+            error = result.stderr.decode('utf-8', 'replace').strip()
+            print(f"❌ Error decoding audio format {input_format}: {error}")
             raise ValueError(f"Unsupported audio format: {input_format}")
-        except Exception as e:
-            print(f"❌ Error converting audio to WAV: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
+        print(f"✅ Transcoded: {len(result.stdout)} bytes")
+        return result.stdout
+    
+    @staticmethod
+    def _needs_seekable_input(audio_data: bytes, format: str) -> bool:
+        return format in ('m4a', 'mp4') and mp4_index_at_end(audio_data)
+    
+    @staticmethod
+    def can_transcode(audio_data: bytes, format: str) -> bool:
+        """False for m4a with its index at the end where no in-memory file is available (memfd is Linux-only)"""
+        return hasattr(os, 'memfd_create') or not VoiceProcessor._needs_seekable_input(audio_data, format)
+    
+    def normalize_for_transcription(self, audio_data: bytes, format: str) -> Tuple[bytes, str]:
+        """
+        Downmix to mono, resample to 16 kHz (the rate Whisper works at anyway)
+        and encode as Opus in Ogg, which makes the upload several times smaller
+        than the phone's AAC and far smaller than WAV. Returns (audio, format).
+
+        If conversion isn't possible (see can_transcode), fails or doesn't
+        shrink the audio, the original is returned when Whisper accepts it
+        as is.
+        """
+        if not self.can_transcode(audio_data, format) and format in WHISPER_FORMATS:
+            print(f"⚠️  Uploading original {format}: its index is after the media data")
+            return audio_data, format
+        try:
+            normalized = self.transcode(audio_data, format, "ogg", self._opus_options())
+        except (RuntimeError, ValueError) as e:
+            if format not in WHISPER_FORMATS:
+                raise
+            print(f"⚠️  Uploading original {format}: {e}")
+            return audio_data, format
+        if len(normalized) >= len(audio_data) and format in WHISPER_FORMATS:
+            return audio_data, format
+        print(f"✅ Normalized for transcription: {len(audio_data)} -> {len(normalized)} bytes")
+        return normalized, "ogg"
+    
+    @staticmethod
+    def _opus_options() -> list:
+        return [
+            '-ac', '1', '-ar', str(Config.TRANSCRIBE_SAMPLE_RATE),
+            '-c:a', 'libopus', '-b:a', Config.TRANSCRIBE_BITRATE, '-application', 'voip',
+            '-compression_level', str(Config.TRANSCRIBE_OPUS_COMPLEXITY)
+        ]
+    
+    def decode_pcm(self, audio_data: bytes, format: str) -> bytes:
+        """Decode to 16-bit mono PCM at TRANSCRIBE_SAMPLE_RATE, for voice activity detection"""
+        return self.transcode(audio_data, format, "s16le", ['-ac', '1', '-ar', str(Config.TRANSCRIBE_SAMPLE_RATE)])
+    
+    def encode_pcm(self, pcm: bytes, sample_rate: int = None) -> Tuple[bytes, str]:
+        """
+        Upload for 16-bit mono PCM: Opus when normalization is on and the clip
+        is worth another ffmpeg run, else WAV built in memory. Returns (audio, format).
+        """
+        sample_rate = sample_rate or Config.TRANSCRIBE_SAMPLE_RATE
+        if Config.TRANSCRIBE_NORMALIZE and len(pcm) >= Config.TRANSCRIBE_NORMALIZE_MIN_BYTES:
+            try:
+                return self.transcode(pcm, "s16le", "ogg", self._opus_options(),
+                                      input_options=['-f', 's16le', '-ar', str(sample_rate), '-ac', '1']), "ogg"
+            except (RuntimeError, ValueError) as e:
+                print(f"⚠️  Uploading trimmed audio as WAV: {e}")
+        return pcm_to_wav(pcm, sample_rate), "wav"
+    
+    def detect_speech(self, pcm: bytes, sample_rate: int = None) -> SpeechActivity:
+        """Voice activity in 16-bit mono PCM with the configured VAD thresholds, counted in get_stats()"""
+        activity = self.audio_pool.run(
+            'vad', detect_speech, pcm, sample_rate or Config.TRANSCRIBE_SAMPLE_RATE, Config.VAD_THRESHOLD_DB,
+            Config.VAD_MIN_LEVEL_DBFS, Config.VAD_PADDING_MS, Config.VAD_MIN_SPEECH_MS, cpu=True
+        )
+        self._record_activity(activity)
+        return activity
+    
+    def prepare_for_transcription(self, audio_data: bytes, format: str) -> Tuple[bytes, str, Optional[SpeechActivity]]:
+        """
+        What to upload to Whisper for a clip: (audio, format, speech activity).
+
+        With VAD_ENABLED the clip is decoded once to mono PCM, leading and
+        trailing silence is cut and the rest re-encoded (see encode_pcm); a
+        clip that is silent throughout comes back empty and is never uploaded.
+        If VAD is off or the clip can't be decoded, it is normalized as before
+        and no activity is reported.
+        """
+        format = format.lower()
+        if Config.VAD_ENABLED and self.can_transcode(audio_data, format):
+            try:
+                pcm = self.decode_pcm(audio_data, format)
+            except (RuntimeError, ValueError) as e:
+                print(f"⚠️  Skipping voice activity detection: {e}")
+            else:
+                activity = self.detect_speech(pcm)
+                if not activity.has_speech:
+                    return b'', format, activity
+                upload, upload_format = self.encode_pcm(trim(pcm, activity))
+                # Nothing cut and no smaller: the original is as good
+                if not activity.trimmed and len(upload) >= len(audio_data) and format in WHISPER_FORMATS:
+                    return audio_data, format, activity
+                return upload, upload_format, activity
+        
+        # Shrink the upload to 16 kHz mono Opus; small clips Whisper accepts go as they are,
+        # since spawning ffmpeg would cost more than the bytes saved
+        if Config.TRANSCRIBE_NORMALIZE and (len(audio_data) >= Config.TRANSCRIBE_NORMALIZE_MIN_BYTES
+                                            or format not in WHISPER_FORMATS):
+            audio_data, format = self.normalize_for_transcription(audio_data, format)
+        elif format not in WHISPER_FORMATS:
+            audio_data = self.transcode(audio_data, format, "flac")
+            format = "flac"
+        return audio_data, format, None
+    
+    def _record_activity(self, activity: SpeechActivity):
+        print(f"✂️  Speech {activity.speech_duration:.2f}s of {activity.duration:.2f}s, trimmed {activity.trimmed:.2f}s")
+        with self._stats_lock:
+            self.stats['clips'] += 1
+            self.stats['silent_clips'] += not activity.has_speech
+            self.stats['audio_seconds'] += activity.duration
+            self.stats['trimmed_seconds'] += activity.trimmed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['audio_seconds'] = round(stats['audio_seconds'], 2)
+        stats['trimmed_seconds'] = round(stats['trimmed_seconds'], 2)
+        return stats
+    
+    def convert_to_wav(self, audio_data: bytes, input_format: str = "wav") -> bytes:
+        """
+        Convert audio data to WAV format
+        """
+        # If already WAV, return as is
+        if input_format.lower() == "wav":
+            print("✅ Already WAV format, returning as-is")
+            return audio_data
+        return self.transcode(audio_data, input_format, "wav")
     
     def detect_audio_format(self, audio_data: bytes, filename: str = "") -> str:
         """
@@ -71,7 +222,7 @@ class VoiceProcessor:
         if filename:
             ext = filename.lower().split('.')[-1] if '.' in filename else ""
             print(f"📄 File extension from filename: '{ext}'")
-            if ext in ['wav', 'mp3', 'm4a', 'aac', 'ogg', 'flac', 'wma']:
+            if ext in ['wav', 'mp3', 'm4a', 'mp4', 'aac', 'ogg', 'oga', 'flac', 'webm', 'wma']:
                 print(f"✅ Detected format from filename: {ext}")
                 return ext
         
@@ -88,8 +239,8 @@ class VoiceProcessor:
             elif audio_data[:3] == b'ID3' or audio_data[:2] == b'\xff\xfb':
                 print("✅ Detected MP3 from signature")
                 return 'mp3'
-            # M4A signature
-            elif signature == b'ftyp':
+            # M4A signature (the ftyp box follows its 4-byte size)
+            elif audio_data[4:8] == b'ftyp':
                 print("✅ Detected M4A from signature")
                 return 'm4a'
             # OGG signature
@@ -100,6 +251,10 @@ class VoiceProcessor:
             elif signature == b'fLaC':
                 print("✅ Detected FLAC from signature")
                 return 'flac'
+            # WebM (EBML) signature, as recorded by browsers
+            elif signature == b'\x1a\x45\xdf\xa3':
+                print("✅ Detected WebM from signature")
+                return 'webm'
         else:
             print(f"⚠️  File too small for signature detection: {len(audio_data)} bytes")
         
@@ -111,59 +266,76 @@ class VoiceProcessor:
         """
         Process audio file and convert to text using OpenAI Whisper API
         """
+        return self.transcribe(audio_data, format)[0]
+    
+    def transcribe(self, audio_data: bytes, format: str = "wav") -> Tuple[Optional[str], Optional[SpeechActivity]]:
+        """
+        Transcribe a clip with Whisper, also returning the speech activity found
+        in it (None when VAD didn't run). Clips without speech aren't sent to
+        the API and transcribe to None.
+        """
+        activity = None
         try:
             print(f"🔍 Processing audio: {len(audio_data)} bytes, format: {format}")
             
             # Check if audio data is empty
             if len(audio_data) == 0:
                 print("❌ Error: Empty audio data received")
-                return None
-            
-            # Convert audio to WAV format if needed
-            wav_data = self.convert_to_wav(audio_data, format)
-            print(f"✅ Converted to WAV: {len(wav_data)} bytes")
+                return None, None
             
-            # Create a temporary file to store the WAV audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-                temp_file.write(wav_data)
-                temp_file_path = temp_file.name
+            audio_data, format, activity = self.prepare_for_transcription(audio_data, format)
+            if activity is not None and not activity.has_speech:
+                print("🔇 No speech detected, not transcribing")
+                return None, activity
             
-            # Use OpenAI Whisper API for transcription
-            client = OpenAI(api_key=Config.OPENAI_API_KEY)
-            with open(temp_file_path, "rb") as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-            
-            print(f"🎤 Transcription result: '{transcript}'")
-            return str(transcript)
+            return self._whisper(audio_data, format), activity
             
         except Exception as e:
             print(f"❌ Error processing audio: {e}")
-            return None
+            return None, activity
+    
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = None) -> Tuple[Optional[str], Optional[SpeechActivity]]:
+        """
+        Transcribe 16-bit mono PCM (an utterance captured by a VoiceStream):
+        silence is trimmed and a clip without speech isn't sent, as in transcribe()
+        """
+        activity = None
+        try:
+            activity = self.detect_speech(pcm, sample_rate)
+            if not activity.has_speech:
+                print("🔇 No speech detected, not transcribing")
+                return None, activity
+            return self._whisper(*self.encode_pcm(trim(pcm, activity), sample_rate)), activity
+        except Exception as e:
+            print(f"❌ Error processing audio: {e}")
+            return None, activity
+    
+    def _whisper(self, audio_data: bytes, format: str) -> str:
+        # Use OpenAI Whisper API for transcription (uploaded from memory; the extension names the format)
+        client = get_openai_client()
+        transcript = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(f"voice_command.{format}", audio_data),
+            response_format="text"
+        )
+        
+        print(f"🎤 Transcription result: '{transcript}'")
+        return str(transcript)
     
     def record_from_microphone(self, duration: int = 5) -> Optional[str]:
         """
-        Record audio from microphone and convert to text
+        Record audio from microphone and convert to text. Recording stops as
+        soon as the speaker does (or after `duration` seconds), so there's no
+        fixed listening window or ambient-noise calibration to wait out
         """
         try:
-            with sr.Microphone() as source:
+            with sr.Microphone(sample_rate=Config.TRANSCRIBE_SAMPLE_RATE) as source:
                 print("Listening... Speak now!")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                audio = self.recognizer.listen(source, timeout=duration, phrase_time_limit=duration)
-                
-                # Convert to text using OpenAI Whisper
-                audio_data = audio.get_wav_data()
-                return self.process_audio_file(audio_data, "wav")
+                stream = VoiceStream(self, "pcm", source.SAMPLE_RATE, max_seconds=duration)
+                while not stream.ended:
+                    stream.feed(source.stream.read(source.CHUNK))
+                return stream.finish()[0]
                 
-        except sr.WaitTimeoutError:
-            print("No speech detected within timeout period")
-            return None
         except Exception as e:
             print(f"Error recording audio: {e}")
             return None
@@ -0,0 +1,178 @@
+import subprocess
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .config import Config
+from .vad import Endpointer, SpeechActivity
+
+# Raw 16-bit little-endian mono PCM, as an AudioWorklet or a microphone gives it;
+# anything else (webm, ogg, ... from MediaRecorder) is decoded by ffmpeg as it arrives
+PCM_FORMATS = {'pcm', 's16le'}
+# Sample rates accepted for raw PCM, in Hz (narrowband telephony up to 48 kHz)
+MIN_SAMPLE_RATE, MAX_SAMPLE_RATE = 8000, 48000
+
+class PCMDecoder:
+    """A long-running ffmpeg decoding a container streamed to it in chunks into
+    16-bit mono PCM as the chunks arrive; the PCM is handed to `on_pcm` from a
+    reader thread."""
+
+    def __init__(self, sample_rate: int, on_pcm: Callable[[bytes], None]):
+        command = [
+            Config.FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-nostdin',
+            # Decode from the first bytes rather than buffering input to probe it
+            '-probesize', '32', '-analyzeduration', '0', '-fflags', 'nobuffer',
+            '-i', 'pipe:0', '-vn', '-ac', '1', '-ar', str(sample_rate), '-f', 's16le', 'pipe:1'
+        ]
+        try:
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            raise RuntimeError(f"ffmpeg not found ({Config.FFMPEG_BINARY}); it is needed to decode streamed audio")
+        self._on_pcm = on_pcm
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        while True:
+            pcm = self._process.stdout.read1(65536)
+            if not pcm:
+                break
+            self._on_pcm(pcm)
+
+    @property
+    def running(self) -> bool:
+        return self._process.poll() is None
+
+    @property
+    def failed(self) -> bool:
+        return self._process.returncode not in (None, 0)
+
+    def write(self, chunk: bytes):
+        try:
+            self._process.stdin.write(chunk)
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg has exited (bad input, or killed); see running/failed
+
+    def close(self):
+        """Decode what's left of the input and wait for it"""
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join(Config.FFMPEG_TIMEOUT)
+        try:
+            self._process.wait(Config.FFMPEG_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        """Stop decoding; anything not decoded yet is dropped"""
+        if self.running:
+            self._process.kill()
+        self._process.wait()
+        self._reader.join()
+
+class VoiceStream:
+    """One utterance streamed in chunks (WebSocket binary frames, a microphone).
+
+    Audio is endpointed as it arrives, so the utterance can be transcribed
+    the moment the speaker stops instead of after the whole clip has been
+    recorded and uploaded. It ends when speech is followed by
+    VOICE_STREAM_END_SILENCE_MS of silence ('silence'), when nobody has
+    started speaking within VOICE_STREAM_NO_SPEECH_SECONDS ('no_speech'),
+    after `max_seconds` ('max_duration'), when the client says it's done
+    ('client') or when a container can't be decoded ('error'). Raises
+    ValueError for a PCM sample rate outside MIN_SAMPLE_RATE..MAX_SAMPLE_RATE.
+    """
+
+    def __init__(self, voice_processor, format: str = "pcm", sample_rate: int = None, max_seconds: float = None):
+        self.voice_processor = voice_processor
+        self.format = format.lower()
+        # Rate of raw PCM as sent; containers are decoded to the transcription rate
+        if self.format in PCM_FORMATS and sample_rate is not None:
+            if (not isinstance(sample_rate, int) or isinstance(sample_rate, bool)
+                    or not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE):
+                raise ValueError(f"sample_rate must be a whole number of Hz from {MIN_SAMPLE_RATE} to "
+                                 f"{MAX_SAMPLE_RATE}, not {sample_rate!r}")
+            self.sample_rate = sample_rate
+        else:
+            self.sample_rate = Config.TRANSCRIBE_SAMPLE_RATE
+        self.max_seconds = max_seconds or Config.VOICE_STREAM_MAX_SECONDS
+        self.no_speech_seconds = min(Config.VOICE_STREAM_NO_SPEECH_SECONDS, self.max_seconds)
+        self.endpointer = Endpointer(self.sample_rate, Config.VAD_THRESHOLD_DB, Config.VAD_MIN_LEVEL_DBFS,
+                                     Config.VAD_MIN_SPEECH_MS, Config.VOICE_STREAM_END_SILENCE_MS)
+        self.end_reason: Optional[str] = None
+        self._pcm: List[bytes] = []
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._decoder = None if self.format in PCM_FORMATS else PCMDecoder(self.sample_rate, self._add_pcm)
+
+    @property
+    def ended(self) -> bool:
+        return self.end_reason is not None
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Add a chunk of audio. Returns the events since the last call:
+        {'type': 'speech_start'} and {'type': 'speech_end', 'reason': ..., 'duration': seconds}"""
+        if not self.ended:
+            if self._decoder is None:
+                self._add_pcm(chunk)
+            elif self._decoder.running:
+                self._decoder.write(chunk)
+            else:
+                with self._lock:
+                    self._end('error')
+        return self._take_events()
+
+    def end(self) -> List[Dict[str, Any]]:
+        """The client has stopped sending; returns the remaining events"""
+        if self._decoder is not None and not self.ended:
+            self._decoder.close()  # the rest of the audio may still end the utterance by itself
+        with self._lock:
+            self._end('client')
+        return self._take_events()
+
+    def finish(self) -> Tuple[Optional[str], Optional[SpeechActivity]]:
+        """Transcribe the utterance (see VoiceProcessor.transcribe_pcm), ending the stream if it hasn't"""
+        if not self.ended:
+            self.end()
+        self.close()
+        with self._lock:
+            pcm = b''.join(self._pcm)
+        if not pcm and self._decoder is not None and self._decoder.failed:
+            print(f"❌ Could not decode streamed {self.format} audio")
+            return None, None
+        return self.voice_processor.transcribe_pcm(pcm, self.sample_rate)
+
+    def close(self):
+        if self._decoder is not None:
+            self._decoder.kill()
+
+    def _add_pcm(self, pcm: bytes):
+        with self._lock:
+            if self.ended:
+                return
+            self._pcm.append(pcm)
+            for event in self.endpointer.feed(pcm):
+                if event == 'speech_start':
+                    self._events.append({'type': 'speech_start'})
+                else:
+                    self._end('silence')
+            if self.ended:
+                return
+            if not self.endpointer.speech_started and self.endpointer.duration >= self.no_speech_seconds:
+                self._end('no_speech')
+            elif self.endpointer.duration >= self.max_seconds:
+                self._end('max_duration')
+
+    def _end(self, reason: str):
+        """Caller holds the lock"""
+        if self.end_reason is None:
+            self.end_reason = reason
+            self._events.append({'type': 'speech_end', 'reason': reason,
+                                 'duration': round(self.endpointer.duration, 2)})
+
+    def _take_events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            events, self._events = self._events, []
+        return events
@@ -5,7 +5,7 @@ Test script for audio conversion functionality
 
 import os
 import tempfile
-from src.voice_processor import VoiceProcessor
+from src.voice_processor import VoiceProcessor, mp4_index_at_end
 
 def test_audio_conversion():
     """Test audio conversion functionality"""
@@ -37,6 +37,25 @@ def test_real_m4a():
     except Exception as e:
         print(f"M4A to WAV conversion failed: {e}")
 
+def test_normalize_for_transcription():
+    """Test shrinking a real M4A to 16 kHz mono Opus for Whisper"""
+    processor = VoiceProcessor()
+    m4a_path = "./test_audio.m4a"
+    if not os.path.exists(m4a_path):
+        print(f"Test M4A file not found: {m4a_path}")
+        return
+    with open(m4a_path, "rb") as f:
+        m4a_data = f.read()
+    # moov after mdat, as phones write it
+    ftyp = b'\x00\x00\x00\x0cftypM4A '
+    assert mp4_index_at_end(ftyp + b'\x00\x00\x00\x10mdat' + b'\x00' * 8 + b'\x00\x00\x00\x08moov')
+    assert not mp4_index_at_end(ftyp + b'\x00\x00\x00\x08moov\x00\x00\x00\x08mdat')
+    normalized, format = processor.normalize_for_transcription(m4a_data, "m4a")
+    print(f"Normalized {len(m4a_data)} bytes of m4a to {len(normalized)} bytes of {format}")
+    if format == "ogg":
+        assert normalized.startswith(b'OggS') and len(normalized) < len(m4a_data)
+
 if __name__ == "__main__":
     test_audio_conversion()
-    test_real_m4a() 
\ No newline at end of file
+    test_real_m4a()
+    test_normalize_for_transcription() 
\ No newline at end of file
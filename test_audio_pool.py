@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the bounded audio job pool: concurrency limit, worker processes for
+pure-Python jobs, and its queue and timing metrics
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.audio_pool import AudioPool
+from src.vad import detect_speech
+from test_vad import RATE, clip, noise, tone
+
+def test_bounded():
+    print("1. At most `workers` jobs at once")
+    pool = AudioPool(workers=2, processes=False)
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def job():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    with ThreadPoolExecutor(max_workers=6) as threads:
+        list(threads.map(lambda _: pool.run('decode', job), range(6)))
+    stats = pool.get_stats()
+    print(f"  {stats}")
+    assert peak == 2
+    assert stats['active'] == 0 and stats['queued'] == 0 and stats['peak_queued'] >= 4
+    decode = stats['jobs']['decode']
+    assert decode['count'] == 6 and decode['errors'] == 0
+    assert decode['avg_run_ms'] >= 45 and decode['avg_wait_ms'] > 0  # later jobs waited their turn
+    print("  ✅ ok")
+
+def test_errors():
+    print("2. Failed jobs are counted and re-raised")
+    pool = AudioPool(workers=1, processes=False)
+    try:
+        pool.run('encode', lambda: 1 / 0)
+        raise AssertionError("expected ZeroDivisionError")
+    except ZeroDivisionError:
+        pass
+    assert pool.get_stats()['jobs']['encode']['errors'] == 1
+    pool.run('encode', lambda: None)  # the slot was released
+    print("  ✅ ok")
+
+def test_processes():
+    print("3. Pure-Python jobs in worker processes")
+    pool = AudioPool(workers=2)
+    try:
+        started = time.perf_counter()
+        print(f"  {pool.warm_up()} workers started in {(time.perf_counter() - started) * 1000:.0f} ms")
+        assert pool.run('pid', os.getpid, cpu=True) != os.getpid()
+        pcm = clip(noise(1.0), tone(1.0), noise(1.0))
+        activity = pool.run('vad', detect_speech, pcm, RATE, cpu=True)
+        assert activity == detect_speech(pcm, RATE)
+        print(f"  {pool.get_stats()['jobs']}")
+    finally:
+        pool.shutdown()
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the audio job pool")
+    print("=" * 50)
+    test_bounded()
+    test_errors()
+    test_processes()
+    print("\n✅ All audio pool tests passed!")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test calendar name resolution: exact names and aliases only, never a near miss
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.calendar_registry import CalendarRegistry
+
+CALENDARS = [
+    {'id': 'me@example.com', 'summary': 'Me', 'primary': True},
+    {'id': 'family@group.calendar.google.com', 'summary': 'Family'},
+    {'id': 'soccer@group.calendar.google.com', 'summary': "Samantha's Soccer"},
+]
+
+def test_exact_names():
+    print("1. Names and aliases, ignoring case and punctuation")
+    registry = CalendarRegistry(lambda: CALENDARS)
+    for name, calendar_id in [
+        ('family', 'family@group.calendar.google.com'),
+        ('Shared Family', 'family@group.calendar.google.com'),
+        ('shared_family', 'family@group.calendar.google.com'),
+        ("samantha's soccer", 'soccer@group.calendar.google.com'),
+        ('SAMANTHA’S SOCCER', 'soccer@group.calendar.google.com'),
+        ('work', 'me@example.com'),
+        ('primary', 'me@example.com'),
+        ('soccer@group.calendar.google.com', 'soccer@group.calendar.google.com'),
+    ]:
+        assert registry.resolve(name) == calendar_id, name
+    print("  ✅ ok")
+
+def test_no_guessing():
+    print("2. Near misses are not resolved to some other calendar")
+    registry = CalendarRegistry(lambda: CALENDARS)
+    for name in ['Sam', 'soccer', 'homework', 'work stuff', 'families', 'unknown@group.calendar.google.com']:
+        print(f"  {name!r} -> {registry.resolve(name)!r}")
+        assert registry.resolve(name) == name, name
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing calendar name resolution")
+    print("=" * 50)
+    test_exact_names()
+    test_no_guessing()
+    print("\n✅ All calendar registry tests passed!")
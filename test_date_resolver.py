@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the shared date resolver used by the NLP prompt, the agent's date queries,
+the conversation manager and the local intent parser
+"""
+
+import sys
+import os
+from datetime import date, datetime
+from dateutil import tz
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.date_resolver import CHICAGO_TZ, DateResolver, build_day_table
+
+# Saturday afternoon
+NOW = datetime(2026, 10, 17, 15, 0, tzinfo=CHICAGO_TZ)
+
+# phrase -> (first day, last day) resolved against NOW
+CORPUS = {
+    "what's on today": (date(2026, 10, 17), date(2026, 10, 17)),
+    "tomorrow's schedule": (date(2026, 10, 18), date(2026, 10, 18)),
+    "the day after tomorrow": (date(2026, 10, 19), date(2026, 10, 19)),
+    "what happened yesterday": (date(2026, 10, 16), date(2026, 10, 16)),
+    "show me this week": (date(2026, 10, 12), date(2026, 10, 18)),
+    "my week": (date(2026, 10, 12), date(2026, 10, 18)),
+    "show me next week": (date(2026, 10, 19), date(2026, 10, 25)),
+    "last week": (date(2026, 10, 5), date(2026, 10, 11)),
+    "the week after next": (date(2026, 10, 26), date(2026, 11, 1)),
+    "this weekend": (date(2026, 10, 17), date(2026, 10, 18)),
+    "plans for next weekend": (date(2026, 10, 24), date(2026, 10, 25)),
+    "this month": (date(2026, 10, 1), date(2026, 10, 31)),
+    "next month": (date(2026, 11, 1), date(2026, 11, 30)),
+    "last month": (date(2026, 9, 1), date(2026, 9, 30)),
+    "in two weeks": (date(2026, 10, 26), date(2026, 11, 1)),
+    "in 3 days": (date(2026, 10, 20), date(2026, 10, 20)),
+    "a month from now": (date(2026, 11, 1), date(2026, 11, 30)),
+    "the 21st": (date(2026, 10, 21), date(2026, 10, 21)),
+    "on the 3rd": (date(2026, 11, 3), date(2026, 11, 3)),
+    "the 17th": (date(2026, 10, 17), date(2026, 10, 17)),
+    "the 31st": (date(2026, 10, 31), date(2026, 10, 31)),
+    "July 21st": (date(2027, 7, 21), date(2027, 7, 21)),
+    "dec 25": (date(2026, 12, 25), date(2026, 12, 25)),
+    "the 4th of july": (date(2027, 7, 4), date(2027, 7, 4)),
+    "on Wednesday": (date(2026, 10, 21), date(2026, 10, 21)),
+    "next Wednesday": (date(2026, 10, 21), date(2026, 10, 21)),
+    "saturday": (date(2026, 10, 17), date(2026, 10, 17)),
+    "next saturday": (date(2026, 10, 24), date(2026, 10, 24)),
+    "last friday": (date(2026, 10, 16), date(2026, 10, 16)),
+}
+
+NO_DATE = ["what's on my calendar", "a weekly meeting", "the 40th", "soccer practice"]
+
+def test_corpus():
+    print("1. Relative phrases")
+    resolver = DateResolver()
+    for text, (first_day, last_day) in CORPUS.items():
+        start, end = resolver.resolve(text, NOW)
+        print(f"  {text!r:28} -> {start:%a %Y-%m-%d} .. {end:%a %Y-%m-%d}")
+        assert (start.date(), end.date()) == (first_day, last_day), text
+        assert start.tzinfo is CHICAGO_TZ and (start.hour, end.hour) == (0, 23)
+    for text in NO_DATE:
+        assert resolver.resolve(text, NOW) is None, text
+    print("  ✅ ok")
+
+def test_tonight():
+    print("2. Tonight")
+    start, end = DateResolver().resolve("what's on tonight", NOW)
+    assert (start.date(), start.hour, end.date()) == (date(2026, 10, 17), 17, date(2026, 10, 17))
+    print("  ✅ ok")
+
+def test_day_table():
+    print("3. Per-day table")
+    build_day_table.cache_clear()
+    resolver = DateResolver()
+    for text in CORPUS:
+        resolver.resolve(text, NOW)
+    info = build_day_table.cache_info()
+    print(f"  {info}")
+    assert info.misses == 1, "the table should be built once per day"
+    # 01:30 UTC on Sunday is still Saturday evening in Chicago
+    start, _ = resolver.resolve("today", datetime(2026, 10, 18, 1, 30, tzinfo=tz.UTC))
+    assert start.date() == date(2026, 10, 17)
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the date resolver")
+    print("=" * 50)
+    test_corpus()
+    test_tonight()
+    test_day_table()
+    print("\n✅ All date resolver tests passed!")
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Test GoogleCalendarManager against the offline fake Calendar API server
+(no network or Google credentials needed)
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dateutil import tz
+from src.config import Config
+from src.fake_calendar_server import FakeCalendarServer
+from src.google_calendar import GoogleCalendarManager
+from src.async_google_calendar import AsyncGoogleCalendarManager
+from src.calendar_watch import CalendarWatcher
+from src.free_busy import FreeBusyEngine
+from src.models import CalendarEvent
+
+CHICAGO_TZ = tz.gettz('America/Chicago')
+
+def make_manager(server: FakeCalendarServer) -> GoogleCalendarManager:
+    Config.GOOGLE_CALENDAR_API_ROOT = server.root_url
+    Config.GOOGLE_CALENDAR_ANONYMOUS = True
+    return GoogleCalendarManager()
+
+def test_reads_and_sync():
+    """Calendar list, paginated reads, delta syncs and expired sync tokens"""
+    print("1. Reads and sync tokens")
+    with FakeCalendarServer() as server:
+        first_day = datetime.now(CHICAGO_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+        calendar_ids = server.seed(calendars=3, events_per_calendar=300, first_day=first_day, days=14)
+        manager = make_manager(server)
+
+        calendars = manager.list_calendars().calendars
+        print(f"  Calendars: {[cal['summary'] for cal in calendars]}")
+        assert {cal['id'] for cal in calendars} == set(calendar_ids)
+        assert manager.default_calendar_id == server.backend.primary_id
+
+        window = (first_day, first_day + timedelta(days=14))
+        response = manager.get_events_all_calendars(*window, max_results=None)
+        print(f"  {len(response.events)} events across calendars, timings: {response.calendar_timings}")
+        assert len(response.events) == 900
+        assert [e.start_time for e in response.events] == sorted(e.start_time for e in response.events)
+
+        # Without the cache, reads page through events().list (maxResults is capped by the page size)
+        manager.cache_enabled = False
+        streamed = list(manager.iter_events([server.backend.primary_id], *window, page_size=100))
+        assert len(streamed) == 300
+        manager.cache_enabled = True
+
+        created = manager.create_event(CalendarEvent(
+            summary="Dentist", start_time=first_day.replace(tzinfo=None) + timedelta(hours=15),
+            end_time=first_day.replace(tzinfo=None) + timedelta(hours=16)
+        ))
+        assert created.success, created.error
+        cache = manager.event_cache
+        before = dict(cache.get_stats())
+        dentist = manager.search_events("Dentist").events
+        print(f"  Created and found via delta sync: {[e.summary for e in dentist]}")
+        assert [e.id for e in dentist] == [created.event_id]
+        assert cache.get_stats()['delta_syncs'] == before['delta_syncs'] + 1
+
+        assert manager.delete_event(created.event_id).success
+        assert manager.search_events("Dentist").events == []
+
+        server.backend.expire_sync_tokens()
+        manager.event_cache.invalidate()
+        response = manager.get_events(*window, max_results=None)
+        assert response.success and len(response.events) == 300
+        print(f"  Cache stats after expired token: {cache.get_stats()}")
+        assert cache.get_stats()['expired_tokens'] == 1
+    print("  ✅ ok")
+
+def test_invalidated_mid_sync():
+    """A write invalidating a store while it syncs isn't lost when that sync finishes"""
+    print("2. Invalidated mid-sync")
+    with FakeCalendarServer() as server:
+        day = datetime(2025, 9, 27, tzinfo=CHICAGO_TZ)
+        manager = make_manager(server)
+        calendar_id = manager.default_calendar_id
+        paginate = manager._paginate
+
+        def paginate_then_write(*args, **kwargs):
+            yield from paginate(*args, **kwargs)
+            # Lands after the last page was fetched, before the sync is recorded
+            manager._paginate = paginate
+            server.backend.insert_event(calendar_id, {
+                'summary': 'Late write',
+                'start': {'dateTime': day.replace(hour=9).isoformat()},
+                'end': {'dateTime': day.replace(hour=10).isoformat()},
+            })
+            manager.event_cache.invalidate(calendar_id)
+
+        manager._paginate = paginate_then_write
+        assert manager.get_events_all_calendars(day, day + timedelta(days=1)).events == []
+        store = manager.event_cache.store(calendar_id)
+        assert store.stale and manager.event_cache.needs_sync(store)
+        events = manager.get_events_all_calendars(day, day + timedelta(days=1)).events
+        print(f"  Next read: {[e.summary for e in events]}")
+        assert [e.summary for e in events] == ['Late write'] and not store.stale
+
+        # The same through the async client
+        client = AsyncGoogleCalendarManager(manager)
+        async_paginate = client._paginate
+
+        async def async_paginate_then_write(*args, **kwargs):
+            async for page in async_paginate(*args, **kwargs):
+                yield page
+            client._paginate = async_paginate
+            server.backend.insert_event(calendar_id, {
+                'summary': 'Later write',
+                'start': {'dateTime': day.replace(hour=11).isoformat()},
+                'end': {'dateTime': day.replace(hour=12).isoformat()},
+            })
+            manager.event_cache.invalidate(calendar_id)
+
+        async def read_async():
+            try:
+                manager.event_cache.invalidate(calendar_id)
+                client._paginate = async_paginate_then_write
+                first = await client.get_events_all_calendars(day, day + timedelta(days=1))
+                assert store.stale and manager.event_cache.needs_sync(store)
+                second = await client.get_events_all_calendars(day, day + timedelta(days=1))
+                return [e.summary for e in first.events], [e.summary for e in second.events]
+            finally:
+                await client.aclose()
+
+        first, second = asyncio.run(read_async())
+        print(f"  Async reads: {first} then {second}")
+        assert first == ['Late write'] and second == ['Late write', 'Later write'] and not store.stale
+    print("  ✅ ok")
+
+def test_batch_and_errors():
+    """Batch inserts, per-call errors inside a batch, and injected failures"""
+    print("3. Batch requests and error injection")
+    with FakeCalendarServer() as server:
+        manager = make_manager(server)
+        start = datetime(2025, 9, 6, 9, 0)
+        events = [
+            CalendarEvent(summary=f"Game {n}", start_time=start + timedelta(days=7 * n),
+                          end_time=start + timedelta(days=7 * n, hours=1))
+            for n in range(60)
+        ]
+        responses = manager.create_events(events)
+        print(f"  Created {sum(r.success for r in responses)} events in {server.stats['batch_requests']} batch requests")
+        assert all(r.success for r in responses)
+        assert server.stats['batch_requests'] == 2 and server.stats['batch_parts'] == 60
+
+        deleted = manager.delete_events([responses[0].event_id, "missing-event-id"])
+        assert deleted[0].success and not deleted[1].success
+
+        server.fail_next(503)
+        response = manager.get_events(start, start + timedelta(days=1))
+        print(f"  Injected 503 -> success={response.success}, error={response.error[:60] if response.error else None}")
+        assert not response.success
+        assert manager.get_events(start, start + timedelta(days=1)).success
+    print("  ✅ ok")
+
+def test_free_busy_and_async():
+    """freeBusy for cold calendars and the async client against the same server"""
+    print("4. Free/busy and async client")
+    with FakeCalendarServer(latency=0.01) as server:
+        day = datetime(2025, 9, 13, tzinfo=CHICAGO_TZ)
+        server.backend.add_calendar("kids@group.calendar.google.com", "Kids")
+        server.backend.add_event("kids@group.calendar.google.com", {
+            'id': 'practice', 'status': 'confirmed', 'summary': 'Practice',
+            'start': {'dateTime': day.replace(hour=10).isoformat()},
+            'end': {'dateTime': day.replace(hour=12).isoformat()},
+        })
+        manager = make_manager(server)
+        slots = FreeBusyEngine(manager).find_free_slots(None, (day, day + timedelta(days=1)), timedelta(hours=1))
+        print(f"  Free: {[(s.strftime('%H:%M'), e.strftime('%H:%M')) for s, e in slots]}")
+        assert [(s.hour, e.hour) for s, e in slots] == [(8, 10), (12, 21)]
+
+        # Conflicts for several new events come from one query over their span
+        engine = FreeBusyEngine(manager)
+        proposed = [
+            CalendarEvent(summary="Lunch", start_time=day.replace(hour=11), end_time=day.replace(hour=13)),
+            CalendarEvent(summary="Nap", start_time=day.replace(hour=14), end_time=day.replace(hour=15)),
+            CalendarEvent(summary="Snack", start_time=day.replace(hour=11, minute=30), end_time=day.replace(hour=12)),
+        ]
+        conflicts = engine.find_conflicts(proposed)
+        print(f"  Conflicts: {[(c.summary, c.calendar_id) for c in conflicts]}")
+        # Practice, seen as a busy block clipped to the span (the calendar isn't cached yet)
+        assert [(c.summary, c.start_time, c.end_time) for c in conflicts] == [
+            ('Busy', day.replace(hour=11), day.replace(hour=12))]
+        # Advisory only: a failing check (here a socket timeout) reports no conflicts instead of raising
+        def time_out(*args):
+            raise TimeoutError("timed out")
+        engine._query_free_busy = time_out
+        assert engine.find_conflicts(proposed) == []
+
+        async def run_async():
+            client = AsyncGoogleCalendarManager(manager)
+            try:
+                response = await client.get_events_all_calendars(day, day + timedelta(days=1))
+                return [e.summary for e in response.events]
+            finally:
+                await client.aclose()
+
+        summaries = asyncio.run(run_async())
+        print(f"  Async read: {summaries}")
+        assert summaries == ['Practice']
+        # Now that the calendar is cached, conflicts are the cached events themselves
+        assert [c.summary for c in FreeBusyEngine(manager).find_conflicts(proposed)] == ['Practice']
+    print("  ✅ ok")
+
+def test_push_notifications():
+    """events.watch channels re-sync only the changed calendar, and are renewed before expiry"""
+    print("5. Push notifications")
+    with FakeCalendarServer() as server:
+        server.backend.add_calendar("kids@group.calendar.google.com", "Kids")
+        manager = make_manager(server)
+        watcher = manager.watcher
+
+        class WebhookHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                accepted = watcher.handle_notification(
+                    self.headers.get("X-Goog-Channel-ID", ""), self.headers.get("X-Goog-Channel-Token", ""),
+                    self.headers.get("X-Goog-Resource-ID", ""), self.headers.get("X-Goog-Resource-State", "")
+                )
+                self.send_response(200 if accepted else 403)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        webhook = ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+        threading.Thread(target=webhook.serve_forever, daemon=True).start()
+        watcher.webhook_url = f"http://127.0.0.1:{webhook.server_address[1]}/webhook/calendar"
+        try:
+            day = datetime(2025, 9, 20, tzinfo=CHICAGO_TZ)
+            assert manager.get_events_all_calendars(day, day + timedelta(days=1)).events == []
+            watcher.start()
+            assert len(watcher.channels) == 2
+
+            # A change made "in the Google UI" reaches the cache without any read polling
+            server.backend.insert_event("kids@group.calendar.google.com", {
+                'summary': 'Recital',
+                'start': {'dateTime': day.replace(hour=18).isoformat()},
+                'end': {'dateTime': day.replace(hour=19).isoformat()},
+            })
+            kids = manager.event_cache.store("kids@group.calendar.google.com")
+            deadline = time.time() + 5
+            while not kids.events and time.time() < deadline:
+                time.sleep(0.05)
+            print(f"  Pushed into cache: {[e.summary for e in kids.events.values()]}, stats: {watcher.get_stats()['resyncs']} resyncs")
+            assert [e.summary for e in kids.events.values()] == ['Recital']
+            assert manager.event_cache.store(server.backend.primary_id).watched
+            assert not manager.event_cache.needs_sync(kids)
+
+            # A notification that lands while a sync is in flight still gets its change fetched
+            paginate = manager._paginate
+
+            def paginate_then_change(*args, **kwargs):
+                yield from paginate(*args, **kwargs)
+                manager._paginate = paginate
+                seen = watcher.get_stats()['notifications']
+                server.backend.insert_event("kids@group.calendar.google.com", {
+                    'summary': 'Bake sale',
+                    'start': {'dateTime': day.replace(hour=8).isoformat()},
+                    'end': {'dateTime': day.replace(hour=9).isoformat()},
+                })
+                deadline = time.time() + 5
+                while watcher.get_stats()['notifications'] == seen and time.time() < deadline:
+                    time.sleep(0.01)
+
+            resyncs = watcher.get_stats()['resyncs']
+            manager._paginate = paginate_then_change
+            manager.event_cache.invalidate("kids@group.calendar.google.com")
+            manager._sync_calendar("kids@group.calendar.google.com")
+            deadline = time.time() + 5
+            while len(kids.events) < 2 and time.time() < deadline:
+                time.sleep(0.05)
+            print(f"  Changed mid-sync: {sorted(e.summary for e in kids.events.values())}")
+            assert sorted(e.summary for e in kids.events.values()) == ['Bake sale', 'Recital']
+            assert watcher.get_stats()['resyncs'] == resyncs + 1 and not manager.event_cache.needs_sync(kids)
+
+            assert not watcher.handle_notification(next(iter(watcher.channels)), "forged", "", "exists")
+
+            # Channels this watcher doesn't hold: another worker's is left alone, an earlier run's is stopped
+            other = CalendarWatcher(manager, watcher.webhook_url, Config.SECRET_KEY, instance_id="worker-2")
+            foreign = other.watch(server.backend.primary_id)
+            assert watcher.handle_notification(foreign.channel_id, other._token(foreign.channel_id),
+                                               foreign.resource_id, "exists")
+            earlier = CalendarWatcher(manager, watcher.webhook_url, Config.SECRET_KEY, instance_id=watcher.instance_id)
+            stale = earlier.watch(server.backend.primary_id)
+            assert watcher.handle_notification(stale.channel_id, earlier._token(stale.channel_id),
+                                               stale.resource_id, "exists")
+            deadline = time.time() + 5
+            while stale.channel_id in server.backend.channels and time.time() < deadline:
+                time.sleep(0.05)
+            assert stale.channel_id not in server.backend.channels and foreign.channel_id in server.backend.channels
+            stats = watcher.get_stats()
+            assert stats['orphans_stopped'] == 1 and stats['unknown_channels'] >= 1
+            other.unwatch(foreign)
+
+            old_channels = set(watcher.channels)
+            watcher.renew_margin = watcher.ttl + 60
+            assert watcher.renew_expiring() == 2
+            assert len(watcher.channels) == 2 and not old_channels & set(watcher.channels)
+            assert len(server.backend.channels) == 2
+
+            watcher.stop()
+            assert server.backend.channels == {} and not kids.watched
+        finally:
+            webhook.shutdown()
+            webhook.server_close()
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing against the fake Google Calendar API")
+    print("=" * 50)
+    test_reads_and_sync()
+    test_invalidated_mid_sync()
+    test_batch_and_errors()
+    test_free_busy_and_async()
+    test_push_notifications()
+    print("\n✅ All fake server tests passed!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the intent cache that reuses LLM results for repeated commands
+"""
+
+import sys
+import os
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.intent_cache import IntentCache, utterance_key
+
+THURSDAY = datetime(2026, 10, 15, 8, 0)
+FRIDAY = datetime(2026, 10, 16, 8, 0)
+NEXT_MONTH = datetime(2026, 11, 3, 8, 0)
+
+def read_result(start, end):
+    return {'action': 'read', 'type': 'calendar', 'events': [{'summary': '', 'start_time': start, 'end_time': end}]}
+
+def test_keys():
+    print("1. Normalized keys")
+    assert utterance_key("What chores do I have today?", THURSDAY) == utterance_key("what chores do i have today", THURSDAY)
+    # "tomorrow" and the weekday it falls on mean the same thing
+    assert utterance_key("what's on tomorrow", THURSDAY) == utterance_key("What's on Friday?", THURSDAY)
+    assert utterance_key("what's on tomorrow", THURSDAY) != utterance_key("What's on Friday?", FRIDAY)
+    # As in the prompt, a bare weekday is the next one, never today: "Friday" on a Friday is a week out
+    assert utterance_key("What's on Friday?", FRIDAY)[0] == 'whats on {day+7}'
+    print(f"  {utterance_key('Show me next week please', THURSDAY)}")
+    assert utterance_key("Show me next week please", THURSDAY)[1] == 'week'
+    assert utterance_key("remind me in 2 hours", THURSDAY) is None
+    assert utterance_key("what's on July 21st", THURSDAY)[1] == 'absolute'
+    print("  ✅ ok")
+
+def test_rebased_hits():
+    print("2. Hits re-resolve dates")
+    cache = IntentCache()
+    assert cache.get("What's on tomorrow?", THURSDAY) is None
+    cache.put("What's on tomorrow?", read_result('2026-10-16T00:00:00', '2026-10-16T23:59:59'), THURSDAY)
+
+    event = cache.get("what's on tomorrow", FRIDAY)['events'][0]
+    print(f"  'tomorrow' asked again on Friday -> {event['start_time']} .. {event['end_time']}")
+    assert (event['start_time'], event['end_time']) == ('2026-10-17T00:00:00', '2026-10-17T23:59:59')
+
+    cache.put("what's on this month", read_result('2026-10-01T00:00:00', '2026-10-31T23:59:59'), THURSDAY)
+    event = cache.get("What's on this month?", NEXT_MONTH)['events'][0]
+    print(f"  'this month' asked again in November -> {event['start_time']} .. {event['end_time']}")
+    assert (event['start_time'], event['end_time']) == ('2026-11-01T00:00:00', '2026-11-30T23:59:59')
+
+    # Absolute dates are only reused on the day they were resolved
+    cache.put("what's on July 21st", read_result('2027-07-21T00:00:00', '2027-07-21T23:59:59'), THURSDAY)
+    assert cache.get("what's on July 21st", THURSDAY) is not None
+    assert cache.get("what's on July 21st", FRIDAY) is None
+    print(f"  Stats: {cache.get_stats()}")
+    print("  ✅ ok")
+
+def test_bounds():
+    print("3. LRU size and TTL")
+    cache = IntentCache(max_entries=2, ttl=0.2)
+    for chore in ('dishes', 'laundry', 'trash'):
+        cache.put(f"add {chore} to my chores", {'type': 'chores', 'chores': [{'description': chore, 'action': 'add'}]}, THURSDAY)
+    assert cache.get("add dishes to my chores", THURSDAY) is None
+    assert cache.get("Add laundry to my chores", THURSDAY)['chores'][0]['description'] == 'laundry'
+    time.sleep(0.25)
+    assert cache.get("add trash to my chores", THURSDAY) is None
+    stats = cache.get_stats()
+    print(f"  Stats: {stats}")
+    assert stats['evictions'] == 1 and stats['expirations'] == 1 and stats['size'] == 1
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the intent cache")
+    print("=" * 50)
+    test_keys()
+    test_rebased_hits()
+    test_bounds()
+    print("\n✅ All intent cache tests passed!")
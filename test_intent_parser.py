@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the local intent parser that answers common read/chores queries without the LLM
+"""
+
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import Config
+from src.intent_parser import LocalIntentParser
+from src.date_resolver import CHICAGO_TZ
+from src.models import InputType, CalendarAction, ChoresCommand
+
+# Saturday afternoon
+NOW = datetime(2026, 10, 17, 15, 0, tzinfo=CHICAGO_TZ)
+
+# utterance -> (action, first day, last day) expected from the local parser
+LOCAL_CASES = {
+    "What's on today?": (CalendarAction.READ, 17, 17),
+    "what's on my calendar tomorrow": (CalendarAction.READ, 18, 18),
+    "Show my week": (CalendarAction.READ, 12, 18),
+    "show me next week": (CalendarAction.READ, 19, 25),
+    "anything on friday?": (CalendarAction.READ, 23, 23),
+    "What's happening this weekend": (CalendarAction.READ, 17, 18),
+    "what are my plans for next weekend": (CalendarAction.READ, 24, 25),
+    "what's my schedule for tomorrow": (CalendarAction.READ, 18, 18),
+    "list my events for this month": (CalendarAction.LIST, 1, 31),
+    "What’s going on Monday": (CalendarAction.READ, 19, 19),
+}
+
+# Writes, unknown content words and non-calendar questions must reach the LLM
+LLM_CASES = [
+    "Schedule a meeting tomorrow at 2pm",
+    "Cancel my meeting today",
+    "Add dinner to my chores",
+    "When is soccer practice?",
+    "what time is the dentist tomorrow",
+    "what's the weather today",
+    "What's on my calendar?",
+    "hello",
+]
+
+def accepted(parser, text):
+    result = parser.parse(text, InputType.TEXT, NOW)
+    return result if result and result.confidence >= Config.LOCAL_INTENT_THRESHOLD else None
+
+def test_local_intents():
+    print("1. Parsed locally")
+    parser = LocalIntentParser()
+    for text, (action, first_day, last_day) in LOCAL_CASES.items():
+        result = accepted(parser, text)
+        assert result is not None, f"{text!r} escalated to the LLM"
+        event = result.command.event
+        print(f"  {text!r:40} -> {result.command.action.value} {event.start_time:%a %m-%d} .. {event.end_time:%a %m-%d} ({result.confidence:.2f})")
+        assert result.command.action == action
+        assert (event.start_time.day, event.end_time.day) == (first_day, last_day), text
+
+    chores = accepted(parser, "What chores do I have today?")
+    assert chores is not None and isinstance(chores.command, ChoresCommand)
+    print("  ✅ ok")
+
+def test_escalations():
+    print("2. Escalated to the LLM")
+    parser = LocalIntentParser()
+    for text in LLM_CASES:
+        result = parser.parse(text, InputType.TEXT, NOW)
+        print(f"  {text!r:40} -> {'LLM' if result is None else f'{result.confidence:.2f}'}")
+        assert accepted(parser, text) is None, f"{text!r} was answered locally"
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the local intent parser")
+    print("=" * 50)
+    test_local_intents()
+    test_escalations()
+    print("\n✅ All intent parser tests passed!")
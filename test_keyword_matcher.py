@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the whole-word keyword matcher behind the NLP fallback: no matches inside
+other words, plurals, multi-word phrases and longest-phrase wins
+"""
+
+import re
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.keyword_matcher import KeywordMatcher, trie_pattern
+from src.nlp_processor import FALLBACK_KEYWORDS
+
+def test_whole_words():
+    print("1. Whole words only")
+    for text, table, expected in [
+        ("do the dishes chore", 'assign', ['do']),
+        ("chore: call the doctor", 'assign', None),  # "do" inside "doctor"
+        ("fix my mistake on the chores list", 'assign', None),  # "take" inside "mistake"
+        ("take out the trash task", 'assign', ['take']),
+        ("is the address right", 'add', None),  # "add" inside "address"
+        ("the whatnot", 'read', None),
+    ]:
+        hits = FALLBACK_KEYWORDS.matches(text)
+        print(f"  {text!r}: {hits.get(table)}")
+        assert hits.get(table) == expected, text
+    print("  ✅ ok")
+
+def test_plurals():
+    print("2. A trailing plural 's'")
+    hits = FALLBACK_KEYWORDS.matches("Any plans for the weekends? Housework chores")
+    print(f"  {hits}")
+    assert hits['create'] == ['plan'] and hits['relative'] == ['weekend']
+    assert hits['chores'] == ['housework', 'chores']
+    assert 'chores' not in FALLBACK_KEYWORDS.matches("choreography class")
+    print("  ✅ ok")
+
+def test_phrases():
+    print("3. Multi-word phrases")
+    hits = FALLBACK_KEYWORDS.matches("Please mark as done the laundry chore")
+    print(f"  {hits}")
+    assert hits['complete'] == ['mark as done']  # the longest phrase, not "done" as well
+    assert FALLBACK_KEYWORDS.matches("can you pick   up the vacuuming task")['assign'] == ['pick up']
+    assert FALLBACK_KEYWORDS.matches("tell me about next week")['relative'] == ['next week']
+    assert 'assign' not in FALLBACK_KEYWORDS.matches("pickup the trash chore")
+    print("  ✅ ok")
+
+def test_tables():
+    print("4. A phrase in several tables")
+    matcher = KeywordMatcher({'read': ['schedule', 'show'], 'create': ['schedule', 'book']})
+    assert matcher.matches("Schedule a call") == {'read': ['schedule'], 'create': ['schedule']}
+    assert matcher.matches("nothing here") == {}
+    print("  ✅ ok")
+
+def test_trie_pattern():
+    print("5. Prefix-factored pattern")
+    pattern = trie_pattern(['add', 'assign', 'next week'])
+    print(f"  {pattern}")
+    assert 'a(?:dd|ssign)' in pattern
+    assert re.fullmatch(pattern, 'next   week') and re.fullmatch(pattern, 'assign')
+    assert not re.fullmatch(pattern, 'as')
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the keyword matcher")
+    print("=" * 50)
+    test_whole_words()
+    test_plurals()
+    test_phrases()
+    test_tables()
+    test_trie_pattern()
+    print("\n✅ All keyword matcher tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed TTS audio cache (memory LRU and disk tiers)
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tts_cache import TTSCache, audio_key
+
+def key(text, voice='alloy', model='tts-1'):
+    return audio_key(text, voice, model, 'mp3')
+
+def test_keys():
+    print("1. Content addresses")
+    assert key("Anything else?") == key("Anything else?")
+    assert key("Anything else?") != key("Anything else?", voice='nova')
+    assert key("Anything else?") != key("Anything else?", model='tts-1-hd')
+    assert key("Anything else?") != audio_key("Anything else?", 'alloy', 'tts-1', 'opus')
+    print(f"  {key('Anything else?')[:16]}…")
+    print("  ✅ ok")
+
+def test_memory_tier():
+    print("2. Memory LRU by size")
+    cache = TTSCache(memory_max_bytes=250)
+    for name in ('a', 'b', 'c'):
+        cache.put(key(name), name.encode() * 100)
+    # 'a' was least recently used and pushed out by 'c'
+    assert cache.get(key('a')) is None
+    assert cache.get(key('b')) == b'b' * 100
+    assert cache.get(key('c')) == b'c' * 100
+    stats = cache.get_stats()
+    print(f"  Stats: {stats}")
+    assert stats['memory_evictions'] == 1 and stats['memory_bytes'] == 200
+    assert stats['hit_rate'] == round(2 / 3, 3)
+    print("  ✅ ok")
+
+def test_disk_tier():
+    print("3. Disk tier survives restarts and is size-bounded")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSCache(memory_max_bytes=1024, directory=directory, disk_max_bytes=300)
+        cache.put(key('month'), b'm' * 100)
+        cache.put(key('error'), b'e' * 100)
+
+        restarted = TTSCache(memory_max_bytes=1024, directory=directory, disk_max_bytes=300)
+        assert restarted.get(key('month')) == b'm' * 100
+        assert restarted.get_stats()['disk_hits'] == 1
+        assert restarted.get(key('month')) == b'm' * 100  # promoted to memory
+        assert restarted.get_stats()['memory_hits'] == 1
+
+        # 'error' is now the least recently used file and is deleted first
+        time.sleep(0.01)
+        restarted.put(key('sure'), b's' * 150)
+        stats = restarted.get_stats()
+        print(f"  Stats: {stats}")
+        assert stats['disk_evictions'] == 1 and stats['disk_bytes'] == 250
+        assert not os.path.exists(os.path.join(directory, key('error') + '.audio'))
+        assert TTSCache(directory=directory, disk_max_bytes=300).get(key('month')) == b'm' * 100
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the TTS cache")
+    print("=" * 50)
+    test_keys()
+    test_memory_tier()
+    test_disk_tier()
+    print("\n✅ All TTS cache tests passed!")
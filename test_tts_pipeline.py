@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test sentence splitting and the ordered, concurrent TTS pipeline used for streamed replies
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tts_processor import SentenceSplitter, SpeechPipeline, split_sentences
+
+REPLY = ("Sure! Tomorrow you have soccer at 9 a.m. with Coach Dave. "
+         "Then Dr. Lee at 2 p.m. tomorrow, so leave by 1:30. "
+         "Want me to add a reminder?\nAlso, dinner is at 6.")
+
+SENTENCES = [
+    "Sure!",
+    "Tomorrow you have soccer at 9 a.m. with Coach Dave.",
+    "Then Dr. Lee at 2 p.m. tomorrow, so leave by 1:30.",
+    "Want me to add a reminder?",
+    "Also, dinner is at 6.",
+]
+
+def test_split_sentences():
+    print("1. Whole reply")
+    sentences = split_sentences(REPLY)
+    for sentence in sentences:
+        print(f"  {sentence!r}")
+    assert sentences == SENTENCES
+    assert split_sentences("") == [] and split_sentences("No punctuation") == ["No punctuation"]
+    print("  ✅ ok")
+
+def test_streamed_pieces():
+    print("2. Streamed in small pieces")
+    for size in (1, 3, 7, 20):
+        splitter = SentenceSplitter()
+        sentences = []
+        for i in range(0, len(REPLY), size):
+            sentences += splitter.feed(REPLY[i:i + size])
+        sentences += splitter.flush()
+        assert sentences == SENTENCES, (size, sentences)
+    # A sentence is released as soon as the next one starts
+    splitter = SentenceSplitter()
+    assert splitter.feed("Sure! ") == [] and splitter.feed("Tomorrow") == ["Sure!"]
+    print("  ✅ ok")
+
+def test_pipeline_order_and_bound():
+    print("3. Pipeline order and parallelism")
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def synthesize(sentence):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        # Later sentences finish first, so ordering is really tested
+        time.sleep(0.05 * (len(SENTENCES) - SENTENCES.index(sentence)))
+        with lock:
+            running -= 1
+        return None if sentence == "Sure!" else sentence.encode()
+
+    executor = ThreadPoolExecutor(max_workers=3)
+    pipeline = SpeechPipeline(synthesize, executor)
+    started = time.perf_counter()
+    for sentence in SENTENCES:
+        pipeline.add(sentence)
+    assert list(pipeline.ready()) == []
+    audio = list(pipeline.drain())
+    elapsed = time.perf_counter() - started
+    print(f"  {len(audio)} chunks in {elapsed * 1000:.0f} ms, peak concurrency {peak}")
+    # The failed first sentence is skipped; the rest come back in order
+    assert audio == [sentence.encode() for sentence in SENTENCES[1:]]
+    assert peak == 3
+    assert elapsed < 0.05 * sum(range(1, len(SENTENCES) + 1))  # faster than one at a time
+    executor.shutdown()
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing the TTS sentence pipeline")
+    print("=" * 50)
+    test_split_sentences()
+    test_streamed_pieces()
+    test_pipeline_order_and_bound()
+    print("\n✅ All TTS pipeline tests passed!")
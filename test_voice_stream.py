@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test endpointing of audio streamed in chunks (WebSocket audio frames, microphone):
+the utterance ends as soon as the speaker stops, and only then is it transcribed
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import Config
+from src.vad import Endpointer
+from src.voice_stream import VoiceStream
+from test_vad import RATE, clip, noise, tone
+
+CHUNK = RATE // 10 * 2  # 100 ms of 16-bit PCM
+
+class RecordingProcessor:
+    """Stands in for VoiceProcessor: records what would be sent to Whisper"""
+    def __init__(self):
+        self.transcribed = []
+
+    def transcribe_pcm(self, pcm, sample_rate=None):
+        self.transcribed.append((pcm, sample_rate))
+        return "what's on tomorrow", None
+
+def stream(pcm, voice_stream):
+    """Feed PCM in 100 ms chunks until the stream ends; returns (events, seconds fed)"""
+    events = []
+    fed = 0
+    for i in range(0, len(pcm), CHUNK):
+        if voice_stream.ended:
+            break
+        events += voice_stream.feed(pcm[i:i + CHUNK])
+        fed = (i + CHUNK) / 2 / RATE
+    return events, fed
+
+def test_endpointer():
+    print("1. Endpointer events")
+    endpointer = Endpointer(RATE, end_silence_ms=700)
+    pcm = clip(noise(1.0), tone(1.5), noise(0.3), tone(0.5), noise(3.0))
+    timeline = []
+    for i in range(0, len(pcm), CHUNK):
+        for event in endpointer.feed(pcm[i:i + CHUNK]):
+            timeline.append((event, round(endpointer.duration, 2)))
+    print(f"  {timeline}")
+    # Starts once 150 ms of speech is heard; the 300 ms pause doesn't end it, 700 ms of silence does
+    assert [event for event, _ in timeline] == ['speech_start', 'speech_end']
+    assert 1.1 <= timeline[0][1] <= 1.3
+    assert 3.9 <= timeline[1][1] <= 4.1
+    print("  ✅ ok")
+
+def test_stream_ends_on_silence():
+    print("2. Transcribed when the speaker stops, not when the clip ends")
+    processor = RecordingProcessor()
+    voice_stream = VoiceStream(processor, "pcm", RATE)
+    events, fed = stream(clip(noise(0.5), tone(1.0), noise(10.0)), voice_stream)
+    print(f"  {events} after {fed:.1f}s of a 11.5s clip")
+    assert [event['type'] for event in events] == ['speech_start', 'speech_end']
+    assert events[1]['reason'] == 'silence' and fed < 2.5
+    assert voice_stream.finish() == ("what's on tomorrow", None)
+    pcm, sample_rate = processor.transcribed[0]
+    assert sample_rate == RATE and len(pcm) <= fed * RATE * 2
+    # Frames after the end are ignored
+    assert voice_stream.feed(bytes(CHUNK)) == []
+    print("  ✅ ok")
+
+def test_stream_limits():
+    print("3. No speech, too long, and stopped by the client")
+    voice_stream = VoiceStream(RecordingProcessor(), "pcm", RATE)
+    events, fed = stream(clip(noise(20.0)), voice_stream)
+    assert events[-1]['reason'] == 'no_speech' and fed <= Config.VOICE_STREAM_NO_SPEECH_SECONDS + 0.1
+    voice_stream = VoiceStream(RecordingProcessor(), "pcm", RATE, max_seconds=3)
+    events, fed = stream(clip(tone(10.0)), voice_stream)
+    assert events[-1]['reason'] == 'max_duration' and fed <= 3.1
+    voice_stream = VoiceStream(RecordingProcessor(), "pcm", RATE)
+    stream(clip(noise(0.5), tone(1.0)), voice_stream)
+    assert voice_stream.end()[-1]['reason'] == 'client'
+    print("  ✅ ok")
+
+def test_bad_sample_rate():
+    print("4. Sample rates a client can't be trusted with")
+    for sample_rate in [0, -16000, 4, 16000.0, True, "16000", 10 ** 6]:
+        try:
+            VoiceStream(RecordingProcessor(), "pcm", sample_rate)
+            raise AssertionError(f"accepted {sample_rate!r}")
+        except ValueError as e:
+            print(f"  {sample_rate!r}: {e}")
+    assert VoiceStream(RecordingProcessor(), "pcm", 8000).sample_rate == 8000
+    assert VoiceStream(RecordingProcessor(), "pcm").sample_rate == Config.TRANSCRIBE_SAMPLE_RATE
+    print("  ✅ ok")
+
+def test_container_stream():
+    print("5. A webm stream decoded as it arrives")
+    if not shutil.which(Config.FFMPEG_BINARY):
+        print(f"  ffmpeg not found ({Config.FFMPEG_BINARY}), skipped")
+        return
+    webm = subprocess.run(
+        [Config.FFMPEG_BINARY, '-loglevel', 'error', '-f', 's16le', '-ar', str(RATE), '-ac', '1', '-i', 'pipe:0',
+         '-c:a', 'libopus', '-f', 'webm', 'pipe:1'],
+        input=clip(noise(0.5), tone(1.0), noise(5.0)), capture_output=True, check=True
+    ).stdout
+    processor = RecordingProcessor()
+    voice_stream = VoiceStream(processor, "webm")
+    events = []
+    for i in range(0, len(webm), 1024):
+        events += voice_stream.feed(webm[i:i + 1024])
+    events += voice_stream.end()
+    print(f"  {events}")
+    assert [event['type'] for event in events] == ['speech_start', 'speech_end']
+    voice_stream.finish()
+    assert len(processor.transcribed) == 1 and processor.transcribed[0][1] == Config.TRANSCRIBE_SAMPLE_RATE
+    print("  ✅ ok")
+
+if __name__ == "__main__":
+    print("🧪 Testing streamed voice endpointing")
+    print("=" * 50)
+    test_endpointer()
+    test_stream_ends_on_silence()
+    test_stream_limits()
+    test_bad_sample_rate()
+    test_container_stream()
+    print("\n✅ All voice stream tests passed!")